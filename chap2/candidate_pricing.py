@@ -0,0 +1,95 @@
+import sys
+import itertools
+import collections
+import numpy as np
+import pulp
+from typing import Callable, Dict, Optional, Set, Tuple
+
+sys.path.append('../')
+
+from common import logger, solve_with_log
+
+Pair = Tuple[int, int]
+
+
+def cheapest_candidates(instance, k: int) -> Set[Pair]:
+    c = np.asarray(instance.transportation_cost, dtype=np.float64)
+    k = min(k, instance.n_facilities)
+    nearest = np.argsort(c, axis=1)[:, :k]
+    return {(i, int(j)) for i in range(instance.n_customers) for j in nearest[i]}
+
+
+# x_ij <= min(d_i, capacity_j) y_j tightens the LP bound that decides which pairs can be pruned
+def make_linked_problem(instance, make_problem: Callable, candidates: Set[Pair]) -> pulp.LpProblem:
+    problem = make_problem(instance, candidates)
+    variables_dict = problem.variablesDict()
+    capacity = getattr(instance, "capacity", None)
+    for i, j in sorted(candidates):
+        bound = instance.demands[i] if capacity is None else min(instance.demands[i], capacity[j])
+        problem.addConstraint(variables_dict[f"x_{i}_{j}"] <= bound * variables_dict[f"y_{j}"],
+                              name=f"link_{i}_{j}")
+    return problem
+
+
+# reduced cost of every customer-facility pair from the duals of the demand and capacity rows
+def reduced_costs(instance, problem: pulp.LpProblem) -> np.ndarray:
+    constraints = problem.constraints
+    u = np.array([(constraints[f"customer_demands_positive_{i}"].pi or 0) +
+                  (constraints[f"customer_demands_negative_{i}"].pi or 0)
+                  for i in range(instance.n_customers)])
+    w = np.array([constraints[f"capacity_{j}"].pi or 0 for j in range(instance.n_facilities)])
+    return np.asarray(instance.transportation_cost, dtype=np.float64) - u[:, None] - w[None, :]
+
+
+def pruned_with_reduced_cost_below(instance, candidates: Set[Pair], rc: np.ndarray, threshold: float) -> Set[Pair]:
+    return {(i, j) for i, j in itertools.product(range(instance.n_customers), range(instance.n_facilities))
+            if (i, j) not in candidates and rc[i, j] < threshold}
+
+
+# LP column generation over the pruned pairs, returns the LP bound of the full model.
+# the bound and reduced costs are None when the LP over all pairs is not optimal either,
+# e.g. when the total capacity is below the total demand
+def price_lp(instance, make_problem: Callable, candidates: Set[Pair]) -> Tuple[Optional[float], Optional[np.ndarray], Set[Pair]]:
+    log = logger.get_logger(__name__)
+    n_pairs = instance.n_customers * instance.n_facilities
+    while True:
+        problem = make_linked_problem(instance, make_problem, candidates)
+        problem.solve(pulp.PULP_CBC_CMD(msg=False, mip=False))
+        if problem.status != pulp.LpStatusOptimal and len(candidates) == n_pairs:
+            log.info(f"LP over all pairs is {pulp.LpStatus[problem.status]}")
+            return None, None, candidates
+        if problem.status != pulp.LpStatusOptimal:
+            # too few candidates to cover the demand, fall back to twice as many
+            k = 2 * max(collections.Counter([i for i, _ in candidates]).values())
+            log.info(f"restricted LP is {pulp.LpStatus[problem.status]}, retry with k={k}")
+            candidates = candidates | cheapest_candidates(instance, k)
+            continue
+        rc = reduced_costs(instance, problem)
+        added = pruned_with_reduced_cost_below(instance, candidates, rc, -1e-9)
+        log.debug(f"lp bound:{pulp.value(problem.objective)}, added:{len(added)}")
+        if not added:
+            return pulp.value(problem.objective), rc, candidates
+        candidates = candidates | added
+
+
+# exact when the MIP finishes within the time limit: pairs left out have reduced cost of at least
+# upper bound - lower bound, so they cannot improve. a stopped MIP only gives a solution over the candidates
+def solve(instance, make_problem: Callable, k: int = 5, time_limit: int = 300) -> Tuple[pulp.LpProblem, Dict]:
+    log = logger.get_logger(__name__)
+    candidates = cheapest_candidates(instance, k)
+    while True:
+        lower_bound, rc, candidates = price_lp(instance, make_problem, candidates)
+        problem = make_linked_problem(instance, make_problem, candidates)
+        log.info(f"{len(candidates)} of {instance.n_customers * instance.n_facilities} pairs")
+        record = solve_with_log.exec(problem, False, time_limit)
+        if lower_bound is None or record["objective"] is None:
+            return problem, record
+        if record["solve_time"] >= time_limit:
+            log.info("MIP stopped at the time limit, the solution is not proven over all pairs")
+            return problem, record
+        added = pruned_with_reduced_cost_below(
+            instance, candidates, rc, record["objective"] - lower_bound)
+        if not added:
+            return problem, record
+        log.info(f"{len(added)} pruned pairs may improve the solution, add them back")
+        candidates = candidates | added
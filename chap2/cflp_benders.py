@@ -0,0 +1,125 @@
+import sys
+import os
+import time
+import itertools
+import pulp
+from typing import Dict, List, Tuple
+
+sys.path.append('../')
+
+from common import logger
+import or_library
+
+instance_dir = os.path.join("instances", "cflp")
+
+
+class Result:
+    def __init__(self, lower_bound: float, upper_bound: float, open_facilities: List[int], x: Dict):
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.open_facilities = open_facilities
+        self.x = x
+
+
+def make_master(instance) -> Tuple[pulp.LpProblem, Dict, pulp.LpVariable]:
+    problem = pulp.LpProblem(name="facility_location_master", sense=pulp.LpMinimize)
+    y = {j: pulp.LpVariable(name='y_{}'.format(j), cat=pulp.LpBinary)
+         for j in range(instance.n_facilities)}
+    eta = pulp.LpVariable(name="eta", lowBound=0)
+    problem.objective += pulp.lpSum([instance.establishment_cost[j] * y[j]
+                                     for j in range(instance.n_facilities)]) + eta
+    # every customer can be served by every facility, so this is the only feasibility cut ever needed
+    problem.addConstraint(pulp.lpSum([instance.capacity[j] * y[j] for j in range(instance.n_facilities)])
+                          >= sum(instance.demands), name="total_capacity")
+    return problem, y, eta
+
+
+# transportation LP, built once and only its capacity right hand sides change between iterations
+def make_subproblem(instance) -> Tuple[pulp.LpProblem, Dict, Dict, Dict]:
+    problem = pulp.LpProblem(name="transportation", sense=pulp.LpMinimize)
+    x = {(i, j): pulp.LpVariable(name='x_{}_{}'.format(i, j), lowBound=0)
+         for i, j in itertools.product(range(instance.n_customers), range(instance.n_facilities))}
+    problem.objective += pulp.lpSum([instance.transportation_cost[i][j] * x[i, j]
+                                     for i, j in itertools.product(range(instance.n_customers), range(instance.n_facilities))])
+    demand_constraints = {}
+    for i in range(instance.n_customers):
+        demand_constraints[i] = pulp.lpSum(
+            [x[i, j] for j in range(instance.n_facilities)]) == instance.demands[i]
+        problem.addConstraint(demand_constraints[i], name=f"customer_demands_{i}")
+    capacity_constraints = {}
+    for j in range(instance.n_facilities):
+        capacity_constraints[j] = pulp.lpSum(
+            [x[i, j] for i in range(instance.n_customers)]) <= instance.capacity[j]
+        problem.addConstraint(capacity_constraints[j], name=f"capacity_{j}")
+    return problem, x, demand_constraints, capacity_constraints
+
+
+def set_open_facilities(instance, capacity_constraints: Dict, y_values: Dict):
+    for j, c in capacity_constraints.items():
+        # constraint is stored as expression + constant <= 0
+        c.constant = -instance.capacity[j] * y_values[j]
+
+
+def optimality_cut(instance, y: Dict, eta: pulp.LpVariable, demand_constraints: Dict, capacity_constraints: Dict):
+    constant = sum([demand_constraints[i].pi * instance.demands[i] for i in range(instance.n_customers)])
+    return eta >= constant + pulp.lpSum([capacity_constraints[j].pi * instance.capacity[j] * y[j]
+                                         for j in range(instance.n_facilities)])
+
+
+def solve(instance, max_iterations: int = 200, tolerance: float = 1e-6, time_limit: int = 300) -> Result:
+    log = logger.get_logger(__name__)
+    master, y, eta = make_master(instance)
+    sub, x, demand_constraints, capacity_constraints = make_subproblem(instance)
+
+    start = time.perf_counter()
+    lower_bound = -float("inf")
+    upper_bound = float("inf")
+    best_y = None
+    best_x = None
+    for it in range(max_iterations):
+        remaining = max(1, int(time_limit - (time.perf_counter() - start)))
+        master.solve(pulp.PULP_CBC_CMD(
+            msg=False, warmStart=best_y is not None, timeLimit=remaining))
+        if master.status != pulp.LpStatusOptimal:
+            log.warning(f"master status:{pulp.LpStatus[master.status]}")
+            break
+        lower_bound = max(lower_bound, pulp.value(master.objective))
+        y_values = {j: round(y[j].varValue) for j in range(instance.n_facilities)}
+
+        set_open_facilities(instance, capacity_constraints, y_values)
+        sub.solve(pulp.PULP_CBC_CMD(msg=False))
+        if sub.status != pulp.LpStatusOptimal:
+            log.warning(f"subproblem status:{pulp.LpStatus[sub.status]}")
+            break
+        cost = sum([instance.establishment_cost[j] * y_values[j] for j in range(instance.n_facilities)]) \
+            + pulp.value(sub.objective)
+        if cost < upper_bound:
+            upper_bound = cost
+            best_y = y_values
+            best_x = {k: v.varValue for k, v in x.items() if v.varValue}
+            for j in range(instance.n_facilities):
+                y[j].setInitialValue(best_y[j])
+
+        log.info(f"iteration:{it}, lb:{lower_bound}, ub:{upper_bound}")
+        if upper_bound - lower_bound <= tolerance * abs(upper_bound):
+            break
+        if time.perf_counter() - start > time_limit:
+            log.info("time limit reached")
+            break
+        master.addConstraint(optimality_cut(instance, y, eta, demand_constraints, capacity_constraints),
+                             name=f"optimality_cut_{it}")
+
+    open_facilities = [j for j in range(instance.n_facilities) if best_y and best_y[j]]
+    return Result(lower_bound, upper_bound, open_facilities, best_x)
+
+
+def main():
+    instance = or_library.load(os.path.join(instance_dir, "cap42.txt"))
+    result = solve(instance)
+    log = logger.get_logger(__name__)
+    log.info(f"lb:{result.lower_bound}, ub:{result.upper_bound}, open:{result.open_facilities}")
+
+
+if __name__ == "__main__":
+    logger.set_logger()
+    main()
@@ -0,0 +1,132 @@
+import sys
+import numpy as np
+import pulp
+from typing import Tuple
+
+sys.path.append('../')
+
+from common import logger
+from uflp_lagrangian import assignment_cost, evaluate, improve_by_add_drop, local_search
+
+
+def uflp_greedy(a: np.ndarray, f: np.ndarray) -> np.ndarray:
+    n_facilities = len(f)
+    is_open = np.zeros(n_facilities, dtype=bool)
+    is_open[np.argmin(f + a.sum(axis=0))] = True
+    best = evaluate(a, f, is_open)
+    while True:
+        current = a[:, is_open].min(axis=1)
+        # total cost after additionally opening each facility
+        costs = f[is_open].sum() + f + np.minimum(current[:, None], a).sum(axis=0)
+        costs[is_open] = np.inf
+        j = np.argmin(costs)
+        if costs[j] >= best - 1e-9:
+            return is_open
+        is_open[j] = True
+        best = costs[j]
+
+
+# customers with the largest regret between their two cheapest open facilities are served first
+def greedy_transportation(c: np.ndarray, demands: np.ndarray, capacity: np.ndarray,
+                          is_open: np.ndarray) -> np.ndarray:
+    n_customers, n_facilities = c.shape
+    x = np.zeros((n_customers, n_facilities))
+    residual = np.where(is_open, capacity, 0).astype(np.float64)
+    masked = np.where(is_open[None, :], c, np.inf)
+    sorted_costs = np.sort(masked, axis=1)
+    if is_open.sum() >= 2:
+        regret = (sorted_costs[:, 1] - sorted_costs[:, 0]) * demands
+    else:
+        regret = demands.astype(np.float64)
+    for i in np.argsort(-regret):
+        rest = demands[i]
+        for j in np.argsort(masked[i]):
+            if rest <= 0 or not is_open[j]:
+                break
+            q = min(rest, residual[j])
+            if q > 0:
+                x[i, j] += q
+                residual[j] -= q
+                rest -= q
+        if rest > 0:
+            return None
+    return x
+
+
+# move quantity from a facility to a cheaper one with residual capacity
+def shift(c: np.ndarray, capacity: np.ndarray, is_open: np.ndarray, x: np.ndarray) -> np.ndarray:
+    x = x.copy()
+    residual = np.where(is_open, capacity, 0) - x.sum(axis=0)
+    improved = True
+    while improved:
+        improved = False
+        for i, j in zip(*np.nonzero(x)):
+            if x[i, j] <= 0:
+                continue
+            saving = c[i, j] - c[i]
+            saving[(residual <= 0) | ~is_open] = 0
+            k = np.argmax(saving)
+            if saving[k] > 1e-9:
+                q = min(x[i, j], residual[k])
+                x[i, j] -= q
+                x[i, k] += q
+                residual[j] += q
+                residual[k] -= q
+                improved = True
+    return x
+
+
+def cflp_evaluate(c: np.ndarray, f: np.ndarray, demands: np.ndarray, capacity: np.ndarray,
+                  is_open: np.ndarray) -> Tuple[float, np.ndarray]:
+    if capacity[is_open].sum() < demands.sum():
+        return np.inf, None
+    x = greedy_transportation(c, demands, capacity, is_open)
+    if x is None:
+        return np.inf, None
+    x = shift(c, capacity, is_open, x)
+    return f[is_open].sum() + (c * x).sum(), x
+
+
+def cflp_greedy(c: np.ndarray, f: np.ndarray, demands: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+    # cheapest facilities per unit of capacity first until the demand is covered
+    unit_cost = f / capacity + np.average(c, axis=0, weights=demands)
+    is_open = np.zeros(len(f), dtype=bool)
+    for j in np.argsort(unit_cost):
+        is_open[j] = True
+        if capacity[is_open].sum() >= demands.sum():
+            break
+    return is_open
+
+
+def uflp_solution(instance) -> Tuple[np.ndarray, np.ndarray, float]:
+    a = assignment_cost(instance)
+    f = np.asarray(instance.establishment_cost, dtype=np.float64)
+    is_open, cost = improve_by_add_drop(a, f, uflp_greedy(a, f), swap=True)
+    demands = np.asarray(instance.demands, dtype=np.float64)
+    x = np.zeros(a.shape)
+    open_facilities = np.flatnonzero(is_open)
+    x[np.arange(a.shape[0]), open_facilities[a[:, is_open].argmin(axis=1)]] = demands
+    return is_open, x, cost
+
+
+def cflp_solution(instance) -> Tuple[np.ndarray, np.ndarray, float]:
+    c = np.asarray(instance.transportation_cost, dtype=np.float64)
+    f = np.asarray(instance.establishment_cost, dtype=np.float64)
+    demands = np.asarray(instance.demands, dtype=np.float64)
+    capacity = np.asarray(instance.capacity, dtype=np.float64)
+    return local_search(lambda y: cflp_evaluate(c, f, demands, capacity, y), cflp_greedy(c, f, demands, capacity))
+
+
+# x and y are looked up by the names used in make_problem
+def set_initial_solution(problem: pulp.LpProblem, is_open: np.ndarray, x: np.ndarray):
+    log = logger.get_logger(__name__)
+    variables_dict = problem.variablesDict()
+    n_customers, n_facilities = x.shape
+    for j in range(n_facilities):
+        variables_dict[f"y_{j}"].setInitialValue(1 if is_open[j] else 0)
+    for i in range(n_customers):
+        for j in range(n_facilities):
+            # pairs pruned by a candidate list have no variable
+            if f"x_{i}_{j}" in variables_dict:
+                variables_dict[f"x_{i}_{j}"].setInitialValue(round(x[i, j]))
+    log.debug(f"initial solution: open:{list(np.flatnonzero(is_open))}")
@@ -0,0 +1,71 @@
+import sys
+import numpy as np
+from typing import Optional
+
+sys.path.append('../')
+
+from common import file_cache
+
+
+# same attribute names as Instance in the facility location modules, backed by numpy arrays
+class ArrayInstance:
+    def __init__(self, demands: np.ndarray, transportation_cost: np.ndarray, establishment_cost: np.ndarray, capacity: np.ndarray):
+        self.n_customers, self.n_facilities = transportation_cost.shape
+        self.demands = demands
+        self.transportation_cost = transportation_cost
+        self.establishment_cost = establishment_cost
+        self.capacity = capacity
+
+
+def _cache_paths(path: str):
+    return file_cache.cache_paths(path, "meta.npz", "cost.npy")
+
+
+def _to_float(token: str) -> float:
+    # capa/capb/capc give the literal "capacity" instead of a number, load needs the capacity then
+    try:
+        return float(token)
+    except ValueError:
+        if token != "capacity":
+            raise
+        return np.nan
+
+
+# whitespace separated tokens, so cost rows wrapped over several lines are handled as well
+def parse(path: str) -> ArrayInstance:
+    with open(path) as f:
+        tokens = f.read().split()
+    n_facilities = int(tokens[0])
+    n_customers = int(tokens[1])
+    pos = 2
+    facilities = np.array([_to_float(t) for t in tokens[pos:pos + 2 * n_facilities]])\
+        .reshape(n_facilities, 2)
+    pos += 2 * n_facilities
+    customers = np.array(tokens[pos:pos + n_customers * (n_facilities + 1)], dtype=np.float64)\
+        .reshape(n_customers, n_facilities + 1)
+    demands = customers[:, 0].copy()
+    # costs in the files are for the whole demand, convert them into per unit costs
+    transportation_cost = np.divide(customers[:, 1:], demands[:, None],
+                                    out=np.zeros((n_customers, n_facilities)), where=demands[:, None] > 0)
+    return ArrayInstance(demands, transportation_cost, facilities[:, 1].copy(), facilities[:, 0].copy())
+
+
+# a fresh cache is always read, write_cache saves one next to the file
+def load(path: str, capacity: Optional[float] = None, use_cache: bool = True,
+         write_cache: bool = False) -> ArrayInstance:
+    meta_path, cost_path = _cache_paths(path)
+    if use_cache and file_cache.is_fresh(path, [meta_path, cost_path]):
+        meta = np.load(meta_path)
+        instance = ArrayInstance(meta["demands"], np.load(cost_path, mmap_mode="r"),
+                                 meta["establishment_cost"], meta["capacity"])
+    else:
+        instance = parse(path)
+        if write_cache:
+            np.savez(meta_path, demands=instance.demands,
+                     establishment_cost=instance.establishment_cost, capacity=instance.capacity)
+            np.save(cost_path, instance.transportation_cost)
+    if capacity is not None:
+        instance.capacity = np.full(instance.n_facilities, float(capacity))
+    elif np.isnan(instance.capacity).any():
+        raise ValueError(f"{path}: the capacity is not given in the file, pass capacity")
+    return instance
@@ -0,0 +1,58 @@
+import os
+import numpy as np
+import pulp
+
+import or_library
+import candidate_pricing
+import capacitated_facility_location
+import uncapacitated_facility_location
+
+instance_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "instances")
+
+
+def random_instance(seed: int, n_customers: int = 10, n_facilities: int = 5) -> or_library.ArrayInstance:
+    rng = np.random.RandomState(seed)
+    demands = rng.randint(1, 20, size=n_customers).astype(np.float64)
+    capacity = rng.randint(30, 80, size=n_facilities).astype(np.float64)
+    return or_library.ArrayInstance(demands, rng.randint(1, 10, size=(n_customers, n_facilities)).astype(np.float64),
+                                    rng.randint(10, 100, size=n_facilities).astype(np.float64), capacity)
+
+
+def test_cheapest_candidates():
+    instance = random_instance(0)
+    candidates = candidate_pricing.cheapest_candidates(instance, 2)
+    assert len(candidates) == 2 * instance.n_customers
+    for i, j in candidates:
+        assert (instance.transportation_cost[i] < instance.transportation_cost[i, j]).sum() <= 1
+
+
+def test_same_optimum_as_all_pairs():
+    make_problem = capacitated_facility_location.make_problem
+    for seed in range(3):
+        instance = random_instance(seed)
+        full = make_problem(instance)
+        full.solve(pulp.PULP_CBC_CMD(msg=False))
+        _, record = candidate_pricing.solve(instance, make_problem, k=1, time_limit=60)
+        assert abs(record["objective"] - pulp.value(full.objective)) < 1e-6
+
+
+def test_cap71():
+    instance = uncapacitated_facility_location.read_instance(os.path.join(instance_dir, "uflp", "cap71.txt"))
+    _, record = candidate_pricing.solve(instance, uncapacitated_facility_location.make_problem, k=3, time_limit=60)
+    assert abs(record["objective"] - 932615.75) < 1e-3
+
+
+def test_time_limited_mip_is_not_repriced(monkeypatch):
+    exec_ = candidate_pricing.solve_with_log.exec
+    calls = []
+
+    def stopped_exec(problem, is_given_initial_solution, time_limit):
+        record = exec_(problem, is_given_initial_solution, time_limit)
+        record["solve_time"] = time_limit
+        calls.append(record)
+        return record
+
+    monkeypatch.setattr(candidate_pricing.solve_with_log, "exec", stopped_exec)
+    # without the time limit this instance needs a second MIP over the pairs added back
+    candidate_pricing.solve(random_instance(2), capacitated_facility_location.make_problem, k=1, time_limit=60)
+    assert len(calls) == 1
@@ -0,0 +1,46 @@
+import os
+import numpy as np
+import pulp
+
+import or_library
+import cflp_benders
+import capacitated_facility_location
+
+instance_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "instances")
+
+
+def random_instance(seed: int, n_customers: int = 8, n_facilities: int = 4) -> or_library.ArrayInstance:
+    rng = np.random.RandomState(seed)
+    demands = rng.randint(1, 20, size=n_customers).astype(np.float64)
+    capacity = rng.randint(20, 60, size=n_facilities).astype(np.float64)
+    capacity[0] = demands.sum()
+    return or_library.ArrayInstance(demands, rng.randint(1, 10, size=(n_customers, n_facilities)).astype(np.float64),
+                                    rng.randint(10, 100, size=n_facilities).astype(np.float64), capacity)
+
+
+def mip_optimum(instance) -> float:
+    problem = capacitated_facility_location.make_problem(instance)
+    problem.solve(pulp.PULP_CBC_CMD(msg=False))
+    return pulp.value(problem.objective)
+
+
+def test_matches_the_full_model():
+    for seed in range(3):
+        instance = random_instance(seed)
+        result = cflp_benders.solve(instance, time_limit=60)
+        assert result.lower_bound <= result.upper_bound + 1e-6
+        assert abs(result.upper_bound - mip_optimum(instance)) < 1e-6
+
+
+def test_solution_is_feasible():
+    instance = or_library.load(os.path.join(instance_dir, "cflp", "example.txt"), use_cache=False)
+    result = cflp_benders.solve(instance, time_limit=60)
+    assert abs(result.upper_bound - mip_optimum(instance)) < 1e-6
+    served = np.zeros(instance.n_customers)
+    used = np.zeros(instance.n_facilities)
+    for (i, j), q in result.x.items():
+        assert j in result.open_facilities
+        served[i] += q
+        used[j] += q
+    assert np.allclose(served, instance.demands)
+    assert (used <= instance.capacity + 1e-6).all()
@@ -0,0 +1,54 @@
+import numpy as np
+import pulp
+
+import or_library
+import facility_location_heuristics
+import capacitated_facility_location
+import uflp_lagrangian
+
+
+def random_instance(seed: int, n_customers: int = 10, n_facilities: int = 5) -> or_library.ArrayInstance:
+    rng = np.random.RandomState(seed)
+    demands = rng.randint(1, 20, size=n_customers).astype(np.float64)
+    capacity = rng.randint(30, 80, size=n_facilities).astype(np.float64)
+    return or_library.ArrayInstance(demands, rng.randint(1, 10, size=(n_customers, n_facilities)).astype(np.float64),
+                                    rng.randint(10, 100, size=n_facilities).astype(np.float64), capacity)
+
+
+def test_cflp_solution_is_feasible():
+    for seed in range(5):
+        instance = random_instance(seed)
+        is_open, x, cost = facility_location_heuristics.cflp_solution(instance)
+        assert np.allclose(x.sum(axis=1), instance.demands)
+        assert (x.sum(axis=0) <= np.where(is_open, instance.capacity, 0) + 1e-9).all()
+        assert abs(cost - instance.establishment_cost[is_open].sum() - (instance.transportation_cost * x).sum()) < 1e-6
+
+        problem = capacitated_facility_location.make_problem(instance)
+        problem.solve(pulp.PULP_CBC_CMD(msg=False))
+        assert cost >= pulp.value(problem.objective) - 1e-6
+
+
+def test_shift_does_not_increase_cost():
+    instance = random_instance(3)
+    c = instance.transportation_cost
+    is_open = np.ones(instance.n_facilities, dtype=bool)
+    x = facility_location_heuristics.greedy_transportation(c, instance.demands, instance.capacity, is_open)
+    shifted = facility_location_heuristics.shift(c, instance.capacity, is_open, x)
+    assert np.allclose(shifted.sum(axis=1), instance.demands)
+    assert (shifted.sum(axis=0) <= instance.capacity + 1e-9).all()
+    assert (c * shifted).sum() <= (c * x).sum() + 1e-9
+
+
+def test_uflp_solution_and_warm_start():
+    instance = random_instance(4)
+    is_open, x, cost = facility_location_heuristics.uflp_solution(instance)
+    a = uflp_lagrangian.assignment_cost(instance)
+    assert cost == uflp_lagrangian.evaluate(a, instance.establishment_cost, is_open)
+    assert np.allclose(x.sum(axis=1), instance.demands)
+    assert (x[:, ~is_open] == 0).all()
+
+    problem = capacitated_facility_location.make_problem(instance)
+    facility_location_heuristics.set_initial_solution(problem, is_open, x)
+    variables = problem.variablesDict()
+    assert [variables[f"y_{j}"].varValue for j in range(instance.n_facilities)] == [1 if o else 0 for o in is_open]
+    assert variables["x_0_0"].varValue == x[0, 0]
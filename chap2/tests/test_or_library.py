@@ -0,0 +1,45 @@
+import os
+import numpy as np
+import pytest
+
+import or_library
+import uncapacitated_facility_location
+
+instance_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "instances")
+
+# two facilities with the literal capacity of capa/capb/capc, the cost row of the second customer is wrapped
+text = "2 2\ncapacity 10.0\ncapacity 20.0\n4\n8.0 12.0\n2\n6.0\n2.0\n"
+
+
+def test_parse_matches_the_line_reader():
+    path = os.path.join(instance_dir, "uflp", "cap71.txt")
+    instance = or_library.load(path, use_cache=False)
+    expected = uncapacitated_facility_location.read_instance(path)
+    assert (instance.n_customers, instance.n_facilities) == (expected.n_customers, expected.n_facilities)
+    assert np.array_equal(instance.demands, expected.demands)
+    assert np.array_equal(instance.establishment_cost, expected.establishment_cost)
+    assert np.allclose(instance.transportation_cost, expected.transportation_cost)
+
+
+def test_literal_capacity(tmp_path):
+    path = str(tmp_path / "capx.txt")
+    with open(path, "w") as f:
+        f.write(text)
+    with pytest.raises(ValueError):
+        or_library.load(path)
+    instance = or_library.load(path, capacity=5)
+    assert np.array_equal(instance.capacity, [5, 5])
+    assert np.array_equal(instance.establishment_cost, [10, 20])
+    assert np.array_equal(instance.transportation_cost, [[2, 3], [3, 1]])
+
+
+def test_cache(tmp_path):
+    path = str(tmp_path / "capx.txt")
+    with open(path, "w") as f:
+        f.write(text)
+    parsed = or_library.load(path, capacity=5, write_cache=True)
+    assert all([os.path.exists(p) for p in or_library._cache_paths(path)])
+    cached = or_library.load(path, capacity=5)
+    assert isinstance(cached.transportation_cost, np.memmap)
+    assert np.array_equal(cached.transportation_cost, parsed.transportation_cost)
+    assert np.array_equal(cached.demands, parsed.demands)
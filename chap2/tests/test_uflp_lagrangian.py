@@ -0,0 +1,52 @@
+import os
+import itertools
+import numpy as np
+
+import or_library
+import uflp_lagrangian
+
+instance_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "instances")
+
+
+def random_instance(seed: int, n_customers: int = 12, n_facilities: int = 7):
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, 100, size=(n_customers, n_facilities)).astype(np.float64)
+    f = rng.randint(20, 150, size=n_facilities).astype(np.float64)
+    return a, f
+
+
+def optimum(a: np.ndarray, f: np.ndarray) -> float:
+    return min([uflp_lagrangian.evaluate(a, f, np.array(y, dtype=bool))
+                for y in itertools.product([False, True], repeat=len(f))])
+
+
+def test_bounds_enclose_the_optimum():
+    for seed in range(5):
+        a, f = random_instance(seed)
+        best = optimum(a, f)
+        v, slack = uflp_lagrangian.dual_ascent(a, f)
+        assert v.sum() <= best + 1e-6
+        is_open, upper_bound = uflp_lagrangian.primal_from_dual(a, f, slack)
+        assert upper_bound == uflp_lagrangian.evaluate(a, f, is_open) >= best
+        lower_bound, lam, upper_bound, is_open = uflp_lagrangian.subgradient(a, f, v, upper_bound, is_open)
+        assert lower_bound <= best + 1e-6 <= upper_bound + 1e-6
+        assert uflp_lagrangian.lagrangian(a, f, lam)[0] <= best + 1e-6
+
+
+def test_add_drop_does_not_get_worse():
+    a, f = random_instance(7)
+    start = np.zeros(len(f), dtype=bool)
+    start[0] = True
+    is_open, cost = uflp_lagrangian.improve_by_add_drop(a, f, start, swap=True)
+    assert cost == uflp_lagrangian.evaluate(a, f, is_open) <= uflp_lagrangian.evaluate(a, f, start)
+
+
+def test_solve_cap71():
+    instance = or_library.load(os.path.join(instance_dir, "uflp", "cap71.txt"), use_cache=False)
+    result = uflp_lagrangian.solve(instance, time_limit=60)
+    assert result.lower_bound <= result.upper_bound + 1e-6
+    assert abs(result.upper_bound - 932615.75) < 1e-3
+    a = uflp_lagrangian.assignment_cost(instance)
+    f = np.asarray(instance.establishment_cost)
+    assert abs(f[result.open_facilities].sum() + a[np.arange(len(a)), result.assignment].sum()
+               - result.upper_bound) < 1e-3
@@ -0,0 +1,221 @@
+import sys
+import os
+import itertools
+import pulp
+import numpy as np
+from typing import Any, Callable, Tuple
+
+sys.path.append('../')
+
+from common import logger, solve_with_log
+import or_library
+
+instance_dir = os.path.join("instances", "uflp")
+
+
+class Result:
+    def __init__(self, lower_bound: float, upper_bound: float, open_facilities: np.ndarray, assignment: np.ndarray):
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.open_facilities = open_facilities
+        self.assignment = assignment
+
+    @property
+    def gap(self) -> float:
+        return (self.upper_bound - self.lower_bound) / max(abs(self.upper_bound), 1e-9)
+
+
+# cost of serving the whole demand of customer i from facility j
+def assignment_cost(instance) -> np.ndarray:
+    return np.asarray(instance.transportation_cost, dtype=np.float64) * \
+        np.asarray(instance.demands, dtype=np.float64)[:, None]
+
+
+def evaluate(a: np.ndarray, f: np.ndarray, is_open: np.ndarray) -> float:
+    if not is_open.any():
+        return np.inf
+    return f[is_open].sum() + a[:, is_open].min(axis=1).sum()
+
+
+# cost gives the cost of a set of open facilities together with anything that comes with it,
+# e.g. the assignment, and an infinite cost if the set is infeasible. facilities are opened or
+# closed one at a time and, with swap, one is closed and another opened until no move improves
+def local_search(cost: Callable[[np.ndarray], Tuple[float, Any]], is_open: np.ndarray,
+                 swap: bool = True) -> Tuple[np.ndarray, Any, float]:
+    is_open = is_open.copy()
+    best, best_data = cost(is_open)
+    improved = True
+    while improved:
+        improved = False
+        for j in range(len(is_open)):
+            is_open[j] = not is_open[j]
+            value, data = cost(is_open)
+            if value < best - 1e-9:
+                best, best_data = value, data
+                improved = True
+            else:
+                is_open[j] = not is_open[j]
+        if not swap:
+            continue
+        for j_out in np.flatnonzero(is_open):
+            for j_in in np.flatnonzero(~is_open):
+                is_open[j_out], is_open[j_in] = False, True
+                value, data = cost(is_open)
+                if value < best - 1e-9:
+                    best, best_data = value, data
+                    improved = True
+                    break
+                is_open[j_out], is_open[j_in] = True, False
+            if improved:
+                break
+    return is_open, best_data, best
+
+
+def improve_by_add_drop(a: np.ndarray, f: np.ndarray, is_open: np.ndarray,
+                        swap: bool = False) -> Tuple[np.ndarray, float]:
+    is_open, _, best = local_search(lambda y: (evaluate(a, f, y), None), is_open, swap)
+    return is_open, best
+
+
+# DUALOC style dual ascent on the condensed dual max sum v_i s.t. sum_i max(0, v_i - a_ij) <= f_j
+def dual_ascent(a: np.ndarray, f: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    n_customers = a.shape[0]
+    levels = np.sort(a, axis=1)
+    v = levels[:, 0].copy()
+    slack = f - np.maximum(0, v[:, None] - a).sum(axis=0)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(n_customers):
+            k = np.searchsorted(levels[i], v[i], side="right")
+            next_level = levels[i][k] if k < len(levels[i]) else np.inf
+            covering = a[i] <= v[i] + 1e-9
+            delta = min(next_level - v[i], slack[covering].min())
+            if delta > 1e-9:
+                v[i] += delta
+                slack[covering] -= delta
+                changed = True
+    return v, slack
+
+
+def primal_from_dual(a: np.ndarray, f: np.ndarray, slack: np.ndarray) -> Tuple[np.ndarray, float]:
+    is_open = slack <= 1e-6
+    return improve_by_add_drop(a, f, is_open)
+
+
+def lagrangian(a: np.ndarray, f: np.ndarray, lam: np.ndarray) -> Tuple[float, np.ndarray, np.ndarray]:
+    reduced = np.minimum(0, a - lam[:, None])
+    rho = f + reduced.sum(axis=0)
+    y = rho < 0
+    value = lam.sum() + rho[y].sum()
+    return value, rho, y
+
+
+# subgradient optimization of the relaxation of sum_j z_ij = 1
+def subgradient(a: np.ndarray, f: np.ndarray, lam: np.ndarray, upper_bound: float, best_open: np.ndarray,
+                n_iterations: int = 300, step: float = 2.0):
+    log = logger.get_logger(__name__)
+    best_lb = -np.inf
+    best_lam = lam.copy()
+    no_improvement = 0
+    for it in range(n_iterations):
+        value, rho, y = lagrangian(a, f, lam)
+        if value > best_lb + 1e-9:
+            best_lb = value
+            best_lam = lam.copy()
+            no_improvement = 0
+        else:
+            no_improvement += 1
+            if no_improvement >= 20:
+                step /= 2
+                no_improvement = 0
+        if y.any():
+            is_open, cost = improve_by_add_drop(a, f, y)
+            if cost < upper_bound:
+                upper_bound = cost
+                best_open = is_open
+        z = (a - lam[:, None] < 0) & y[None, :]
+        g = 1 - z.sum(axis=1)
+        norm = (g * g).sum()
+        if norm == 0 or upper_bound - best_lb <= 1e-6 * abs(upper_bound) or step < 1e-4:
+            break
+        lam = lam + step * (upper_bound - value) / norm * g
+        log.debug(f"iteration:{it}, lb:{best_lb}, ub:{upper_bound}")
+    return best_lb, best_lam, upper_bound, best_open
+
+
+# facilities whose Lagrangian reduced cost proves them closed (or open) in every better solution
+def fix_facilities(rho: np.ndarray, lower_bound: float, upper_bound: float) -> Tuple[np.ndarray, np.ndarray]:
+    fixed_closed = (rho > 0) & (lower_bound + rho > upper_bound)
+    fixed_open = (rho < 0) & (lower_bound - rho > upper_bound)
+    return fixed_open, fixed_closed
+
+
+def make_reduced_problem(a: np.ndarray, f: np.ndarray, fixed_open: np.ndarray, fixed_closed: np.ndarray,
+                         incumbent: np.ndarray) -> pulp.LpProblem:
+    n_customers, n_facilities = a.shape
+    facilities = [j for j in range(n_facilities) if not fixed_closed[j]]
+    problem = pulp.LpProblem(name="facility_location", sense=pulp.LpMinimize)
+    z = {(i, j): pulp.LpVariable(name=f"z_{i}_{j}", lowBound=0, upBound=1)
+         for i, j in itertools.product(range(n_customers), facilities)}
+    y = {j: pulp.LpVariable(name=f"y_{j}", cat=pulp.LpBinary) for j in facilities}
+    problem.objective += pulp.lpSum([f[j] * y[j] for j in facilities])
+    problem.objective += pulp.lpSum([a[i, j] * z[i, j]
+                                     for i, j in itertools.product(range(n_customers), facilities)])
+    for i in range(n_customers):
+        problem.addConstraint(pulp.lpSum([z[i, j] for j in facilities]) == 1,
+                              name=f"customer_{i}")
+    for i, j in itertools.product(range(n_customers), facilities):
+        problem.addConstraint(z[i, j] <= y[j], name=f"open_{i}_{j}")
+    for j in facilities:
+        if fixed_open[j]:
+            problem.addConstraint(y[j] >= 1, name=f"fixed_open_{j}")
+        y[j].setInitialValue(1 if incumbent[j] else 0)
+    return problem
+
+
+def solve(instance, time_limit: int = 300, use_mip: bool = True, tolerance: float = 1e-6) -> Result:
+    log = logger.get_logger(__name__)
+    a = assignment_cost(instance)
+    f = np.asarray(instance.establishment_cost, dtype=np.float64)
+
+    v, slack = dual_ascent(a, f)
+    is_open, upper_bound = primal_from_dual(a, f, slack)
+    log.info(f"dual ascent: lb:{v.sum()}, ub:{upper_bound}")
+
+    lower_bound, lam, upper_bound, is_open = subgradient(a, f, v, upper_bound, is_open)
+    lower_bound = max(lower_bound, v.sum())
+    log.info(f"lagrangian: lb:{lower_bound}, ub:{upper_bound}")
+
+    if use_mip and upper_bound - lower_bound > tolerance * abs(upper_bound):
+        _, rho, _ = lagrangian(a, f, lam)
+        fixed_open, fixed_closed = fix_facilities(rho, lower_bound, upper_bound)
+        log.info(f"fixed open:{fixed_open.sum()}, fixed closed:{fixed_closed.sum()}")
+        problem = make_reduced_problem(a, f, fixed_open, fixed_closed, is_open)
+        record = solve_with_log.exec(problem, True, time_limit)
+        if record["status"] == "Optimal" and record["objective"] is not None:
+            values = problem.variablesDict()
+            mip_open = np.array([not fixed_closed[j] and values[f"y_{j}"].varValue > 0.5
+                                 for j in range(len(f))])
+            mip_cost = evaluate(a, f, mip_open)
+            if mip_cost < upper_bound:
+                upper_bound = mip_cost
+                is_open = mip_open
+            if record["solve_time"] < time_limit:
+                lower_bound = upper_bound
+
+    open_facilities = np.flatnonzero(is_open)
+    assignment = open_facilities[a[:, is_open].argmin(axis=1)]
+    result = Result(lower_bound, upper_bound, open_facilities, assignment)
+    log.info(f"lb:{result.lower_bound}, ub:{result.upper_bound}, gap:{result.gap}")
+    return result
+
+
+def main():
+    instance = or_library.load(os.path.join(instance_dir, "cap71.txt"))
+    solve(instance)
+
+
+if __name__ == "__main__":
+    logger.set_logger()
+    main()
@@ -2,11 +2,15 @@ import sys
 import os
 import itertools
 import pulp
-from typing import List, Dict
+import numpy as np
+from typing import List, Dict, Optional, Set, Tuple
 
 sys.path.append('../')
 
-from common import logger, solve_with_log
+from common import logger, solve_with_log, batch, matrix_model
+import or_library
+import facility_location_heuristics
+import candidate_pricing
 
 instance_dir = os.path.join("instances", "uflp")
 
@@ -42,39 +46,84 @@ def read_instance(path: str) -> Instance:
     return Instance(n_facilities, n_customers, demands, transportation_cost, establishment_cost)
 
 
-def make_problem(instance: Instance):
+# candidates restricts the customer-facility pairs that get an x variable, all pairs when None
+def make_problem(instance: Instance, candidates: Optional[Set[Tuple[int, int]]] = None):
+    if candidates is None:
+        candidates = set(itertools.product(
+            range(instance.n_customers), range(instance.n_facilities)))
+    pairs = sorted(candidates)
     problem = pulp.LpProblem(name="facility_location", sense=pulp.LpMinimize)
     x = {(i, j): pulp.LpVariable(name='x_{}_{}'.format(i, j), cat=pulp.LpInteger)
-         for i, j in itertools.product(range(instance.n_customers), range(instance.n_facilities))}
+         for i, j in pairs}
     y = {j: pulp.LpVariable(name='y_{}'.format(j), cat=pulp.LpBinary)
          for j in range(instance.n_facilities)}
     problem.objective += pulp.lpSum([instance.establishment_cost[j] * y[j]
                                      for j in range(instance.n_facilities)])
     problem.objective += pulp.lpSum([instance.transportation_cost[i][j] * x[i, j]
-                                     for i, j in itertools.product(range(instance.n_customers), range(instance.n_facilities))])
+                                     for i, j in pairs])
 
-    for i, j in itertools.product(range(instance.n_customers), range(instance.n_facilities)):
+    for i, j in pairs:
         problem.addConstraint(x[i, j] >= 0, name=f"x_positive_{i}_{j}")
 
+    facilities_of = {i: [] for i in range(instance.n_customers)}
+    customers_of = {j: [] for j in range(instance.n_facilities)}
+    for i, j in pairs:
+        facilities_of[i].append(j)
+        customers_of[j].append(i)
+
     for i in range(instance.n_customers):
-        problem.addConstraint(pulp.lpSum([x[i, j] for j in range(instance.n_facilities)]) >= instance.demands[i],
+        problem.addConstraint(pulp.lpSum([x[i, j] for j in facilities_of[i]]) >= instance.demands[i],
                               name=f"customer_demands_positive_{i}")
-        problem.addConstraint(pulp.lpSum([x[i, j] for j in range(instance.n_facilities)]) <= instance.demands[i],
+        problem.addConstraint(pulp.lpSum([x[i, j] for j in facilities_of[i]]) <= instance.demands[i],
                               name=f"customer_demands_negative_{i}")
 
     sum_demands = pulp.lpSum([d for d in instance.demands])
     for j in range(instance.n_facilities):
-        problem.addConstraint(pulp.lpSum([x[i, j] for i in range(instance.n_customers)]) <= y[j] * sum_demands,
+        problem.addConstraint(pulp.lpSum([x[i, j] for i in customers_of[j]]) <= y[j] * sum_demands,
                               name=f"capacity_{j}")
     return problem
 
 
+# same model as make_problem, built from coefficient arrays
+def make_matrix_model(instance):
+    n_c, n_f = instance.n_customers, instance.n_facilities
+    model = matrix_model.MatrixModel("facility_location")
+    x = model.add_variables((n_c, n_f), integer=True,
+                            cost=np.asarray(instance.transportation_cost, dtype=np.float64))
+    y = model.add_variables(n_f, ub=1, integer=True,
+                            cost=np.asarray(instance.establishment_cost, dtype=np.float64))
+    model.add_rows(np.repeat(np.arange(n_c), n_f), x.ravel(), 1.0,
+                   "E", np.asarray(instance.demands, dtype=np.float64))
+    capacity = np.full(n_f, np.sum(instance.demands), dtype=np.float64)
+    model.add_rows(np.concatenate([np.tile(np.arange(n_f), n_c), np.arange(n_f)]),
+                   np.concatenate([x.ravel(), y]),
+                   np.concatenate([np.ones(n_c * n_f), -capacity]), "L", np.zeros(n_f))
+    return model, x, y
+
+
 def main():
     instance = read_instance(os.path.join(instance_dir, "cap71.txt"))
-    problem = make_problem(instance)
-    solve_with_log.exec(problem, False, 300)
+    problem, build_time = solve_with_log.timed(make_problem, instance)
+    is_open, x, _ = facility_location_heuristics.uflp_solution(instance)
+    facility_location_heuristics.set_initial_solution(problem, is_open, x)
+    solve_with_log.exec(problem, True, 300, build_time=build_time)
+
+
+def sparse_main():
+    instance = read_instance(os.path.join(instance_dir, "cap71.txt"))
+    candidate_pricing.solve(instance, make_problem, k=5, time_limit=300)
+
+
+def batch_main():
+    batch.run(instance_dir, or_library.load, make_problem,
+              "uflp_results.csv", pattern="cap[0-9]*.txt", time_limit=300)
 
 
 if __name__ == "__main__":
     logger.set_logger()
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        batch_main()
+    elif len(sys.argv) > 1 and sys.argv[1] == "sparse":
+        sparse_main()
+    else:
+        main()
@@ -1,55 +1,28 @@
 import sys
 import os
 import itertools
+import functools
 import pulp
 from typing import List, Dict, Union
 
 sys.path.append('../')
 
 from common import logger, solve_with_log
+import bin_packing_heuristics
+import bin_packing_bounds
+import bin_packing_instances
 
 instance_dir = os.path.join("instances", "bin_packing")
 
 
+# the fullest bin that still fits is the best fit, so this is best fit decreasing
 def bins_by_greedy(bin_capacity: int, items: List[int]) -> int:
-    bins = [[]]
-    for item in sorted(items, reverse=True):
-        find = False
-        for bin in bins:
-            if sum(bin) + item <= bin_capacity:
-                bin.append(item)
-                find = True
-                break
-        if not find:
-            bins.append([item])
-        bins.sort(key=lambda x: sum(x), reverse=True)
-    return len(bins)
+    return bin_packing_heuristics.count_bins(bin_packing_heuristics.best_fit_decreasing(bin_capacity, items))
 
 
 def make_solution_by_greedy(bin_capacity: int, items: List[int]) -> List[List[int]]:
-    bins = [[]]
-    used = [False for _ in range(len(items))]
-    for item in sorted(items, reverse=True):
-        find = False
-        for bin in bins:
-            if sum(bin) + item <= bin_capacity:
-                bin.append(item)
-                find = True
-                break
-        if not find:
-            bins.append([item])
-        bins.sort(key=lambda x: sum(x), reverse=True)
-    solution = []
-    for bin in bins:
-        l = [0 for _ in range(len(items))]
-        for packed in bin:
-            for i in range(len(items)):
-                if (not used[i]) and (items[i] == packed):
-                    l[i] = 1
-                    used[i] = True
-                    break
-        solution.append(l)
-    return solution
+    return bin_packing_heuristics.assignment_to_solution(
+        bin_packing_heuristics.best_fit_decreasing(bin_capacity, items))
 
 
 def make_simple_solution(bin_capacity: int, items: List[int]) -> List[List[int]]:
@@ -126,21 +99,59 @@ def make_problem_with_initial_solution(bin_capacity: int, items: List[int], init
     return problem
 
 
-def read_from_text(idx: int) -> Union[int, List[int]]:
-    path = os.path.join(instance_dir, "binpack1.txt")
-    with open(path) as f:
-        n_instances = int(f.readline().replace("\n", ""))
-        instances = []
-        for _ in range(n_instances):
-            f.readline()
-            l = f.readline().replace("\n", "").split(' ')
-            bin_capacity = int(l[0])
-            n_items = int(l[1])
-            items = [int(f.readline().replace("\n", ""))
-                     for _ in range(n_items)]
-            instances.append([bin_capacity, items])
-    f.close()
-    return instances[idx]
+# bins are opened in order, item classes of equal size become integer counts, and the k-th largest
+# item may only go to the first k bins, so most symmetric bin permutations are cut off
+def make_compact_problem(bin_capacity: int, items: List[int], n_bins: int = None) -> pulp.LpProblem:
+    if n_bins is None:
+        n_bins = bins_by_greedy(bin_capacity, items)
+    sizes = sorted(set(items), reverse=True)
+    counts = [items.count(w) for w in sizes]
+    # position of the last item of each size class in decreasing order
+    last = list(itertools.accumulate(counts))
+    last = [p - 1 for p in last]
+
+    problem = pulp.LpProblem(name="bin_packing", sense=pulp.LpMinimize)
+    z = {}
+    for i, k in itertools.product(range(n_bins), range(len(sizes))):
+        upper = min(counts[k], bin_capacity // sizes[k], last[k] - i + 1)
+        if upper > 0:
+            z[i, k] = pulp.LpVariable(name='z_{}_{}'.format(i, k), lowBound=0, upBound=upper, cat=pulp.LpInteger)
+
+    t = {i: pulp.LpVariable(name='t_{}'.format(i), cat=pulp.LpBinary)
+         for i in range(n_bins)}
+
+    for i in range(n_bins):
+        problem.addConstraint(pulp.lpSum([z[i, k] * sizes[k] for k in range(len(sizes)) if (i, k) in z])
+                              <= bin_capacity * t[i], name=f"capcacity_{i}")
+
+    for k in range(len(sizes)):
+        problem.addConstraint(pulp.lpSum([z[i, k] for i in range(n_bins) if (i, k) in z]) == counts[k],
+                              name=f"count_{k}")
+
+    for i in range(n_bins - 1):
+        problem.addConstraint(t[i] >= t[i + 1], name=f"open_in_order_{i}")
+
+    problem.objective += pulp.lpSum([t[i] for i in range(n_bins)])
+    return problem
+
+
+def compare_formulations(bin_capacity: int, items: List[int], time_limit: int = 60):
+    log = logger.get_logger(__name__)
+    for make in [make_problem, make_compact_problem]:
+        problem, build_time = solve_with_log.timed(make, bin_capacity, items)
+        record = solve_with_log.exec(problem, False, time_limit, build_time=build_time)
+        log.info(f"{make.__name__}: variables:{record['n_variables']}, constraints:{record['n_constraints']}, "
+                 f"build:{record['build_time']:.3f}s, solve:{record['solve_time']:.3f}s, "
+                 f"status:{record['status']}, objective:{record['objective']}")
+
+
+@functools.lru_cache(maxsize=None)
+def instance_store(path: str = os.path.join(instance_dir, "binpack1.txt")) -> bin_packing_instances.InstanceStore:
+    return bin_packing_instances.InstanceStore(path)
+
+
+def read_from_text(idx: int, path: str = os.path.join(instance_dir, "binpack1.txt")) -> Union[int, List[int]]:
+    return instance_store(path).load(idx)
 
 
 def make_instance() -> Union[int, List[int]]:
@@ -152,20 +163,28 @@ def make_instance() -> Union[int, List[int]]:
     return bin_capacity, items
 
 
+# returns the number of bins, CBC is only started when the greedy solution is not proven optimal
+def solve_with_bounds(bin_capacity: int, items: List[int], time_limit: int = 300) -> int:
+    log = logger.get_logger(__name__)
+    lower_bound = bin_packing_bounds.lower_bound(bin_capacity, items)
+    initial_solution = make_solution_by_greedy(bin_capacity, items)
+    log.info(f"lower bound:{lower_bound}, greedy:{len(initial_solution)}")
+    if len(initial_solution) == lower_bound:
+        log.info("greedy solution is optimal")
+        return lower_bound
+    problem = make_problem_with_initial_solution(
+        bin_capacity, items, initial_solution)
+    solve_with_log.exec(problem, True, time_limit)
+    return round(pulp.value(problem.objective))
+
+
 def main():
     logger.set_logger()
     log = logger.get_logger(__name__)
 
     bin_capacity, items = read_from_text(0)
     # bin_capacity, items = make_instance()
-    # initial_solution = make_solution_by_greedy(bin_capacity, items)
-    initial_solution = make_simple_solution(bin_capacity, items)
-    solutions_str = "\n".join([f"{row}" for row in initial_solution])
-    log.debug(f"=========initial_solution=========\n{solutions_str}")
-    problem = make_problem_with_initial_solution(
-        bin_capacity, items, initial_solution)
-    # problem = make_problem(bin_capacity, items)
-    solve_with_log.exec(problem, True, 300)
+    solve_with_bounds(bin_capacity, items)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+import math
+from typing import List, Tuple
+
+
+def l1_bound(bin_capacity: int, items: List[int]) -> int:
+    return math.ceil(sum(items) / bin_capacity)
+
+
+# Martello-Toth L2: items larger than C - K need their own bin, items in (C/2, C - K] each need one
+# too, and items in [K, C/2] can only use what the latter leave free
+def l2_bound(bin_capacity: int, items: List[int]) -> int:
+    items = sorted(items, reverse=True)
+    best = l1_bound(bin_capacity, items)
+    candidates = sorted(set([w for w in items if w <= bin_capacity // 2] + [0]))
+    for k in candidates:
+        n1 = [w for w in items if w > bin_capacity - k]
+        n2 = [w for w in items if bin_capacity - k >= w > bin_capacity / 2]
+        n3 = [w for w in items if bin_capacity / 2 >= w >= k]
+        free = len(n2) * bin_capacity - sum(n2)
+        bound = len(n1) + len(n2) + max(0, math.ceil((sum(n3) - free) / bin_capacity))
+        best = max(best, bound)
+    return best
+
+
+# fixes bins that some optimal solution contains: an item that fits with nothing goes alone, and an
+# item that fits with at most one other item is paired with the largest one that fits.
+# returns the number of fixed bins and the items left over
+def reduce(bin_capacity: int, items: List[int]) -> Tuple[int, List[int]]:
+    free = sorted(items, reverse=True)
+    n_fixed = 0
+    i = 0
+    while i < len(free):
+        w = free[i]
+        others = free[:i] + free[i + 1:]
+        fitting = [k for k in range(len(others)) if w + others[k] <= bin_capacity]
+        if not fitting:
+            n_fixed += 1
+            free.pop(i)
+            i = 0
+            continue
+        # others are sorted in decreasing order, so the two smallest are at the end
+        if len(others) < 2 or w + others[-1] + others[-2] > bin_capacity:
+            n_fixed += 1
+            partner = fitting[0] if fitting[0] < i else fitting[0] + 1
+            free = [free[k] for k in range(len(free)) if k != i and k != partner]
+            i = 0
+            continue
+        i += 1
+    return n_fixed, free
+
+
+def reduction_bound(bin_capacity: int, items: List[int]) -> int:
+    n_fixed, rest = reduce(bin_capacity, items)
+    return n_fixed + l2_bound(bin_capacity, rest)
+
+
+def lower_bound(bin_capacity: int, items: List[int]) -> int:
+    return max(l1_bound(bin_capacity, items), l2_bound(bin_capacity, items),
+               reduction_bound(bin_capacity, items))
@@ -0,0 +1,188 @@
+import sys
+import math
+import collections
+import pulp
+from typing import List, Set, Tuple
+
+sys.path.append('../')
+
+from common import logger, colgen
+import bin_packing
+import bin_packing_heuristics
+
+# number of items of each size packed into one bin
+Pattern = Tuple[int, ...]
+
+
+def group_items(items: List[int]) -> Tuple[List[int], List[int]]:
+    counter = collections.Counter(items)
+    sizes = sorted(counter.keys(), reverse=True)
+    return sizes, [counter[s] for s in sizes]
+
+
+def patterns_from_assignment(items: List[int], assignment: List[int], sizes: List[int]) -> List[Pattern]:
+    index = {s: k for k, s in enumerate(sizes)}
+    bins = [[0 for _ in sizes] for _ in range(bin_packing_heuristics.count_bins(assignment))]
+    for i, b in enumerate(assignment):
+        bins[b][index[items[i]]] += 1
+    return list(set([tuple(b) for b in bins]))
+
+
+def single_size_patterns(bin_capacity: int, sizes: List[int], demands: List[int]) -> List[Pattern]:
+    patterns = []
+    for k, s in enumerate(sizes):
+        pattern = [0 for _ in sizes]
+        pattern[k] = min(demands[k], bin_capacity // s)
+        patterns.append(tuple(pattern))
+    return patterns
+
+
+def make_master(demands: List[int], patterns: List[Pattern], integer: bool) -> Tuple[pulp.LpProblem, List[pulp.LpVariable]]:
+    problem = pulp.LpProblem(name="bin_packing_master", sense=pulp.LpMinimize)
+    cat = pulp.LpInteger if integer else pulp.LpContinuous
+    x = [pulp.LpVariable(name=f"x_{p}", lowBound=0, cat=cat) for p in range(len(patterns))]
+    problem.objective += pulp.lpSum(x)
+    terms = [[] for _ in demands]
+    for p, pattern in enumerate(patterns):
+        for k, a in enumerate(pattern):
+            if a:
+                terms[k].append((x[p], a))
+    for k in range(len(demands)):
+        problem.addConstraint(pulp.LpAffineExpression(terms[k]) >= demands[k], name=f"demand_{k}")
+    return problem, x
+
+
+# max sum duals[k] * a[k] s.t. sum sizes[k] * a[k] <= bin_capacity, 0 <= a[k] <= demands[k]
+def bounded_knapsack(bin_capacity: int, sizes: List[int], demands: List[int], duals: List[float]) -> Tuple[float, Pattern]:
+    # binary splitting turns each bounded size into 0-1 items
+    pieces = []
+    for k, (s, q) in enumerate(zip(sizes, demands)):
+        q = min(q, bin_capacity // s)
+        c = 1
+        while q > 0:
+            take = min(c, q)
+            pieces.append((k, take))
+            q -= take
+            c *= 2
+    value = [0.0 for _ in range(bin_capacity + 1)]
+    choice = [[False for _ in range(bin_capacity + 1)] for _ in pieces]
+    for n, (k, take) in enumerate(pieces):
+        w = sizes[k] * take
+        v = duals[k] * take
+        if v <= 0:
+            continue
+        for c in range(bin_capacity, w - 1, -1):
+            if value[c - w] + v > value[c]:
+                value[c] = value[c - w] + v
+                choice[n][c] = True
+    pattern = [0 for _ in sizes]
+    c = bin_capacity
+    for n in range(len(pieces) - 1, -1, -1):
+        if choice[n][c]:
+            k, take = pieces[n]
+            pattern[k] += take
+            c -= sizes[k] * take
+    return value[bin_capacity], tuple(pattern)
+
+
+# cheap extra columns: start from each size and fill greedily by dual per unit of size
+def greedy_patterns(bin_capacity: int, sizes: List[int], demands: List[int], duals: List[float]) -> List[Tuple[float, Pattern]]:
+    order = sorted([k for k in range(len(sizes)) if duals[k] > 0],
+                   key=lambda k: duals[k] / sizes[k], reverse=True)
+    found = []
+    for first in order:
+        pattern = [0 for _ in sizes]
+        rest = bin_capacity
+        for k in [first] + order:
+            a = min(demands[k] - pattern[k], rest // sizes[k])
+            pattern[k] += a
+            rest -= a * sizes[k]
+        found.append((sum([duals[k] * pattern[k] for k in range(len(sizes))]), tuple(pattern)))
+    return found
+
+
+# the exact knapsack decides whether the LP is optimal, the greedy patterns are added along
+# with its pattern. returns a lower bound on the LP optimum, the columns and the last LP solution
+def column_generation(bin_capacity: int, sizes: List[int], demands: List[int],
+                      patterns: List[Pattern], target: int = 0) -> Tuple[float, List[Pattern], List[float]]:
+    def price(duals: List[float], known: Set[Pattern]) -> Tuple[float, bool, List[Pattern]]:
+        value, pattern = bounded_knapsack(bin_capacity, sizes, demands, duals)
+        if value <= 1 + 1e-9 or pattern in known:
+            return value, True, []
+        found = [(value, pattern)] + greedy_patterns(bin_capacity, sizes, demands, duals)
+        return value, True, list(dict.fromkeys([p for v, p in found if v > 1 + 1e-9 and p not in known]))
+
+    return colgen.solve(lambda columns: make_master(demands, columns, integer=False),
+                        [f"demand_{k}" for k in range(len(sizes))], price, patterns, target)
+
+
+# packs the items into the chosen patterns, slots beyond the demand are left empty
+def patterns_to_assignment(items: List[int], sizes: List[int], patterns: List[Pattern], counts: List[int]) -> List[int]:
+    remaining = collections.defaultdict(list)
+    for i in range(len(items)):
+        remaining[items[i]].append(i)
+    assignment = [-1 for _ in items]
+    b = 0
+    for pattern, count in zip(patterns, counts):
+        for _ in range(count):
+            used = False
+            for k, a in enumerate(pattern):
+                for _ in range(a):
+                    if remaining[sizes[k]]:
+                        assignment[remaining[sizes[k]].pop()] = b
+                        used = True
+            if used:
+                b += 1
+    return assignment
+
+
+# rounds the LP solution down and packs what is left with best fit decreasing
+def round_and_repair(bin_capacity: int, items: List[int], sizes: List[int], patterns: List[Pattern],
+                     lp_solution: List[float]) -> List[int]:
+    counts = [int(math.floor(v + 1e-9)) for v in lp_solution]
+    assignment = patterns_to_assignment(items, sizes, patterns, counts)
+    rest = [i for i in range(len(items)) if assignment[i] == -1]
+    offset = bin_packing_heuristics.count_bins([b for b in assignment if b != -1])
+    rest_assignment = bin_packing_heuristics.best_fit_decreasing(bin_capacity, [items[i] for i in rest])
+    for i, b in zip(rest, rest_assignment):
+        assignment[i] = offset + b
+    return assignment
+
+
+# the value of the result is the number of bins and the solution the bin of each item
+def solve(bin_capacity: int, items: List[int], time_limit: int = 60) -> colgen.Result:
+    log = logger.get_logger(__name__)
+    sizes, demands = group_items(items)
+    greedy = bin_packing_heuristics.best_fit_decreasing(bin_capacity, items)
+    patterns = patterns_from_assignment(items, greedy, sizes) + \
+        single_size_patterns(bin_capacity, sizes, demands)
+    lp_value, patterns, lp_solution = column_generation(
+        bin_capacity, sizes, demands, list(set(patterns)), bin_packing_heuristics.count_bins(greedy))
+
+    best = greedy
+    rounded = round_and_repair(bin_capacity, items, sizes, patterns, lp_solution)
+    if bin_packing_heuristics.count_bins(rounded) < bin_packing_heuristics.count_bins(best):
+        best = rounded
+    result = colgen.Result(bin_packing_heuristics.count_bins(best), lp_value, best)
+
+    if not result.is_optimal:
+        problem, x = make_master(demands, patterns, integer=True)
+        problem.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+        if problem.status == pulp.LpStatusOptimal:
+            counts = [int(round(v.varValue)) for v in x]
+            assignment = patterns_to_assignment(items, sizes, patterns, counts)
+            if bin_packing_heuristics.count_bins(assignment) < result.value:
+                result = colgen.Result(bin_packing_heuristics.count_bins(assignment), lp_value, assignment)
+
+    log.info(f"bins:{result.value}, lp bound:{result.lp_bound}, optimal:{result.is_optimal}")
+    return result
+
+
+def main():
+    logger.set_logger()
+    for bin_capacity, items in bin_packing.instance_store().instances():
+        solve(bin_capacity, items)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import heapq
+from typing import List
+
+
+class MaxSegmentTree:
+    def __init__(self, n: int, value: int = 0):
+        self.size = 1
+        while self.size < n:
+            self.size *= 2
+        # leaves past n never match a query
+        self.tree = [0] * self.size + [value if i < n else -1 for i in range(self.size)]
+        for i in range(self.size - 1, 0, -1):
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+
+    def get(self, i: int) -> int:
+        return self.tree[self.size + i]
+
+    def update(self, i: int, value: int):
+        tree = self.tree
+        i += self.size
+        tree[i] = value
+        i //= 2
+        while i:
+            left, right = tree[2 * i], tree[2 * i + 1]
+            tree[i] = left if left > right else right
+            i //= 2
+
+    # leftmost index >= lo whose value is at least x, -1 if there is none
+    def first_at_least(self, lo: int, x: int) -> int:
+        if lo > 0:
+            return self._first(1, 0, self.size, lo, x)
+        tree = self.tree
+        if tree[1] < x:
+            return -1
+        node = 1
+        while node < self.size:
+            node = 2 * node if tree[2 * node] >= x else 2 * node + 1
+        return node - self.size
+
+    def _first(self, node: int, left: int, right: int, lo: int, x: int) -> int:
+        if right <= lo or self.tree[node] < x:
+            return -1
+        if node >= self.size:
+            return node - self.size
+        mid = (left + right) // 2
+        found = self._first(2 * node, left, mid, lo, x)
+        if found != -1:
+            return found
+        return self._first(2 * node + 1, mid, right, lo, x)
+
+
+def _decreasing(items: List[int]) -> List[int]:
+    return sorted(range(len(items)), key=lambda i: items[i], reverse=True)
+
+
+# every function returns the bin index of each item, bins are numbered in the order they are opened
+
+def first_fit_decreasing(bin_capacity: int, items: List[int]) -> List[int]:
+    residual = MaxSegmentTree(len(items), bin_capacity)
+    assignment = [0 for _ in items]
+    for i in _decreasing(items):
+        b = residual.first_at_least(0, items[i])
+        residual.update(b, residual.get(b) - items[i])
+        assignment[i] = b
+    return assignment
+
+
+# bins are bucketed by their residual capacity, so the tightest bin is found in O(log capacity)
+def best_fit_decreasing(bin_capacity: int, items: List[int]) -> List[int]:
+    buckets = [[] for _ in range(bin_capacity + 1)]
+    counts = MaxSegmentTree(bin_capacity + 1)
+    assignment = [0 for _ in items]
+    n_bins = 0
+    for i in _decreasing(items):
+        r = counts.first_at_least(items[i], 1)
+        if r == -1:
+            b = n_bins
+            n_bins += 1
+            r = bin_capacity
+        else:
+            b = buckets[r].pop()
+            counts.update(r, len(buckets[r]))
+        r -= items[i]
+        buckets[r].append(b)
+        counts.update(r, len(buckets[r]))
+        assignment[i] = b
+    return assignment
+
+
+def worst_fit_decreasing(bin_capacity: int, items: List[int]) -> List[int]:
+    # heap of (-residual, bin)
+    heap = []
+    assignment = [0 for _ in items]
+    for i in _decreasing(items):
+        if heap and -heap[0][0] >= items[i]:
+            residual, b = heapq.heappop(heap)
+            heapq.heappush(heap, (residual + items[i], b))
+        else:
+            b = len(heap)
+            heapq.heappush(heap, (items[i] - bin_capacity, b))
+        assignment[i] = b
+    return assignment
+
+
+def count_bins(assignment: List[int]) -> int:
+    return max(assignment) + 1 if assignment else 0
+
+
+# n_bins x n_items binary rows as expected by make_problem_with_initial_solution
+def assignment_to_solution(assignment: List[int]) -> List[List[int]]:
+    solution = [[0 for _ in assignment] for _ in range(count_bins(assignment))]
+    for i, b in enumerate(assignment):
+        solution[b][i] = 1
+    return solution
@@ -0,0 +1,93 @@
+import sys
+import numpy as np
+from typing import Iterator, List, Tuple
+
+sys.path.append('../')
+
+from common import file_cache
+
+# OR-Library binpack files: the number of instances, then for each instance a name line,
+# a "capacity n_items best_known" line and one item size per line. the triplet files binpack5-8
+# have decimal sizes, those are scaled together with the capacity to integers
+
+
+# a fresh index cache is always read, write_cache saves one next to the file
+class InstanceStore:
+    def __init__(self, path: str, use_cache: bool = True, write_cache: bool = False):
+        self.path = path
+        cache_path, = file_cache.cache_paths(path, "index.npz")
+        if use_cache and file_cache.is_fresh(path, [cache_path]):
+            index = np.load(cache_path)
+        else:
+            index = build_index(path)
+            if write_cache:
+                np.savez(cache_path, **index)
+        self.names = [str(name) for name in index["names"]]
+        self.capacities = index["capacities"]
+        self.n_items = index["n_items"]
+        # byte offset of the first item of each instance
+        self.offsets = index["offsets"]
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def load(self, idx: int) -> Tuple[int, List[int]]:
+        with open(self.path, "rb") as f:
+            f.seek(int(self.offsets[idx]))
+            tokens = _read_tokens(f, int(self.n_items[idx]))
+        return _to_integers(float(self.capacities[idx]), tokens)
+
+    # one open file for the whole run instead of a seek per instance
+    def instances(self) -> Iterator[Tuple[int, List[int]]]:
+        with open(self.path, "rb") as f:
+            for idx in range(len(self)):
+                f.seek(int(self.offsets[idx]))
+                yield _to_integers(float(self.capacities[idx]), _read_tokens(f, int(self.n_items[idx])))
+
+
+# reads n whitespace separated numbers, so several items on one line are fine as well
+def _read_tokens(f, n: int) -> List[bytes]:
+    tokens = []
+    while len(tokens) < n:
+        line = f.readline()
+        if not line:
+            raise ValueError(f"{f.name}: expected {n} items, found {len(tokens)}")
+        tokens.extend(line.split())
+    return tokens
+
+
+def _decimals(token: str) -> int:
+    if "." not in token:
+        return 0
+    return len(token.rstrip("0").split(".")[1])
+
+
+# multiplies the capacity and all sizes by the same power of 10, which does not change which
+# items fit together, so the rest of the code can work with integers
+def _to_integers(capacity: float, tokens: List[bytes]) -> Tuple[int, List[int]]:
+    texts = [t.decode() for t in tokens]
+    scale = 10 ** max([_decimals(repr(capacity))] + [_decimals(t) for t in texts])
+    return int(round(capacity * scale)), [int(round(float(t) * scale)) for t in texts]
+
+
+def _skip_tokens(f, n: int):
+    while n > 0:
+        line = f.readline()
+        if not line:
+            raise ValueError(f"{f.name}: ended in the middle of an instance")
+        n -= len(line.split())
+
+
+def build_index(path: str) -> dict:
+    names, capacities, n_items, offsets = [], [], [], []
+    with open(path, "rb") as f:
+        n_instances = int(f.readline())
+        for _ in range(n_instances):
+            names.append(f.readline().decode().strip())
+            l = f.readline().split()
+            capacities.append(float(l[0]))
+            n_items.append(int(l[1]))
+            offsets.append(f.tell())
+            _skip_tokens(f, n_items[-1])
+    return {"names": np.array(names), "capacities": np.array(capacities, dtype=np.float64),
+            "n_items": np.array(n_items, dtype=np.int64), "offsets": np.array(offsets, dtype=np.int64)}
@@ -0,0 +1,36 @@
+import random
+import pulp
+
+import bin_packing
+import bin_packing_bounds
+
+
+def mip_optimum(bin_capacity, items):
+    problem = bin_packing.make_problem(bin_capacity, items)
+    problem.solve(pulp.PULP_CBC_CMD(msg=False))
+    return round(pulp.value(problem.objective))
+
+
+def test_l2_counts_large_items():
+    assert bin_packing_bounds.l1_bound(100, [60, 60, 60]) == 2
+    assert bin_packing_bounds.l2_bound(100, [60, 60, 60]) == 3
+    assert bin_packing_bounds.l2_bound(100, [60, 60, 45, 45]) == 3
+
+
+def test_reduce_fixes_bins():
+    # 90 only fits with 10 and 70 only with 30, which leaves 55 alone
+    assert bin_packing_bounds.reduce(100, [90, 70, 30, 10, 55]) == (3, [])
+    assert bin_packing_bounds.reduce(100, [40, 30, 20, 10]) == (0, [40, 30, 20, 10])
+
+
+def test_bounds_are_valid():
+    rng = random.Random(0)
+    for _ in range(10):
+        items = [rng.randint(5, 70) for _ in range(10)]
+        best = mip_optimum(100, items)
+        l1 = bin_packing_bounds.l1_bound(100, items)
+        l2 = bin_packing_bounds.l2_bound(100, items)
+        assert l1 <= l2 <= best
+        assert bin_packing_bounds.reduction_bound(100, items) <= best
+        assert bin_packing_bounds.lower_bound(100, items) <= best
+        assert bin_packing.solve_with_bounds(100, items, time_limit=30) == best
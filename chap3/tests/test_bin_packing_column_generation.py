@@ -0,0 +1,57 @@
+import os
+import random
+import itertools
+import pulp
+
+import bin_packing
+import bin_packing_heuristics
+import bin_packing_column_generation
+
+instance_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "instances", "bin_packing", "binpack1.txt")
+
+
+def check_assignment(bin_capacity, items, assignment):
+    load = [0 for _ in range(bin_packing_heuristics.count_bins(assignment))]
+    for i, b in enumerate(assignment):
+        assert b >= 0
+        load[b] += items[i]
+    assert max(load) <= bin_capacity
+
+
+def mip_optimum(bin_capacity, items):
+    problem = bin_packing.make_problem(bin_capacity, items)
+    problem.solve(pulp.PULP_CBC_CMD(msg=False))
+    return round(pulp.value(problem.objective))
+
+
+def test_bounded_knapsack_by_enumeration():
+    rng = random.Random(0)
+    for _ in range(20):
+        sizes = sorted(rng.sample(range(5, 40), 4), reverse=True)
+        demands = [rng.randint(1, 3) for _ in sizes]
+        duals = [rng.random() for _ in sizes]
+        value, pattern = bin_packing_column_generation.bounded_knapsack(50, sizes, demands, duals)
+        best = max([sum([d * a for d, a in zip(duals, p)])
+                    for p in itertools.product(*[range(q + 1) for q in demands])
+                    if sum([s * a for s, a in zip(sizes, p)]) <= 50])
+        assert abs(value - best) < 1e-9
+        assert sum([s * a for s, a in zip(sizes, pattern)]) <= 50
+        assert abs(sum([d * a for d, a in zip(duals, pattern)]) - value) < 1e-9
+
+
+def test_small_instances_are_optimal():
+    rng = random.Random(1)
+    for _ in range(5):
+        items = [rng.randint(10, 60) for _ in range(12)]
+        result = bin_packing_column_generation.solve(100, items, time_limit=30)
+        check_assignment(100, items, result.solution)
+        assert bin_packing_heuristics.count_bins(result.solution) == result.value
+        assert result.lower_bound <= result.value == mip_optimum(100, items)
+
+
+def test_binpack1():
+    bin_capacity, items = bin_packing.read_from_text(0, instance_path)
+    result = bin_packing_column_generation.solve(bin_capacity, items, time_limit=30)
+    check_assignment(bin_capacity, items, result.solution)
+    assert result.value == 48
+    assert result.is_optimal
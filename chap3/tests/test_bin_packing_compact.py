@@ -0,0 +1,34 @@
+import random
+import pulp
+
+import bin_packing
+
+
+def optimum(problem):
+    problem.solve(pulp.PULP_CBC_CMD(msg=False))
+    assert problem.status == pulp.LpStatusOptimal
+    return round(pulp.value(problem.objective))
+
+
+def test_same_optimum_as_the_assignment_model():
+    rng = random.Random(2)
+    for _ in range(5):
+        items = [rng.choice([15, 20, 35, 45, 60]) for _ in range(12)]
+        assert optimum(bin_packing.make_compact_problem(100, items)) == \
+            optimum(bin_packing.make_problem(100, items))
+
+
+def test_book_instance():
+    bin_capacity, items = bin_packing.make_instance()
+    assert optimum(bin_packing.make_compact_problem(bin_capacity, items)) == \
+        optimum(bin_packing.make_problem(bin_capacity, items))
+
+
+def test_size_classes_become_counts():
+    problem = bin_packing.make_compact_problem(10, [6, 6, 3], n_bins=3)
+    variables = problem.variablesDict()
+    # one count per bin and size, the two 6s are the largest items so they only go to the first two bins
+    assert "z_0_0" in variables and "z_1_0" in variables and "z_2_0" not in variables
+    assert variables["z_0_0"].upBound == 1
+    assert variables["z_2_1"].upBound == 1
+    assert optimum(problem) == 2
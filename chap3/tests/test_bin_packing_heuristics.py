@@ -0,0 +1,84 @@
+import random
+
+import bin_packing_heuristics
+
+
+# the greedy bin_packing used before the engine, bins kept sorted by their load, i.e. best fit decreasing
+def old_greedy(bin_capacity, items):
+    bins = [[]]
+    for item in sorted(items, reverse=True):
+        find = False
+        for bin in bins:
+            if sum(bin) + item <= bin_capacity:
+                bin.append(item)
+                find = True
+                break
+        if not find:
+            bins.append([item])
+        bins.sort(key=lambda x: sum(x), reverse=True)
+    return len(bins)
+
+
+# the bin each rule picks among the residual capacities, None to open a new bin
+def naive(bin_capacity, items, pick):
+    residual = []
+    assignment = [0 for _ in items]
+    for i in sorted(range(len(items)), key=lambda i: items[i], reverse=True):
+        fits = [b for b, r in enumerate(residual) if r >= items[i]]
+        b = pick(fits, residual) if fits else None
+        if b is None:
+            b = len(residual)
+            residual.append(bin_capacity)
+        residual[b] -= items[i]
+        assignment[i] = b
+    return assignment
+
+
+def loads(bin_capacity, items, assignment):
+    load = [0 for _ in range(bin_packing_heuristics.count_bins(assignment))]
+    for i, b in enumerate(assignment):
+        load[b] += items[i]
+    assert max(load) <= bin_capacity
+    return sorted(load)
+
+
+def random_items(seed, n=60, bin_capacity=100):
+    rng = random.Random(seed)
+    return [rng.randint(1, bin_capacity) for _ in range(n)]
+
+
+def test_same_bins_as_naive_rules():
+    rules = [
+        (bin_packing_heuristics.first_fit_decreasing, lambda fits, r: fits[0]),
+        (bin_packing_heuristics.best_fit_decreasing, lambda fits, r: min(fits, key=lambda b: (r[b], b))),
+        (bin_packing_heuristics.worst_fit_decreasing, lambda fits, r: max(fits, key=lambda b: (r[b], -b))),
+    ]
+    for seed in range(20):
+        items = random_items(seed)
+        for heuristic, pick in rules:
+            assignment = heuristic(100, items)
+            assert loads(100, items, assignment) == loads(100, items, naive(100, items, pick))
+
+
+def test_best_fit_matches_old_greedy():
+    for seed in range(20):
+        items = random_items(seed, bin_capacity=150)
+        assert bin_packing_heuristics.count_bins(bin_packing_heuristics.best_fit_decreasing(150, items)) == \
+            old_greedy(150, items)
+
+
+def test_solution_rows():
+    assignment = bin_packing_heuristics.first_fit_decreasing(10, [6, 5, 4, 3])
+    assert assignment == [0, 1, 0, 1]
+    assert bin_packing_heuristics.assignment_to_solution(assignment) == [[1, 0, 1, 0], [0, 1, 0, 1]]
+    assert bin_packing_heuristics.count_bins([]) == 0
+
+
+def test_segment_tree():
+    tree = bin_packing_heuristics.MaxSegmentTree(5, 3)
+    tree.update(1, 7)
+    tree.update(3, 9)
+    assert tree.first_at_least(0, 5) == 1
+    assert tree.first_at_least(2, 5) == 3
+    assert tree.first_at_least(4, 5) == -1
+    assert tree.first_at_least(0, 10) == -1
@@ -0,0 +1,50 @@
+import os
+import pytest
+
+import bin_packing_instances
+
+instance_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "instances", "bin_packing", "binpack1.txt")
+
+# a triplet file with decimal sizes and two items on one line
+text = "2\n t60_00\n 100.0 3 1\n 33.3\n 33.3 33.4\n t60_01\n 100.0 2 1\n 50.5\n 49.5\n"
+
+
+# reads every instance from the start of the file
+def read_all(path):
+    instances = []
+    with open(path) as f:
+        tokens = iter(f.read().split())
+    for _ in range(int(next(tokens))):
+        next(tokens)
+        capacity, n_items, _ = int(next(tokens)), int(next(tokens)), next(tokens)
+        instances.append((capacity, [int(next(tokens)) for _ in range(n_items)]))
+    return instances
+
+
+def test_same_instances_as_a_full_read():
+    store = bin_packing_instances.InstanceStore(instance_path, use_cache=False)
+    expected = read_all(instance_path)
+    assert len(store) == len(expected) == 20
+    assert store.names[0] == "u120_00"
+    assert list(store.instances()) == expected
+    assert store.load(7) == expected[7]
+
+
+def test_decimal_sizes_are_scaled(tmp_path):
+    path = str(tmp_path / "binpack5.txt")
+    with open(path, "w") as f:
+        f.write(text)
+    store = bin_packing_instances.InstanceStore(path, write_cache=True)
+    assert os.path.exists(path + ".index.npz")
+    assert store.load(0) == (1000, [333, 333, 334])
+    assert store.load(1) == (1000, [505, 495])
+    cached = bin_packing_instances.InstanceStore(path)
+    assert list(cached.instances()) == list(store.instances())
+
+
+def test_truncated_file(tmp_path):
+    path = str(tmp_path / "binpack.txt")
+    with open(path, "w") as f:
+        f.write("1\n u\n 10 3 1\n 4\n 5\n")
+    with pytest.raises(ValueError):
+        bin_packing_instances.InstanceStore(path, use_cache=False)
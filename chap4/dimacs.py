@@ -0,0 +1,124 @@
+import sys
+import numpy as np
+from typing import Iterator, List, Optional, Set, Tuple
+
+sys.path.append('../')
+
+from common import file_cache
+
+# bytes parsed at once, bounds the memory used for the text of the edge lines
+chunk_size = 1 << 24
+
+
+# undirected graph in compressed sparse row form, every edge is stored in both directions.
+# iterating gives each edge once as (i, j) with i < j, so it can be passed wherever a list of
+# edges is expected
+class CSRGraph:
+    def __init__(self, n: int, indptr: np.ndarray, indices: np.ndarray):
+        self.n = n
+        self.indptr = indptr
+        self.indices = indices
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices) // 2
+
+    def __len__(self) -> int:
+        return self.n_edges
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        i, j = self.edge_array().T
+        return zip(i.tolist(), j.tolist())
+
+    def neighbors(self, v: int) -> np.ndarray:
+        return self.indices[self.indptr[v]:self.indptr[v + 1]]
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    # n_edges x 2 array with i < j in every row
+    def edge_array(self) -> np.ndarray:
+        rows = np.repeat(np.arange(self.n, dtype=self.indices.dtype), self.degrees())
+        upper = rows < self.indices
+        return np.stack([rows[upper], self.indices[upper]], axis=1)
+
+    def adjacency_list(self) -> List[Set[int]]:
+        return [set(self.neighbors(v).tolist()) for v in range(self.n)]
+
+    def adjacency_matrix(self) -> np.ndarray:
+        adj = np.zeros((self.n, self.n), dtype=bool)
+        adj[np.repeat(np.arange(self.n), self.degrees()), self.indices] = True
+        return adj
+
+
+# drops self loops and duplicate edges in either direction, vertices are 0 based
+def from_edge_array(n: int, u: np.ndarray, v: np.ndarray) -> CSRGraph:
+    keep = u != v
+    lo = np.minimum(u[keep], v[keep]).astype(np.int64)
+    hi = np.maximum(u[keep], v[keep]).astype(np.int64)
+    # sorting the keys and dropping repeats is much faster than np.unique on millions of edges
+    key = np.sort(lo * n + hi)
+    # a graph without edges has nothing to deduplicate
+    if key.size > 0:
+        key = key[np.concatenate([[True], key[1:] != key[:-1]])]
+    lo, hi = key // n, key % n
+    both = np.sort(np.concatenate([key, hi * n + lo]))
+    rows, cols = both // n, both % n
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    dtype = np.int32 if n < (1 << 31) else np.int64
+    return CSRGraph(n, indptr, cols.astype(dtype))
+
+
+# every adjacency structure in this chapter is derived from the CSR form, a CSRGraph is returned as it is
+def to_csr(n: int, edges: List[Tuple[int, int]]) -> CSRGraph:
+    if isinstance(edges, CSRGraph):
+        return edges
+    e = np.asarray(list(edges), dtype=np.int64).reshape(-1, 2)
+    return from_edge_array(n, e[:, 0], e[:, 1])
+
+
+def _parse_lines(lines: List[bytes]) -> np.ndarray:
+    # "e u v" lines, the "e" is cut off before the numbers are parsed in one go
+    return np.fromstring(b" ".join([l[1:] for l in lines if l[:1] == b"e"]), dtype=np.int64, sep=" ")
+
+
+def _problem_size(lines: List[bytes]) -> Optional[int]:
+    for l in lines:
+        if l[:1] == b"p":
+            return int(l.split()[2])
+    return None
+
+
+# comments, blank lines and anything other than the problem and edge lines are skipped
+def parse(path: str) -> CSRGraph:
+    n = None
+    chunks = []
+    rest = b""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(chunk_size)
+            lines = (rest + block).split(b"\n")
+            # the last line may continue in the next block
+            rest = lines.pop() if block else b""
+            if n is None:
+                n = _problem_size(lines)
+            chunks.append(_parse_lines(lines))
+            if not block:
+                break
+    if n is None:
+        raise ValueError(f"{path}: no problem line")
+    edges = np.concatenate(chunks).reshape(-1, 2) - 1
+    return from_edge_array(n, edges[:, 0], edges[:, 1])
+
+
+# a fresh cache is always read, write_cache saves one next to the file
+def load(path: str, use_cache: bool = True, write_cache: bool = False) -> CSRGraph:
+    cache_path, = file_cache.cache_paths(path, "csr.npz")
+    if use_cache and file_cache.is_fresh(path, [cache_path]):
+        cache = np.load(cache_path)
+        return CSRGraph(int(cache["n"]), cache["indptr"], cache["indices"])
+    graph = parse(path)
+    if write_cache:
+        np.savez(cache_path, n=graph.n, indptr=graph.indptr, indices=graph.indices)
+    return graph
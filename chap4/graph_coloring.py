@@ -1,31 +1,28 @@
 import sys
 import os
 import itertools
+import time
+import multiprocessing
+import multiprocessing.connection
+import numpy as np
 import pulp
-from typing import List, Dict, Union, Tuple
+from typing import List, Dict, Set, Union, Tuple
 
 sys.path.append('../')
 
-from common import logger, solve_with_log
+from common import logger, backends
+import dimacs
+import graph_coloring_heuristics
 
 instance_dir = os.path.join("instances", "graph_coloring")
 
 Edge = Tuple[int, int]
 
 
-def read_instance(file: str) -> Union[int, List[Edge]]:
-    path = os.path.join(instance_dir, file)
-    with open(path) as f:
-        l = f.readline().replace("\n", "").split(' ')
-        n = int(l[2])
-        n_edges = int(l[3])
-        edges = []
-        for _ in range(n_edges):
-            l = f.readline().replace("\n", "").split(' ')
-            if int(l[1]) < int(l[2]):
-                edges.append((int(l[1]) - 1, int(l[2]) - 1))
-    f.close()
-    return n, edges
+# comment lines, duplicate and reversed edges are fine, the graph can be used as the list of edges
+def read_instance(file: str) -> Union[int, dimacs.CSRGraph]:
+    graph = dimacs.load(os.path.join(instance_dir, file))
+    return graph.n, graph
 
 
 def make_problem_for_feasibility(n: int, edges: List[Edge], n_colors: int) -> pulp.LpProblem:
@@ -51,14 +48,14 @@ def make_problem_for_feasibility(n: int, edges: List[Edge], n_colors: int) -> pu
     return problem
 
 
-def binary_seach(n: int, edges: List[Edge]) -> int:
+def binary_seach(n: int, edges: List[Edge], backend: str = "cbc", threads: int = None) -> int:
     log = logger.get_logger(__name__)
     lb = 1
     rb = n
     while rb - lb > 1:
         c = int((lb + rb) / 2)
         problem = make_problem_for_feasibility(n, edges, c)
-        problem.solve(pulp.PULP_CBC_CMD(msg=False))
+        problem.solve(backends.make_solver(backend, threads=threads))
         log.debug(f"c:{c}, status:{pulp.LpStatus[problem.status]}")
         if pulp.LpStatus[problem.status] == "Infeasible":
             lb = c
@@ -67,11 +64,189 @@ def binary_seach(n: int, edges: List[Edge]) -> int:
     return rb
 
 
+def _probe(n: int, edges: List[Edge], n_colors: int, backend: str, threads: int, time_limit: int, conn):
+    # own process group so that a cancelled probe takes its solver subprocess with it
+    os.setpgrp()
+    problem = make_problem_for_feasibility(n, edges, n_colors)
+    problem.solve(backends.make_solver(backend, time_limit=time_limit, threads=threads))
+    conn.send((problem.status, problem.sol_status))
+
+
+# up to k color counts spread evenly over the open interval (lb, rb), skipping running and undecided ones
+def _probe_points(lb: int, rb: int, k: int, skip: Set[int]) -> List[int]:
+    candidates = [c for c in range(lb + 1, rb) if c not in skip]
+    if k >= len(candidates):
+        return candidates
+    return sorted(set([candidates[(len(candidates) * (i + 1)) // (k + 1)] for i in range(k)]))
+
+
+# probes several color counts at once, a probe is cancelled as soon as another result
+# decides its side of the interval. lb colors are known to be too few and rb colors enough.
+# a probe that stops at time_limit without a coloring or a proof of infeasibility leaves its
+# count undecided and it is not probed again, so the returned rb is then only an upper bound.
+# every probe has its own pipe, a shared queue could be left locked by a killed probe
+def parallel_search(n: int, edges: List[Edge], max_workers: int = None, backend: str = "cbc",
+                    threads: int = 1, lb: int = 1, rb: int = None, time_limit: int = 60) -> int:
+    log = logger.get_logger(__name__)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if rb is None:
+        rb = n
+    context = multiprocessing.get_context("fork")
+    # color count -> (process, receiving end of its pipe)
+    running = {}
+    undecided = set()
+    try:
+        while rb - lb > 1:
+            for c in _probe_points(lb, rb, max_workers - len(running), undecided | set(running)):
+                receiver, sender = context.Pipe(duplex=False)
+                p = context.Process(target=_probe, args=(n, edges, c, backend, threads, time_limit, sender),
+                                    daemon=True)
+                p.start()
+                sender.close()
+                running[c] = (p, receiver)
+            if not running:
+                log.info(f"{rb} colors are enough, {sorted(undecided)} are undecided within the time limit")
+                break
+            ready = multiprocessing.connection.wait([receiver for _, receiver in running.values()])
+            for c in [c for c, (_, receiver) in running.items() if receiver in ready]:
+                p, receiver = running.pop(c)
+                try:
+                    status, sol_status = receiver.recv()
+                except EOFError:
+                    raise RuntimeError(f"probe with {c} colors exited without a result")
+                finally:
+                    receiver.close()
+                    p.join()
+                log.debug(f"c:{c}, status:{pulp.LpStatus[status]}, solution:{pulp.LpSolution[sol_status]}")
+                if sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+                    rb = min(rb, c)
+                elif status == pulp.LpStatusInfeasible:
+                    lb = max(lb, c)
+                else:
+                    undecided.add(c)
+            for c in [c for c in running if c <= lb or c >= rb]:
+                p, receiver = running.pop(c)
+                backends.terminate(p)
+                receiver.close()
+    finally:
+        for p, receiver in running.values():
+            backends.terminate(p)
+            receiver.close()
+    return rb
+
+
+# grows a clique from the vertices in order of degree, always adding the candidate with the most
+# neighbors among the candidates. stops once no vertex left can give a larger clique or after time_limit seconds.
+# uses the adjacency matrix like the coloring heuristics
+def greedy_clique(n: int, edges: List[Edge], time_limit: float = 1.0) -> List[int]:
+    graph = dimacs.to_csr(n, edges)
+    matrix = graph.adjacency_matrix()
+    degrees = graph.degrees()
+    start = time.perf_counter()
+    best = []
+    for v in np.argsort(-degrees, kind="stable").tolist():
+        if degrees[v] + 1 <= len(best) or time.perf_counter() - start > time_limit:
+            break
+        clique = [v]
+        candidates = graph.neighbors(v)
+        adj = matrix[candidates][:, candidates]
+        while len(candidates) > 0:
+            k = int(np.argmax(np.count_nonzero(adj, axis=1)))
+            clique.append(int(candidates[k]))
+            keep = adj[k]
+            candidates = candidates[keep]
+            adj = adj[keep][:, keep]
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+
+# renumbers the colors so that clique[k] gets color k and the others follow in order of first use
+def relabel(coloring: List[int], clique: List[int]) -> List[int]:
+    mapping = {coloring[v]: k for k, v in enumerate(clique)}
+    for c in coloring:
+        if c not in mapping:
+            mapping[c] = len(mapping)
+    return [mapping[c] for c in coloring]
+
+
+# w_k says whether color k is used, colors are used in order and the clique is colored 0, 1, ...
+def make_problem(n: int, edges: List[Edge], n_colors: int, clique: List[int]) -> Tuple[pulp.LpProblem, Dict, Dict]:
+    problem = pulp.LpProblem(name="graph_coloring", sense=pulp.LpMinimize)
+    x = {(i, k): pulp.LpVariable(name=f"x_{i}_{k}", cat=pulp.LpBinary)
+         for i, k in itertools.product(range(n), range(n_colors))}
+    w = {k: pulp.LpVariable(name=f"w_{k}", cat=pulp.LpBinary) for k in range(n_colors)}
+
+    problem.objective += pulp.lpSum([w[k] for k in range(n_colors)])
+
+    for i in range(n):
+        problem.addConstraint(pulp.lpSum([x[i, k] for k in range(n_colors)]) == 1, name=f"color_{i}")
+
+    for (i, j), k in itertools.product(edges, range(n_colors)):
+        problem.addConstraint(x[i, k] + x[j, k] <= w[k], name=f"edge_{i}_{j}_{k}")
+
+    isolated = set(range(n)) - {i for edge in edges for i in edge}
+    for i, k in itertools.product(sorted(isolated), range(n_colors)):
+        problem.addConstraint(x[i, k] <= w[k], name=f"use_{i}_{k}")
+
+    for k in range(n_colors - 1):
+        problem.addConstraint(w[k] >= w[k + 1], name=f"use_in_order_{k}")
+
+    for k, v in enumerate(clique):
+        x[v, k].lowBound = 1
+        w[k].lowBound = 1
+    return problem, x, w
+
+
+def set_initial_solution(x: Dict, w: Dict, coloring: List[int]):
+    for (i, k), v in x.items():
+        v.setInitialValue(1 if coloring[i] == k else 0)
+    for k, v in w.items():
+        v.setInitialValue(1 if k < graph_coloring_heuristics.count_colors(coloring) else 0)
+
+
+# the model is built once for the heuristic number of colors, every improved solution only
+# fixes the colors from its count on to zero before the next solve
+def solve(n: int, edges: List[Edge], time_limit: int = 60, backend: str = "cbc", threads: int = None,
+          heuristic_time_limit: float = 10) -> int:
+    log = logger.get_logger(__name__)
+    clique = greedy_clique(n, edges)
+    coloring = relabel(graph_coloring_heuristics.coloring(
+        n, edges, heuristic_time_limit, len(clique)), clique)
+    lb, ub = len(clique), graph_coloring_heuristics.count_colors(coloring)
+    log.info(f"clique:{lb}, heuristic:{ub}")
+    if lb == ub:
+        return ub
+
+    problem, x, w = make_problem(n, edges, ub, clique)
+    set_initial_solution(x, w, coloring)
+    while lb < ub:
+        start = time.perf_counter()
+        problem.solve(backends.make_solver(backend, time_limit=time_limit, threads=threads,
+                                           warm_start=backend == "cbc"))
+        elapsed = time.perf_counter() - start
+        value = pulp.value(problem.objective)
+        log.debug(f"status:{pulp.LpStatus[problem.status]}, colors:{value}, time:{elapsed:.3f}")
+        if problem.status != pulp.LpStatusOptimal or value is None:
+            break
+        if elapsed < time_limit:
+            lb = ub = round(value)
+            break
+        if round(value) >= ub:
+            break
+        ub = round(value)
+        for k in range(ub, len(w)):
+            w[k].upBound = 0
+    log.info(f"colors:{ub}, lower bound:{lb}")
+    return ub
+
+
 def main():
     logger.set_logger()
     log = logger.get_logger(__name__)
     n, edges = read_instance("queen5_5.col")
-    opt = binary_seach(n, edges)
+    opt = solve(n, edges)
     log.debug(f"opt:{opt}")
 
 
@@ -0,0 +1,165 @@
+import sys
+import time
+import numpy as np
+import pulp
+from typing import List, Optional, Set, Tuple
+
+sys.path.append('../')
+
+from common import logger, colgen
+import dimacs
+import graph_coloring
+import graph_coloring_heuristics
+
+Edge = Tuple[int, int]
+
+# vertices of one independent set, sorted
+Column = Tuple[int, ...]
+
+
+# adds vertices to the set in the given order as long as it stays independent
+def make_maximal(adj: np.ndarray, vertices: List[int], order: List[int]) -> Column:
+    blocked = adj[vertices].any(axis=0) if vertices else np.zeros(len(adj), dtype=bool)
+    chosen = list(vertices)
+    for v in order:
+        if not blocked[v] and v not in chosen:
+            chosen.append(v)
+            blocked |= adj[v]
+    return tuple(sorted(chosen))
+
+
+def columns_from_coloring(adj: np.ndarray, coloring: List[int]) -> List[Column]:
+    order = list(range(len(adj)))
+    classes = [[] for _ in range(graph_coloring_heuristics.count_colors(coloring))]
+    for v, c in enumerate(coloring):
+        classes[c].append(v)
+    return list(set([make_maximal(adj, vertices, order) for vertices in classes]))
+
+
+def make_master(n: int, columns: List[Column], integer: bool) -> Tuple[pulp.LpProblem, List[pulp.LpVariable]]:
+    problem = pulp.LpProblem(name="graph_coloring_master", sense=pulp.LpMinimize)
+    cat = pulp.LpBinary if integer else pulp.LpContinuous
+    x = [pulp.LpVariable(name=f"x_{s}", lowBound=0, cat=cat) for s in range(len(columns))]
+    problem.objective += pulp.lpSum(x)
+    terms = [[] for _ in range(n)]
+    for s, column in enumerate(columns):
+        for v in column:
+            terms[v].append((x[s], 1))
+    for v in range(n):
+        problem.addConstraint(pulp.LpAffineExpression(terms[v]) >= 1, name=f"cover_{v}")
+    return problem, x
+
+
+# greedy by weight over the number of uncovered neighbors, started from every positive vertex
+def greedy_independent_sets(adj: np.ndarray, weights: np.ndarray) -> List[Tuple[float, Column]]:
+    positive = np.flatnonzero(weights > 1e-9)
+    found = []
+    for first in positive:
+        chosen = [first]
+        free = ~adj[first]
+        free[first] = False
+        while True:
+            candidates = np.flatnonzero(free & (weights > 1e-9))
+            if len(candidates) == 0:
+                break
+            score = weights[candidates] / (1 + (adj[np.ix_(candidates, candidates)]).sum(axis=1))
+            v = candidates[np.argmax(score)]
+            chosen.append(v)
+            free &= ~adj[v]
+            free[v] = False
+        found.append((float(weights[chosen].sum()), tuple(sorted(int(v) for v in chosen))))
+    return found
+
+
+def exact_independent_set(adj: np.ndarray, edges: List[Edge], weights: np.ndarray,
+                          time_limit: Optional[int] = None) -> Tuple[float, Column, bool]:
+    positive = [v for v in range(len(adj)) if weights[v] > 1e-9]
+    problem = pulp.LpProblem(name="max_weight_independent_set", sense=pulp.LpMaximize)
+    z = {v: pulp.LpVariable(name=f"z_{v}", cat=pulp.LpBinary) for v in positive}
+    problem.objective += pulp.lpSum([weights[v] * z[v] for v in positive])
+    for i, j in edges:
+        if i in z and j in z:
+            problem.addConstraint(z[i] + z[j] <= 1, name=f"edge_{i}_{j}")
+    start = time.perf_counter()
+    problem.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+    elapsed = time.perf_counter() - start
+    chosen = tuple(sorted(v for v in positive if z[v].varValue is not None and z[v].varValue > 0.5))
+    # CBC reports a solution found at the time limit as optimal as well
+    proven = problem.status == pulp.LpStatusOptimal and (time_limit is None or elapsed < time_limit)
+    return float(weights[list(chosen)].sum()), chosen, proven
+
+
+# maximal versions of the found sets that are not columns yet
+def new_columns(adj: np.ndarray, found: List[Column], known: set) -> List[Column]:
+    order = list(range(len(adj)))
+    columns = set([make_maximal(adj, list(column), order) for column in found])
+    return [column for column in columns if column not in known]
+
+
+# the heuristic pricing is tried first, only when it finds nothing is the exact pricing run,
+# which bounds the LP when it finishes within pricing_time_limit.
+# returns a lower bound on the LP optimum, the columns and the last master LP solution
+def column_generation(adj: np.ndarray, edges: List[Edge], columns: List[Column], target: int = 0,
+                      pricing_time_limit: Optional[int] = None) -> Tuple[float, List[Column], List[float]]:
+    n = len(adj)
+
+    def price(duals: List[float], known: Set[Column]) -> Tuple[float, bool, List[Column]]:
+        weights = np.array(duals)
+        greedy = [(w, c) for w, c in greedy_independent_sets(adj, weights) if w > 1 + 1e-9]
+        found = new_columns(adj, [c for _, c in greedy], known)
+        if found:
+            return max([w for w, _ in greedy]), False, found
+        value, column, proven = exact_independent_set(adj, edges, weights, pricing_time_limit)
+        return value, proven, new_columns(adj, [column], known) if value > 1 + 1e-9 else []
+
+    return colgen.solve(lambda columns: make_master(n, columns, integer=False),
+                        [f"cover_{v}" for v in range(n)], price, columns, target)
+
+
+# a vertex covered by several chosen sets keeps the first one
+def columns_to_coloring(n: int, columns: List[Column], chosen: List[int]) -> List[int]:
+    coloring = [-1 for _ in range(n)]
+    for c, s in enumerate(chosen):
+        for v in columns[s]:
+            if coloring[v] == -1:
+                coloring[v] = c
+    return graph_coloring.relabel(coloring, [])
+
+
+# the value of the result is the number of colors and the solution the color of each vertex
+def solve(n: int, edges: List[Edge], time_limit: int = 60, heuristic_time_limit: float = 10) -> colgen.Result:
+    log = logger.get_logger(__name__)
+    adj = dimacs.to_csr(n, edges).adjacency_matrix()
+    clique = graph_coloring.greedy_clique(n, edges)
+    best = graph_coloring_heuristics.reduce_colors(
+        adj, graph_coloring_heuristics.dsatur(adj), heuristic_time_limit, len(clique))
+    n_colors = graph_coloring_heuristics.count_colors(best)
+    if n_colors == len(clique):
+        result = colgen.Result(n_colors, len(clique), best)
+        log.info(f"colors:{result.value}, clique bound:{len(clique)}, optimal:{result.is_optimal}")
+        return result
+
+    lp_value, columns, _ = column_generation(adj, edges, columns_from_coloring(adj, best), n_colors, time_limit)
+    result = colgen.Result(n_colors, max(lp_value, len(clique)), best)
+
+    if not result.is_optimal:
+        problem, x = make_master(n, columns, integer=True)
+        problem.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+        if problem.status == pulp.LpStatusOptimal:
+            chosen = [s for s in range(len(columns)) if x[s].varValue > 0.5]
+            coloring = columns_to_coloring(n, columns, chosen)
+            if graph_coloring_heuristics.count_colors(coloring) < result.value:
+                result = colgen.Result(graph_coloring_heuristics.count_colors(coloring), result.lp_bound, coloring)
+
+    log.info(f"colors:{result.value}, lp bound:{result.lp_bound}, optimal:{result.is_optimal}")
+    return result
+
+
+def main():
+    logger.set_logger()
+    n, edges = graph_coloring.read_instance("queen5_5.col")
+    solve(n, edges)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import time
+import numpy as np
+from typing import List, Optional, Tuple
+
+import dimacs
+
+Edge = Tuple[int, int]
+
+
+# every function returns the color of each vertex, colors are numbered from 0
+
+def dsatur(adj: np.ndarray) -> List[int]:
+    n = len(adj)
+    degree = adj.sum(axis=1)
+    # neighbor_colors[v, c] is the number of colored neighbors of v with color c
+    neighbor_colors = np.zeros((n, n + 1), dtype=np.int32)
+    saturation = np.zeros(n, dtype=np.int64)
+    coloring = np.full(n, -1, dtype=np.int64)
+    # highest saturation first, ties broken by degree
+    key = saturation * (n + 1) + degree
+    for _ in range(n):
+        v = int(np.argmax(key))
+        c = int(np.argmin(neighbor_colors[v] > 0))
+        coloring[v] = c
+        key[v] = -1
+        neighbors = np.flatnonzero(adj[v] & (coloring == -1))
+        new = neighbors[neighbor_colors[neighbors, c] == 0]
+        saturation[new] += 1
+        key[new] += n + 1
+        neighbor_colors[neighbors, c] += 1
+    return coloring.tolist()
+
+
+def count_colors(coloring: List[int]) -> int:
+    return max(coloring) + 1 if coloring else 0
+
+
+def count_conflicts(adj: np.ndarray, coloring: List[int]) -> int:
+    c = np.asarray(coloring)
+    return int((adj & (c[:, None] == c[None, :])).sum()) // 2
+
+
+# tries to find a conflict free coloring with n_colors colors starting from coloring, which
+# may have conflicts but uses no color >= n_colors. returns the coloring with fewest conflicts
+def tabucol(adj: np.ndarray, coloring: List[int], n_colors: int, max_iterations: int = 100000,
+            time_limit: Optional[float] = None, seed: int = 0) -> Tuple[List[int], int]:
+    rng = np.random.default_rng(seed)
+    n = len(adj)
+    color = np.asarray(coloring, dtype=np.int64).copy()
+    one_hot = np.zeros((n, n_colors), dtype=np.int32)
+    one_hot[np.arange(n), color] = 1
+    # gamma[v, c] is the number of neighbors of v with color c
+    gamma = adj.astype(np.int32) @ one_hot
+    conflicts = int(gamma[np.arange(n), color].sum()) // 2
+    best, best_conflicts = color.copy(), conflicts
+    tabu = np.zeros((n, n_colors), dtype=np.int64)
+    start = time.perf_counter()
+    for it in range(max_iterations):
+        if conflicts == 0 or (time_limit is not None and time.perf_counter() - start > time_limit):
+            break
+        conflicting = np.flatnonzero(gamma[np.arange(n), color] > 0)
+        delta = gamma[conflicting] - gamma[conflicting, color[conflicting]][:, None]
+        allowed = (tabu[conflicting] <= it) | (conflicts + delta < best_conflicts)
+        allowed[np.arange(len(conflicting)), color[conflicting]] = False
+        if not allowed.any():
+            continue
+        delta = np.where(allowed, delta, np.iinfo(np.int32).max)
+        candidates = np.argwhere(delta == delta.min())
+        r, c = candidates[rng.integers(len(candidates))]
+        v, old = conflicting[r], color[conflicting[r]]
+        conflicts += int(delta[r, c])
+        color[v] = c
+        neighbors = adj[v]
+        gamma[neighbors, old] -= 1
+        gamma[neighbors, c] += 1
+        tabu[v, old] = it + int(rng.integers(10)) + int(0.6 * len(conflicting))
+        if conflicts < best_conflicts:
+            best, best_conflicts = color.copy(), conflicts
+    return best.tolist(), best_conflicts
+
+
+# drops the highest color and repairs with tabucol until that fails or time runs out
+def reduce_colors(adj: np.ndarray, coloring: List[int], time_limit: float = 10, lower_bound: int = 1,
+                  seed: int = 0) -> List[int]:
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    best = list(coloring)
+    while count_colors(best) > lower_bound:
+        rest = time_limit - (time.perf_counter() - start)
+        if rest <= 0:
+            break
+        n_colors = count_colors(best) - 1
+        color = np.asarray(best)
+        dropped = np.flatnonzero(color == n_colors)
+        color[dropped] = rng.integers(n_colors, size=len(dropped))
+        candidate, conflicts = tabucol(adj, color.tolist(), n_colors, time_limit=rest,
+                                       seed=int(rng.integers(1 << 31)))
+        if conflicts > 0:
+            break
+        best = candidate
+    return best
+
+
+def coloring(n: int, edges: List[Edge], time_limit: float = 10, lower_bound: int = 1) -> List[int]:
+    adj = dimacs.to_csr(n, edges).adjacency_matrix()
+    return reduce_colors(adj, dsatur(adj), time_limit, lower_bound)
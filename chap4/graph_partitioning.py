@@ -8,6 +8,8 @@ from typing import List, Dict, Union, Tuple
 sys.path.append('../')
 
 from common import logger, solve_with_log
+import partition_enumeration
+import graph_partitioning_heuristics
 
 Edge = Tuple[int, int]
 
@@ -60,8 +62,11 @@ def main():
     p = 0.4
     edges = make_edges(n, p)
     problem = make_problem(n, edges)
-    solve_with_log.exec(problem, False, 100)
-    log.debug(f"by enumeration: {solution_by_enumeration(n, edges)}")
+    cut, side = graph_partitioning_heuristics.bisect(n, edges)
+    log.debug(f"by heuristic: {cut}")
+    graph_partitioning_heuristics.set_initial_solution(problem, side)
+    solve_with_log.exec(problem, True, 100)
+    log.debug(f"by enumeration: {partition_enumeration.min_bisection(n, edges)[0]}")
     log.debug(F"edges:{edges}")
 
 
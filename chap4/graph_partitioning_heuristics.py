@@ -0,0 +1,213 @@
+import random
+import collections
+import pulp
+from typing import Dict, List, Optional, Tuple
+
+import dimacs
+
+Edge = Tuple[int, int]
+
+# vertex -> weight of the edge to that neighbor
+Adjacency = List[Dict[int, int]]
+
+
+class GainBuckets:
+    # vertices bucketed by gain, the highest bucket is tracked so pop_max is O(1) amortized
+    def __init__(self, max_gain: int):
+        self.offset = max_gain
+        self.buckets = [set() for _ in range(2 * max_gain + 1)]
+        self.gain = {}
+        self.top = -1
+
+    def __len__(self) -> int:
+        return len(self.gain)
+
+    def add(self, v: int, gain: int):
+        b = gain + self.offset
+        self.buckets[b].add(v)
+        self.gain[v] = gain
+        if b > self.top:
+            self.top = b
+
+    def remove(self, v: int):
+        self.buckets[self.gain.pop(v) + self.offset].discard(v)
+
+    def update(self, v: int, delta: int):
+        gain = self.gain[v]
+        self.remove(v)
+        self.add(v, gain + delta)
+
+    def pop_max(self) -> Optional[int]:
+        while self.top >= 0 and not self.buckets[self.top]:
+            self.top -= 1
+        if self.top < 0:
+            return None
+        v = next(iter(self.buckets[self.top]))
+        self.remove(v)
+        return v
+
+
+def count_cut(adj: Adjacency, side: List[int]) -> int:
+    return sum([w for v in range(len(adj)) for u, w in adj[v].items() if u > v and side[u] != side[v]])
+
+
+# one Fiduccia-Mattheyses pass: vertices are moved from the heavier side, highest gain first,
+# each at most once, and the pass is rolled back to the best state that is within tolerance.
+# the pass stops early after max_stall moves without a new best state
+def fm_pass(adj: Adjacency, weights: List[int], side: List[int], tolerance: int, max_stall: int = 200) -> int:
+    n = len(adj)
+    max_gain = max([sum(a.values()) for a in adj] + [1])
+    gains = [sum([w if side[u] != side[v] else -w for u, w in adj[v].items()]) for v in range(n)]
+    buckets = [GainBuckets(max_gain), GainBuckets(max_gain)]
+    for v in range(n):
+        buckets[side[v]].add(v, gains[v])
+    size = [0, 0]
+    for v in range(n):
+        size[side[v]] += weights[v]
+
+    cut = count_cut(adj, side)
+    best = cut if abs(size[0] - size[1]) <= tolerance else None
+    best_moves = 0
+    moves = []
+    while True:
+        s = 0 if size[0] >= size[1] else 1
+        v = buckets[s].pop_max()
+        if v is None:
+            break
+        cut -= gains[v]
+        side[v] = 1 - s
+        size[s] -= weights[v]
+        size[1 - s] += weights[v]
+        moves.append(v)
+        for u, w in adj[v].items():
+            # v joined the side of u if they were apart before the move
+            delta = -2 * w if side[u] == side[v] else 2 * w
+            gains[u] += delta
+            if u in buckets[side[u]].gain:
+                buckets[side[u]].update(u, delta)
+        gains[v] = -gains[v]
+        if abs(size[0] - size[1]) <= tolerance and (best is None or cut < best):
+            best = cut
+            best_moves = len(moves)
+        elif best is not None and len(moves) - best_moves > max_stall:
+            break
+    if best is None:
+        return cut
+    for v in moves[best_moves:]:
+        side[v] = 1 - side[v]
+    return best
+
+
+def refine(adj: Adjacency, weights: List[int], side: List[int], tolerance: int, max_passes: int = 20) -> int:
+    cut = None
+    for _ in range(max_passes):
+        new_cut = fm_pass(adj, weights, side, tolerance)
+        if cut is not None and new_cut >= cut:
+            return new_cut
+        cut = new_cut
+    return cut
+
+
+# heavy edge matching, returns the coarse graph, its vertex weights and the coarse vertex of each vertex
+def coarsen(adj: Adjacency, weights: List[int], rng: random.Random) -> Tuple[Adjacency, List[int], List[int]]:
+    n = len(adj)
+    mapping = [-1 for _ in range(n)]
+    order = list(range(n))
+    rng.shuffle(order)
+    n_coarse = 0
+    for v in order:
+        if mapping[v] != -1:
+            continue
+        mapping[v] = n_coarse
+        free = [(w, u) for u, w in adj[v].items() if mapping[u] == -1]
+        if free:
+            mapping[max(free)[1]] = n_coarse
+        n_coarse += 1
+    coarse_adj = [dict() for _ in range(n_coarse)]
+    coarse_weights = [0 for _ in range(n_coarse)]
+    for v in range(n):
+        cv = mapping[v]
+        coarse_weights[cv] += weights[v]
+        for u, w in adj[v].items():
+            cu = mapping[u]
+            if cu != cv:
+                coarse_adj[cv][cu] = coarse_adj[cv].get(cu, 0) + w
+    return coarse_adj, coarse_weights, mapping
+
+
+# grows one side from a random vertex by breadth first search until it has half the weight
+def grow_partition(adj: Adjacency, weights: List[int], rng: random.Random) -> List[int]:
+    n = len(adj)
+    side = [0 for _ in range(n)]
+    half = sum(weights) // 2
+    grown = 0
+    queue = collections.deque()
+    remaining = list(range(n))
+    rng.shuffle(remaining)
+    while grown < half:
+        if not queue:
+            queue.extend([v for v in remaining if side[v] == 0][:1])
+        v = queue.popleft()
+        if side[v] == 1:
+            continue
+        side[v] = 1
+        grown += weights[v]
+        queue.extend([u for u in adj[v] if side[u] == 0])
+    return side
+
+
+def random_partition(n: int, rng: random.Random) -> List[int]:
+    side = [1 for _ in range(n // 2)] + [0 for _ in range(n - n // 2)]
+    rng.shuffle(side)
+    return side
+
+
+# balanced bisection of an unweighted graph, the sides differ by at most one vertex.
+# with multilevel the graph is coarsened down to coarsen_to vertices, partitioned there
+# and refined with FM on every level on the way back
+def bisect(n: int, edges: List[Edge], multilevel: bool = True, coarsen_to: int = 100,
+           n_trials: int = 4, seed: int = 0) -> Tuple[int, List[int]]:
+    rng = random.Random(seed)
+    graph = dimacs.to_csr(n, edges)
+    # unit edge weights, coarsening adds up the weights of merged edges
+    adj = [dict.fromkeys(graph.neighbors(v).tolist(), 1) for v in range(n)]
+    weights = [1 for _ in range(n)]
+    if not multilevel:
+        side = random_partition(n, rng)
+        return refine(adj, weights, side, n % 2), side
+
+    levels = [(adj, weights, None)]
+    while len(levels[-1][0]) > coarsen_to:
+        coarse_adj, coarse_weights, mapping = coarsen(levels[-1][0], levels[-1][1], rng)
+        if len(coarse_adj) > 0.9 * len(levels[-1][0]):
+            break
+        levels.append((coarse_adj, coarse_weights, mapping))
+
+    coarse_adj, coarse_weights, _ = levels[-1]
+    tolerance = max(coarse_weights)
+    best = None
+    for _ in range(n_trials):
+        side = grow_partition(coarse_adj, coarse_weights, rng)
+        cut = refine(coarse_adj, coarse_weights, side, tolerance)
+        if best is None or cut < best[0]:
+            best = (cut, side)
+    side = best[1]
+
+    for level in range(len(levels) - 1, 0, -1):
+        mapping = levels[level][2]
+        side = [side[mapping[v]] for v in range(len(mapping))]
+        adj_fine, weights_fine, _ = levels[level - 1]
+        tolerance = max(weights_fine) if level > 1 else n % 2
+        refine(adj_fine, weights_fine, side, tolerance)
+    return count_cut(adj, side), side
+
+
+# warm start for make_problem in graph_partitioning, side 1 is x_i = 1
+def set_initial_solution(problem: pulp.LpProblem, side: List[int]):
+    variables_dict = problem.variablesDict()
+    for name, v in variables_dict.items():
+        if name.startswith("x_"):
+            v.setInitialValue(side[int(name[2:])])
+        elif name.startswith("y_"):
+            i, j = name[2:].split("_")
+            v.setInitialValue(1 if side[int(i)] != side[int(j)] else 0)
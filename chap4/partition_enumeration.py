@@ -0,0 +1,114 @@
+import os
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+Edge = Tuple[int, int]
+
+# entries of the value matrix evaluated at once by a worker
+block_size = 1 << 22
+
+# set by _init_worker in every worker process
+_tables = None
+
+
+# row s says which of the k vertices are in subset s
+def subset_members(k: int) -> np.ndarray:
+    return ((np.arange(1 << k)[:, None] >> np.arange(k)) & 1).astype(bool)
+
+
+# number of cut edges inside the group for every subset. each subset is the one without its
+# highest vertex plus that vertex, so the table grows by one vertex at a time, like a Gray code,
+# and every step only needs the neighbors of the added vertex among the ones already placed
+def internal_cut(adj: np.ndarray) -> np.ndarray:
+    k = len(adj)
+    members = subset_members(k)
+    table = np.zeros(1, dtype=np.int64)
+    for t in range(k):
+        half = 1 << t
+        inside = members[:half, :t].astype(np.int64) @ adj[t, :t].astype(np.int64)
+        lower_degree = int(adj[t, :t].sum())
+        table = np.concatenate([table + inside, table + lower_degree - inside])
+    return table
+
+
+def _init_worker(tables):
+    global _tables
+    _tables = tables
+
+
+# the side containing vertex 0 is split into a part in the first half of the vertices (SA) and a
+# part in the second half (SB). the cut is F(SA) + G(SB) - 2 |edges between SA and SB|, the last
+# term is a product of membership matrices, so all SB of the right size are evaluated at once
+def _best_in_chunk(sa_masks: np.ndarray, n_b: int) -> Tuple[int, int, int]:
+    members_a, members_b, f, g, adj_ab, b_by_size = _tables
+    sb_masks = b_by_size[n_b]
+    m_b = members_b[sb_masks].astype(np.float32)
+    g_b = g[sb_masks].astype(np.float32)
+    best = (np.iinfo(np.int64).max, -1, -1)
+    step = max(1, block_size // len(sb_masks))
+    for lo in range(0, len(sa_masks), step):
+        chunk = sa_masks[lo:lo + step]
+        # c[b, s] is the number of neighbors of b in the s-th SA
+        c = adj_ab.T @ members_a[chunk].T.astype(np.float32)
+        values = g_b[:, None] - 2 * (m_b @ c) + f[chunk][None, :].astype(np.float32)
+        r, s = np.unravel_index(int(np.argmin(values)), values.shape)
+        value = int(round(float(values[r, s])))
+        if value < best[0]:
+            best = (value, int(chunk[s]), int(sb_masks[r]))
+    return best
+
+
+def _make_tables(n: int, edges: List[Edge]):
+    adj = np.zeros((n, n), dtype=bool)
+    for i, j in edges:
+        adj[i, j] = adj[j, i] = True
+    k_a = n // 2
+    adj_ab = adj[:k_a, k_a:]
+    members_a = subset_members(k_a)
+    members_b = subset_members(n - k_a)
+    f = internal_cut(adj[:k_a, :k_a]) + members_a.astype(np.int64) @ adj_ab.sum(axis=1)
+    g = internal_cut(adj[k_a:, k_a:]) + members_b.astype(np.int64) @ adj_ab.sum(axis=0)
+    sizes_b = members_b.sum(axis=1)
+    b_by_size = {s: np.flatnonzero(sizes_b == s) for s in range(n - k_a + 1)}
+    return members_a, members_b, f, g, adj_ab.astype(np.float32), b_by_size
+
+
+# exact minimum bisection, n should be even. vertex 0 is always on the first side, so each
+# partition is seen once, and only balanced ones are evaluated.
+# returns the cut and the side (1 for the side with vertex 0) of each vertex
+def min_bisection(n: int, edges: List[Edge], max_workers: Optional[int] = None,
+                  chunk_size: int = 1024) -> Tuple[int, List[int]]:
+    if n % 2 != 0:
+        raise ValueError(f"n should be even, got {n}")
+    tables = _make_tables(n, edges)
+    members_a = tables[0]
+    k_a = len(members_a[0])
+    sizes_a = members_a.sum(axis=1)
+    with_zero = np.flatnonzero(members_a[:, 0])
+    jobs = []
+    for a in range(1, k_a + 1):
+        n_b = n // 2 - a
+        if n_b < 0 or n_b > n - k_a:
+            continue
+        sa_masks = with_zero[sizes_a[with_zero] == a]
+        for lo in range(0, len(sa_masks), chunk_size):
+            jobs.append((sa_masks[lo:lo + chunk_size], n_b))
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 1:
+        _init_worker(tables)
+        results = [_best_in_chunk(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(tables,)) as executor:
+            results = list(executor.map(_best_in_chunk, *zip(*jobs)))
+
+    value, sa, sb = min(results)
+    side = [int(b) for b in itertools.chain(tables[0][sa], tables[1][sb])]
+    return value, side
+
+
+def count_cut(edges: List[Edge], side: List[int]) -> int:
+    return sum([1 for i, j in edges if side[i] != side[j]])
@@ -0,0 +1,45 @@
+import itertools
+import random
+from typing import List, Tuple
+
+Edge = Tuple[int, int]
+
+# small graphs with known chromatic numbers, vertices are 0 based
+
+
+def cycle(n: int) -> Tuple[int, List[Edge]]:
+    return n, [(i, (i + 1) % n) for i in range(n)]
+
+
+def complete(n: int) -> Tuple[int, List[Edge]]:
+    return n, list(itertools.combinations(range(n), 2))
+
+
+def petersen() -> Tuple[int, List[Edge]]:
+    outer = [(i, (i + 1) % 5) for i in range(5)]
+    inner = [(5 + i, 5 + (i + 2) % 5) for i in range(5)]
+    return 10, outer + inner + [(i, i + 5) for i in range(5)]
+
+
+# triangle free with chromatic number k, myciel(4) is the 11 vertex Grötzsch graph, myciel3 in DIMACS
+def myciel(k: int) -> Tuple[int, List[Edge]]:
+    n, edges = 2, [(0, 1)]
+    for _ in range(k - 2):
+        edges = edges + [(u + n, v) for u, v in edges] + [(u, v + n) for u, v in edges] + \
+            [(i + n, 2 * n) for i in range(n)]
+        n = 2 * n + 1
+    return n, edges
+
+
+def random_graph(n: int, p: float, seed: int) -> Tuple[int, List[Edge]]:
+    rng = random.Random(seed)
+    return n, [(i, j) for i, j in itertools.combinations(range(n), 2) if rng.random() < p]
+
+
+def is_clique(edges: List[Edge], vertices: List[int]) -> bool:
+    edge_set = set([(min(i, j), max(i, j)) for i, j in edges])
+    return all([(min(i, j), max(i, j)) in edge_set for i, j in itertools.combinations(vertices, 2)])
+
+
+def is_coloring(edges: List[Edge], coloring: List[int]) -> bool:
+    return all([coloring[i] != coloring[j] for i, j in edges])
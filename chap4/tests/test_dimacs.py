@@ -0,0 +1,72 @@
+import os
+import numpy as np
+import pytest
+
+import dimacs
+
+
+def write(tmp_path, text: bytes) -> str:
+    path = str(tmp_path / "graph.col")
+    with open(path, "wb") as f:
+        f.write(text)
+    return path
+
+
+def edge_set(graph):
+    return sorted(graph)
+
+
+def test_duplicates_and_self_loops(tmp_path):
+    path = write(tmp_path, b"c comment\np edge 4 6\ne 1 2\ne 2 1\ne 1 2\ne 3 3\ne 2 4\n\ne 4 3\n")
+    graph = dimacs.parse(path)
+    assert graph.n == 4
+    assert edge_set(graph) == [(0, 1), (1, 3), (2, 3)]
+    assert len(graph) == graph.n_edges == 3
+    assert graph.degrees().tolist() == [1, 2, 1, 2]
+    assert graph.adjacency_list() == [{1}, {0, 3}, {3}, {1, 2}]
+
+
+def test_crlf_without_trailing_newline(tmp_path):
+    path = write(tmp_path, b"p edge 3 2\r\ne 1 2\r\ne 2 3")
+    assert edge_set(dimacs.parse(path)) == [(0, 1), (1, 2)]
+
+
+def test_lines_split_between_chunks(tmp_path, monkeypatch):
+    rng = np.random.RandomState(0)
+    edges = [(int(i), int(j)) for i, j in rng.randint(1, 40, size=(200, 2))]
+    text = "p edge 40 200\n" + "".join([f"e {i} {j}\n" for i, j in edges])
+    path = write(tmp_path, text.encode())
+    expected = edge_set(dimacs.parse(path))
+    monkeypatch.setattr(dimacs, "chunk_size", 7)
+    assert edge_set(dimacs.parse(path)) == expected
+    assert expected == sorted(set([(min(i, j) - 1, max(i, j) - 1) for i, j in edges if i != j]))
+
+
+def test_no_edges(tmp_path):
+    graph = dimacs.parse(write(tmp_path, b"p edge 3 0\n"))
+    assert graph.n == 3 and graph.n_edges == 0
+    assert not graph.adjacency_matrix().any()
+    assert dimacs.to_csr(2, []).n_edges == 0
+
+
+def test_no_problem_line(tmp_path):
+    with pytest.raises(ValueError):
+        dimacs.parse(write(tmp_path, b"e 1 2\n"))
+
+
+def test_to_csr():
+    graph = dimacs.to_csr(4, [(0, 1), (3, 1), (1, 0)])
+    assert dimacs.to_csr(4, graph) is graph
+    assert edge_set(graph) == [(0, 1), (1, 3)]
+    assert graph.neighbors(1).tolist() == [0, 3]
+    adj = graph.adjacency_matrix()
+    assert (adj == adj.T).all() and adj.sum() == 4
+
+
+def test_cache(tmp_path):
+    path = write(tmp_path, b"p edge 3 2\ne 1 2\ne 2 3\n")
+    graph = dimacs.load(path, write_cache=True)
+    assert os.path.exists(path + ".csr.npz")
+    cached = dimacs.load(path)
+    assert cached.n == graph.n
+    assert edge_set(cached) == edge_set(graph)
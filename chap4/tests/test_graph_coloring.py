@@ -0,0 +1,55 @@
+import time
+import pulp
+
+import graph_coloring
+import graphs
+
+
+def test_greedy_clique():
+    for n, edges in [graphs.complete(6), graphs.cycle(7), graphs.petersen(), graphs.random_graph(60, 0.5, 0)]:
+        clique = graph_coloring.greedy_clique(n, edges)
+        assert graphs.is_clique(edges, clique)
+    assert len(graph_coloring.greedy_clique(*graphs.complete(6))) == 6
+    assert len(graph_coloring.greedy_clique(*graphs.myciel(4))) == 2
+    assert graph_coloring.greedy_clique(3, []) in ([0], [1], [2])
+
+
+def test_greedy_clique_budget():
+    n, edges = graphs.random_graph(300, 0.5, 1)
+    start = time.perf_counter()
+    clique = graph_coloring.greedy_clique(n, edges, time_limit=0.05)
+    assert time.perf_counter() - start < 5
+    assert graphs.is_clique(edges, clique)
+
+
+def test_relabel():
+    assert graph_coloring.relabel([5, 3, 5, 9], [1, 3]) == [2, 0, 2, 1]
+
+
+def test_solve():
+    cases = [(graphs.cycle(7), 3), (graphs.complete(5), 5), (graphs.petersen(), 3), (graphs.myciel(4), 4)]
+    for (n, edges), chromatic_number in cases:
+        assert graph_coloring.solve(n, edges, time_limit=60, heuristic_time_limit=0.5) == chromatic_number
+
+
+def test_probe_points():
+    assert graph_coloring._probe_points(1, 10, 2, set()) == [4, 7]
+    assert graph_coloring._probe_points(1, 10, 20, {3, 5}) == [2, 4, 6, 7, 8, 9]
+    assert graph_coloring._probe_points(4, 5, 3, set()) == []
+
+
+def test_parallel_search():
+    for (n, edges), chromatic_number in [(graphs.cycle(7), 3), (graphs.petersen(), 3), (graphs.myciel(4), 4)]:
+        assert graph_coloring.parallel_search(n, edges, max_workers=2, time_limit=60) == chromatic_number
+
+
+def test_parallel_search_undecided(monkeypatch):
+    # every probe from 4 colors down stops without a solution, as one at the time limit does
+    def probe(n, edges, n_colors, backend, threads, time_limit, conn):
+        if n_colors >= 5:
+            conn.send((pulp.LpStatusOptimal, pulp.LpSolutionOptimal))
+        else:
+            conn.send((pulp.LpStatusNotSolved, pulp.LpSolutionNoSolutionFound))
+
+    monkeypatch.setattr(graph_coloring, "_probe", probe)
+    assert graph_coloring.parallel_search(*graphs.complete(8), max_workers=2) == 5
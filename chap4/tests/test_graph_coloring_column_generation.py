@@ -0,0 +1,41 @@
+import itertools
+import numpy as np
+
+import dimacs
+import graph_coloring_column_generation
+import graph_coloring_heuristics
+import graphs
+
+
+def is_independent(edges, column):
+    return not any([i in column and j in column for i, j in edges])
+
+
+def test_columns_from_coloring():
+    n, edges = graphs.petersen()
+    adj = dimacs.to_csr(n, edges).adjacency_matrix()
+    columns = graph_coloring_column_generation.columns_from_coloring(adj, graph_coloring_heuristics.dsatur(adj))
+    assert all([is_independent(edges, column) for column in columns])
+    assert set(itertools.chain.from_iterable(columns)) == set(range(n))
+
+
+def test_exact_independent_set_by_enumeration():
+    n, edges = graphs.random_graph(12, 0.4, 2)
+    adj = dimacs.to_csr(n, edges).adjacency_matrix()
+    weights = np.random.RandomState(0).rand(n)
+    value, column, proven = graph_coloring_column_generation.exact_independent_set(adj, edges, weights)
+    best = max([weights[list(s)].sum() for k in range(n + 1) for s in itertools.combinations(range(n), k)
+                if is_independent(edges, s)])
+    assert proven
+    assert is_independent(edges, column)
+    assert abs(value - best) < 1e-6
+
+
+def test_solve():
+    cases = [(graphs.cycle(5), 3), (graphs.petersen(), 3), (graphs.myciel(4), 4), (graphs.complete(4), 4)]
+    for (n, edges), chromatic_number in cases:
+        result = graph_coloring_column_generation.solve(n, edges, time_limit=30, heuristic_time_limit=0.5)
+        assert result.value == chromatic_number
+        assert result.lower_bound <= chromatic_number
+        assert graphs.is_coloring(edges, result.solution)
+        assert graph_coloring_heuristics.count_colors(result.solution) == result.value
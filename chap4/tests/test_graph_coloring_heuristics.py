@@ -0,0 +1,49 @@
+import numpy as np
+
+import dimacs
+import graph_coloring_heuristics
+import graphs
+
+
+def adjacency(n, edges):
+    return dimacs.to_csr(n, edges).adjacency_matrix()
+
+
+def test_dsatur():
+    for n, edges in [graphs.petersen(), graphs.myciel(4), graphs.random_graph(80, 0.3, 0)]:
+        assert graphs.is_coloring(edges, graph_coloring_heuristics.dsatur(adjacency(n, edges)))
+    # dsatur is exact on bipartite graphs and cliques
+    assert graph_coloring_heuristics.count_colors(graph_coloring_heuristics.dsatur(adjacency(*graphs.cycle(10)))) == 2
+    assert graph_coloring_heuristics.count_colors(graph_coloring_heuristics.dsatur(adjacency(*graphs.complete(6)))) == 6
+
+
+def test_count_conflicts():
+    adj = adjacency(*graphs.cycle(4))
+    assert graph_coloring_heuristics.count_conflicts(adj, [0, 1, 0, 1]) == 0
+    assert graph_coloring_heuristics.count_conflicts(adj, [0, 0, 0, 1]) == 2
+    assert graph_coloring_heuristics.count_colors([]) == 0
+
+
+def test_tabucol_repairs_a_coloring():
+    n, edges = graphs.petersen()
+    adj = adjacency(n, edges)
+    start = np.random.RandomState(0).randint(3, size=n).tolist()
+    coloring, conflicts = graph_coloring_heuristics.tabucol(adj, start, 3, max_iterations=10000)
+    assert conflicts == 0
+    assert graphs.is_coloring(edges, coloring)
+    assert max(coloring) < 3
+    # two colors are not enough for an odd cycle, the best found keeps one conflict
+    _, conflicts = graph_coloring_heuristics.tabucol(adjacency(*graphs.cycle(7)), [0] * 7, 2, max_iterations=500)
+    assert conflicts == 1
+
+
+def test_reduce_colors():
+    n, edges = graphs.random_graph(60, 0.5, 1)
+    adj = adjacency(n, edges)
+    first = graph_coloring_heuristics.dsatur(adj)
+    reduced = graph_coloring_heuristics.reduce_colors(adj, first, time_limit=0.5)
+    assert graphs.is_coloring(edges, reduced)
+    assert graph_coloring_heuristics.count_colors(reduced) <= graph_coloring_heuristics.count_colors(first)
+    # the lower bound stops it at once
+    assert graph_coloring_heuristics.reduce_colors(adj, first, lower_bound=100) == first
+    assert graph_coloring_heuristics.count_colors(graph_coloring_heuristics.coloring(*graphs.petersen(), 10, 3)) == 3
@@ -0,0 +1,54 @@
+import random
+
+import graph_partitioning
+import graph_partitioning_heuristics
+import graphs
+
+
+def make_adj(n, edges):
+    adj = [dict() for _ in range(n)]
+    for i, j in edges:
+        adj[i][j] = adj[j][i] = 1
+    return adj
+
+
+def test_gain_buckets():
+    buckets = graph_partitioning_heuristics.GainBuckets(3)
+    buckets.add(0, -3)
+    buckets.add(1, 2)
+    buckets.add(2, 0)
+    buckets.update(1, -4)
+    assert len(buckets) == 3
+    assert [buckets.pop_max() for _ in range(3)] == [2, 1, 0]
+    assert buckets.pop_max() is None
+
+
+def test_fm_pass_does_not_increase_the_cut():
+    for seed in range(5):
+        n, edges = graphs.random_graph(30, 0.2, seed)
+        adj = make_adj(n, edges)
+        side = graph_partitioning_heuristics.random_partition(n, random.Random(seed))
+        before = graph_partitioning_heuristics.count_cut(adj, side)
+        cut = graph_partitioning_heuristics.fm_pass(adj, [1] * n, side, 0)
+        assert cut <= before
+        assert cut == graph_partitioning_heuristics.count_cut(adj, side)
+        assert sum(side) * 2 == n
+
+
+def test_bisect_is_balanced_and_not_below_the_optimum():
+    for seed, n in enumerate([10, 11, 12]):
+        n, edges = graphs.random_graph(n, 0.4, seed)
+        opt = graph_partitioning.solution_by_enumeration(n, edges) if n % 2 == 0 else 0
+        for multilevel in [True, False]:
+            cut, side = graph_partitioning_heuristics.bisect(n, edges, multilevel=multilevel, coarsen_to=4)
+            assert abs(2 * sum(side) - n) <= 1
+            assert cut == graph_partitioning_heuristics.count_cut(make_adj(n, edges), side)
+            assert cut >= opt
+
+
+def test_bisect_finds_the_cut_between_two_cliques():
+    n, edges = graphs.complete(8)
+    edges = list(edges) + [(i + 8, j + 8) for i, j in edges] + [(0, 8)]
+    cut, side = graph_partitioning_heuristics.bisect(16, edges, coarsen_to=4)
+    assert cut == 1
+    assert len(set(side[:8])) == 1 and len(set(side[8:])) == 1
@@ -0,0 +1,38 @@
+import itertools
+import numpy as np
+import pytest
+
+import partition_enumeration
+import graph_partitioning
+import graphs
+
+
+def test_internal_cut_by_enumeration():
+    n, edges = graphs.random_graph(7, 0.5, 3)
+    adj = np.zeros((n, n), dtype=bool)
+    for i, j in edges:
+        adj[i, j] = adj[j, i] = True
+    table = partition_enumeration.internal_cut(adj)
+    for s in range(1 << n):
+        side = [(s >> v) & 1 for v in range(n)]
+        assert table[s] == partition_enumeration.count_cut(edges, side)
+
+
+def test_same_cut_as_solution_by_enumeration():
+    for seed, (n, p) in enumerate([(2, 1.0), (6, 0.5), (8, 0.4), (10, 0.3), (12, 0.5)]):
+        n, edges = graphs.random_graph(n, p, seed)
+        cut, side = partition_enumeration.min_bisection(n, edges, max_workers=1, chunk_size=3)
+        assert cut == graph_partitioning.solution_by_enumeration(n, edges)
+        assert cut == partition_enumeration.count_cut(edges, side)
+        assert sum(side) * 2 == n and side[0] == 1
+
+
+def test_workers_give_the_same_cut():
+    n, edges = graphs.random_graph(14, 0.4, 5)
+    assert partition_enumeration.min_bisection(n, edges, max_workers=2)[0] == \
+        partition_enumeration.min_bisection(n, edges, max_workers=1)[0]
+
+
+def test_odd_number_of_vertices():
+    with pytest.raises(ValueError):
+        partition_enumeration.min_bisection(*graphs.cycle(5))
@@ -3,6 +3,7 @@ import networkx
 import itertools
 import os
 import math
+import numpy as np
 import matplotlib.pyplot as plt
 from datetime import datetime
 from typing import List, Dict, Union, Tuple
@@ -28,11 +29,12 @@ def make_evil_points(n: int):
     return x, y
 
 
-def make_euclidean_graph(n: int, x: List[float], y: List[float]) -> networkx.Graph:
+# weights are euclidean distances, squared ones only on request
+def make_euclidean_graph(n: int, x: List[float], y: List[float], squared: bool = False) -> networkx.Graph:
+    d = distance_matrix(x, y, squared)
+    i, j = np.triu_indices(n, 1)
     G = networkx.Graph()
-    for i, j in itertools.combinations(range(n), 2):
-        w = random.randint(1, 10)
-        G.add_edge(i, j, weight=dist(x[i], x[j], y[i], y[j]))
+    G.add_weighted_edges_from(zip(i.tolist(), j.tolist(), d[i, j].tolist()))
     return G
 
 
@@ -101,3 +103,113 @@ def read_hokkaido():
     y = [deg2rad(l - ave_lat) * r for l in lat]
     n = len(x)
     return n, x, y
+
+
+def distance_matrix(x: List[float], y: List[float], squared: bool = False) -> np.ndarray:
+    p = np.stack([np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)], axis=1)
+    d = ((p[:, None, :] - p[None, :, :])**2).sum(axis=2)
+    return d if squared else np.sqrt(d)
+
+
+# great circle distance by the haversine formula, in the unit of radius (km by default)
+def geographic_distance_matrix(lat: List[float], longt: List[float], radius: float = 6371.0) -> np.ndarray:
+    phi = np.radians(np.asarray(lat, dtype=np.float64))
+    lam = np.radians(np.asarray(longt, dtype=np.float64))
+    a = np.sin((phi[:, None] - phi[None, :]) / 2)**2 + \
+        np.cos(phi[:, None]) * np.cos(phi[None, :]) * np.sin((lam[:, None] - lam[None, :]) / 2)**2
+    return 2 * radius * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+# k nearest neighbors of every point by a uniform grid with about k points per cell. all points of a
+# cell are handled together, the block of cells around it grows until every point of the cell has
+# k candidates closer than anything outside the block
+def nearest_neighbors(x: List[float], y: List[float], k: int) -> np.ndarray:
+    p = np.stack([np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)], axis=1)
+    n = len(p)
+    k = min(k, n - 1)
+    # a single point has no neighbors
+    if k <= 0:
+        return np.zeros((n, 0), dtype=np.int64)
+    lo = p.min(axis=0)
+    extent = np.maximum(p.max(axis=0) - lo, 1e-12)
+    h = max(math.sqrt(extent[0] * extent[1] * max(k, 1) / n), extent.max() / n, 1e-12)
+    cell = np.floor((p - lo) / h).astype(np.int64)
+    n_cells = cell.max(axis=0) + 1
+    cell_id = cell[:, 0] * n_cells[1] + cell[:, 1]
+    order = np.argsort(cell_id, kind="stable")
+    starts = np.searchsorted(cell_id[order], np.arange(n_cells[0] * n_cells[1] + 1))
+
+    neighbors = np.zeros((n, k), dtype=np.int64)
+    for c in np.unique(cell_id):
+        cx, cy = c // n_cells[1], c % n_cells[1]
+        members = order[starts[c]:starts[c + 1]]
+        r = 0
+        while True:
+            xs = range(max(cx - r, 0), min(cx + r, n_cells[0] - 1) + 1)
+            ys = (max(cy - r, 0), min(cy + r, n_cells[1] - 1) + 1)
+            candidates = np.concatenate([order[starts[i * n_cells[1] + ys[0]]:starts[i * n_cells[1] + ys[1]]]
+                                         for i in xs])
+            covers_all = len(xs) == n_cells[0] and ys[1] - ys[0] == n_cells[1]
+            if len(candidates) > k:
+                d = ((p[members, None, :] - p[None, candidates, :])**2).sum(axis=2)
+                d[members[:, None] == candidates[None, :]] = np.inf
+                nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+                kth = np.take_along_axis(d, nearest, axis=1).max(axis=1)
+                # anything outside the block is at least r cells away
+                if covers_all or (kth <= (r * h)**2).all():
+                    neighbors[members] = candidates[nearest]
+                    break
+            elif covers_all:
+                neighbors[members] = [[v for v in candidates if v != u][:k] for u in members]
+                break
+            r += 1
+    return neighbors
+
+
+# union of the k nearest neighbor lists as an m x 2 array with i < j
+def candidate_edges(x: List[float], y: List[float], k: int) -> np.ndarray:
+    neighbors = nearest_neighbors(x, y, k)
+    i = np.repeat(np.arange(len(neighbors)), neighbors.shape[1])
+    j = neighbors.ravel()
+    edges = np.stack([np.minimum(i, j), np.maximum(i, j)], axis=1)
+    return np.unique(edges, axis=0)
+
+
+class ArrayGraph:
+    # the part of the networkx graph interface the TSP models use, G.edges and G[i][j]['weight'],
+    # backed by a weight matrix and an edge array instead of networkx objects
+    class _Row:
+        def __init__(self, weight: np.ndarray, i: int):
+            self.weight = weight
+            self.i = i
+
+        def __getitem__(self, j: int) -> Dict[str, float]:
+            return {'weight': float(self.weight[self.i, j])}
+
+    def __init__(self, weight: np.ndarray, edges: np.ndarray):
+        self.weight = weight
+        self.edge_array = edges
+
+    @property
+    def edges(self) -> List[Edge]:
+        return list(zip(self.edge_array[:, 0].tolist(), self.edge_array[:, 1].tolist()))
+
+    def __getitem__(self, i: int) -> "ArrayGraph._Row":
+        return ArrayGraph._Row(self.weight, i)
+
+    def adjacent_list(self) -> List[List[int]]:
+        return edges_to_adjacent_list(self.edges, len(self.weight))
+
+    def to_directed(self) -> "ArrayGraph":
+        return ArrayGraph(self.weight, np.concatenate([self.edge_array, self.edge_array[:, ::-1]]))
+
+
+# same weights as make_euclidean_graph, either on all pairs or only on the k nearest neighbors
+def make_euclidean_array_graph(n: int, x: List[float], y: List[float], k: int = None,
+                               squared: bool = False) -> ArrayGraph:
+    weight = distance_matrix(x, y, squared)
+    if k is None:
+        edges = np.stack(np.triu_indices(n, 1), axis=1)
+    else:
+        edges = candidate_edges(x, y, k)
+    return ArrayGraph(weight, edges)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# the modules of a chapter import each other by name and common from the repository root
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(here, ".."), os.path.join(here, "..", "..")]
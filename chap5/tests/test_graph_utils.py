@@ -0,0 +1,68 @@
+import random
+import numpy as np
+
+import graph_utils
+
+
+def points(n, seed, evil=False):
+    random.seed(seed)
+    return graph_utils.make_evil_points(n) if evil else graph_utils.make_points(n)
+
+
+def check_nearest_neighbors(x, y, k):
+    n = len(x)
+    neighbors = graph_utils.nearest_neighbors(x, y, k)
+    k = max(min(k, n - 1), 0)
+    assert neighbors.shape == (n, k)
+    d = graph_utils.distance_matrix(x, y, squared=True)
+    np.fill_diagonal(d, np.inf)
+    for u in range(n):
+        assert len(set(neighbors[u].tolist())) == k and u not in neighbors[u]
+        # ties may be broken either way, so the distances are compared
+        assert np.allclose(np.sort(d[u, neighbors[u]]), np.sort(d[u])[:k])
+
+
+def test_nearest_neighbors_by_brute_force():
+    for seed, (n, evil) in enumerate([(200, False), (300, True), (50, True)]):
+        x, y = points(n, seed, evil)
+        for k in [1, 5, 10]:
+            check_nearest_neighbors(x, y, k)
+
+
+def test_nearest_neighbors_degenerate():
+    for n in [0, 1, 2, 3]:
+        x, y = points(n, n)
+        check_nearest_neighbors(x, y, 5)
+    # duplicate points and points on a line
+    check_nearest_neighbors([1.0] * 6, [2.0] * 6, 3)
+    check_nearest_neighbors([float(i) for i in range(30)], [0.0] * 30, 4)
+    check_nearest_neighbors([0.0] * 10 + [100.0], [0.0] * 10 + [100.0], 3)
+
+
+def test_distance_matrix():
+    x, y = [0, 3, 0], [0, 4, 1]
+    assert np.allclose(graph_utils.distance_matrix(x, y), [[0, 5, 1], [5, 0, np.sqrt(18)], [1, np.sqrt(18), 0]])
+    assert np.allclose(graph_utils.distance_matrix(x, y, squared=True), [[0, 25, 1], [25, 0, 18], [1, 18, 0]])
+
+
+def test_candidate_edges():
+    x, y = points(100, 0)
+    edges = graph_utils.candidate_edges(x, y, 5)
+    assert (edges[:, 0] < edges[:, 1]).all()
+    assert len(set(map(tuple, edges.tolist()))) == len(edges)
+    neighbors = graph_utils.nearest_neighbors(x, y, 5)
+    assert {(min(u, v), max(u, v)) for u in range(100) for v in neighbors[u].tolist()} == set(map(tuple, edges.tolist()))
+
+
+def test_array_graph_weights():
+    x, y = points(20, 1)
+    for squared in [False, True]:
+        G = graph_utils.make_euclidean_graph(20, x, y, squared)
+        A = graph_utils.make_euclidean_array_graph(20, x, y, squared=squared)
+        assert sorted(A.edges) == sorted(G.edges)
+        assert all([abs(A[i][j]['weight'] - G[i][j]['weight']) < 1e-9 for i, j in G.edges])
+        assert all([abs(G[i][j]['weight'] - graph_utils.dist(x[i], x[j], y[i], y[j])**(1 if squared else 0.5)) < 1e-9
+                    for i, j in G.edges])
+    sparse = graph_utils.make_euclidean_array_graph(20, x, y, k=3)
+    assert set(sparse.edges) <= set(G.edges)
+    assert len(sparse.to_directed().edges) == 2 * len(sparse.edges)
@@ -0,0 +1,44 @@
+import itertools
+import random
+import networkx
+
+import graph_utils
+import tsp_cutting_plane
+import tsp_heuristics
+
+
+def triangles(between: float):
+    values = {(0, 1): 1, (1, 2): 1, (0, 2): 1, (3, 4): 1, (4, 5): 1, (3, 5): 1}
+    if between > 0:
+        values.update({(0, 3): between, (1, 4): between})
+        values.update({(0, 1): 1 - between, (3, 4): 1 - between})
+    return values
+
+
+def test_violated_subtours():
+    assert sorted(map(sorted, tsp_cutting_plane.violated_subtours(6, triangles(0)))) == [[0, 1, 2], [3, 4, 5]]
+    # connected support, the two triangles are joined by a cut of value 1
+    assert tsp_cutting_plane.violated_subtours(6, triangles(0.5)) == [{0, 1, 2}]
+    tour = {(i, (i + 1) % 6): 1 for i in range(6)}
+    assert tsp_cutting_plane.violated_subtours(6, tour) == []
+    # a fractional solution that satisfies every subtour constraint
+    half = {(min(i, j), max(i, j)): 0.5 for i in range(6) for j in [(i + 1) % 6, (i + 2) % 6]}
+    assert tsp_cutting_plane.violated_subtours(6, half) == []
+
+
+def brute_force(n, G):
+    return min([sum([G[i][j]["weight"] for i, j in tsp_heuristics.tour_edges([0] + list(p))])
+                for p in itertools.permutations(range(1, n))])
+
+
+def test_solve_with_lp_cuts():
+    rng = random.Random(0)
+    for n in [5, 8]:
+        x = [rng.random() * 10 for _ in range(n)]
+        y = [rng.random() * 10 for _ in range(n)]
+        G = graph_utils.make_euclidean_graph(n, x, y)
+        for tour in [None, tsp_heuristics.nearest_neighbor_tour(x, y)]:
+            solution = tsp_cutting_plane.solve_with_lp_cuts(G, n, tour=tour)
+            g = networkx.Graph(solution)
+            assert networkx.is_connected(g) and all([d == 2 for _, d in g.degree()])
+            assert abs(sum([G[i][j]["weight"] for i, j in solution]) - brute_force(n, G)) < 1e-6
@@ -0,0 +1,85 @@
+import random
+
+import graph_utils
+import tsp_heuristics
+
+
+def instance(n, seed):
+    rng = random.Random(seed)
+    x = [rng.random() * 10 for _ in range(n)]
+    y = [rng.random() * 10 for _ in range(n)]
+    dist = tsp_heuristics.make_distance(x, y)
+    neighbors = [sorted(row, key=lambda j, i=i: dist(i, j))
+                 for i, row in enumerate(graph_utils.nearest_neighbors(x, y, 8).tolist())]
+    return x, y, dist, neighbors
+
+
+def check_tour(tour, n):
+    assert sorted(tour.order) == list(range(n))
+    assert all([tour.order[tour.pos[v]] == v for v in range(n)])
+
+
+def test_reverse_path():
+    tour = tsp_heuristics.Tour([0, 1, 2, 3, 4, 5, 6])
+    tour.reverse_path(1, 3)
+    assert tour.order == [0, 3, 2, 1, 4, 5, 6]
+    # the longer path is reversed as its complement, the cycle is the same
+    tour.reverse_path(4, 2)
+    check_tour(tour, 7)
+    assert set(tsp_heuristics.tour_edges(tour.order)) == set(tsp_heuristics.tour_edges([1, 2, 3, 0, 6, 5, 4]))
+
+
+def test_moves_improve_the_tour():
+    for seed in range(5):
+        n = 60
+        x, y, dist, neighbors = instance(n, seed)
+        order = list(range(n))
+        random.Random(seed).shuffle(order)
+        for move in [tsp_heuristics._two_opt, tsp_heuristics._or_opt]:
+            tour = tsp_heuristics.Tour(order)
+            n_moves = 0
+            for a in range(n):
+                length = tsp_heuristics.tour_length(tour.order, dist)
+                if move(tour, a, dist, neighbors) is not None:
+                    n_moves += 1
+                    assert tsp_heuristics.tour_length(tour.order, dist) < length - 1e-10
+                check_tour(tour, n)
+            assert n_moves > 0
+
+
+def test_local_search():
+    for seed in range(3):
+        x, y, dist, neighbors = instance(200, seed)
+        start = tsp_heuristics.nearest_neighbor_tour(x, y)
+        order = tsp_heuristics.local_search(start, dist, neighbors)
+        assert sorted(order) == list(range(200))
+        assert tsp_heuristics.tour_length(order, dist) < tsp_heuristics.tour_length(start, dist)
+
+
+def test_double_bridge():
+    rng = random.Random(0)
+    for n in [8, 9, 50, 500]:
+        order = list(range(n))
+        kicked, touched = tsp_heuristics.double_bridge(order, rng)
+        assert sorted(kicked) == order
+        assert set(touched) <= set(order)
+        changed = set(tsp_heuristics.tour_edges(kicked)) - set(tsp_heuristics.tour_edges(order))
+        assert {v for e in changed for v in e} <= set(touched)
+
+
+def test_solve():
+    assert tsp_heuristics.solve([], []) == ([], 0)
+    order, length = tsp_heuristics.solve([0, 3, 0], [0, 4, 4])
+    assert order == [0, 1, 2] and abs(length - 12) < 1e-9
+    x, y, dist, _ = instance(100, 0)
+    for time_limit in [None, 0.2]:
+        order, length = tsp_heuristics.solve(x, y, time_limit=time_limit)
+        assert order[0] == 0 and sorted(order) == list(range(100))
+        assert abs(length - tsp_heuristics.tour_length(order, dist)) < 1e-9
+        assert length <= tsp_heuristics.tour_length(tsp_heuristics.nearest_neighbor_tour(x, y), dist)
+    order, length = tsp_heuristics.solve(x, y, squared=True)
+    assert abs(length - tsp_heuristics.tour_length(order, tsp_heuristics.make_distance(x, y, squared=True))) < 1e-9
+
+
+def test_tour_edges():
+    assert tsp_heuristics.tour_edges([2, 0, 3, 1]) == [(1, 2), (0, 2), (0, 3), (1, 3)]
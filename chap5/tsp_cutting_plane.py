@@ -4,15 +4,15 @@ import itertools
 import pulp
 import networkx
 from graph_utils import *
-from typing import List, Dict, Union, Tuple
+import tsp_heuristics
+from typing import List, Dict, Set, Union, Tuple
 
 sys.path.append('../')
 
-from common import logger, solve_with_log
+from common import logger, solve_with_log, backends
 
 
-def make_problem_and_solve(G: networkx.Graph, n: int):
-    log = logger.get_logger(__name__)
+def make_problem(G: networkx.Graph, n: int) -> Tuple[pulp.LpProblem, Dict]:
     problem = pulp.LpProblem(name="tsp", sense=pulp.LpMinimize)
 
     x = {(i, j): pulp.LpVariable(name='x_{}_{}'.format(i, j), cat=pulp.LpBinary)
@@ -21,19 +21,24 @@ def make_problem_and_solve(G: networkx.Graph, n: int):
     problem.objective += pulp.lpSum(
         [x[i, j] * G[i][j]['weight'] for (i, j) in G.edges])
 
+    # G may be a sparse candidate graph, so the degree rows only use the edges it has
+    incident = [[] for _ in range(n)]
+    for (i, j) in G.edges:
+        incident[i].append(x[i, j])
+        incident[j].append(x[i, j])
     for i in range(n):
-        problem.addConstraint(
-            pulp.lpSum([x[j, i] for j in range(0, i)]) +
-            pulp.lpSum([x[i, j] for j in range(i + 1, n)])
-            >= 2)
-        problem.addConstraint(
-            pulp.lpSum([x[j, i] for j in range(0, i)]) +
-            pulp.lpSum([x[i, j] for j in range(i + 1, n)])
-            <= 2)
+        problem.addConstraint(pulp.lpSum(incident[i]) >= 2)
+        problem.addConstraint(pulp.lpSum(incident[i]) <= 2)
+    return problem, x
+
+
+def make_problem_and_solve(G: networkx.Graph, n: int, backend: str = "cbc", threads: int = None):
+    log = logger.get_logger(__name__)
+    problem, x = make_problem(G, n)
 
     solved = False
     while not solved:
-        problem.solve(pulp.PULP_CBC_CMD(msg=False))
+        problem.solve(backends.make_solver(backend, threads=threads))
         g = networkx.Graph()
         for (i, j) in G.edges:
             if pulp.value(x[i, j]) == 1:
@@ -46,8 +51,7 @@ def make_problem_and_solve(G: networkx.Graph, n: int):
             solved = True
         else:
             for component in components:
-                problem.addConstraint(pulp.lpSum([x[min(i, j), max(i, j)] for i, j in itertools.combinations(component, 2)])
-                                      <= len(component) - 1)
+                add_subtour_constraint(problem, x, component)
 
     solution = []
     log.info("solved")
@@ -58,6 +62,109 @@ def make_problem_and_solve(G: networkx.Graph, n: int):
     return solution
 
 
+# pairs inside the component that are not edges of G have no variable
+def add_subtour_constraint(problem: pulp.LpProblem, x: Dict, component: Set[int]):
+    inside = [(min(i, j), max(i, j)) for i, j in itertools.combinations(component, 2)]
+    problem.addConstraint(pulp.lpSum([x[e] for e in inside if e in x]) <= len(component) - 1)
+
+
+# subtour constraints violated by a possibly fractional solution. every component of the support
+# graph is one, and on a connected support graph every edge of the Gomory-Hu tree lighter than 2
+# separates a set S with x(delta(S)) < 2. the smaller side is returned, it has fewer edges inside
+def violated_subtours(n: int, values: Dict, tolerance: float = 1e-6) -> List[Set[int]]:
+    support = networkx.Graph()
+    support.add_nodes_from(range(n))
+    for (i, j), v in values.items():
+        if v is not None and v > tolerance:
+            support.add_edge(i, j, capacity=v)
+    components = list(networkx.connected_components(support))
+    if len(components) > 1:
+        return components
+
+    cuts = []
+    seen = set()
+    tree = networkx.gomory_hu_tree(support)
+    for i, j, w in tree.edges(data="weight"):
+        if w >= 2 - tolerance:
+            continue
+        forest = tree.copy()
+        forest.remove_edge(i, j)
+        side = networkx.node_connected_component(forest, i)
+        if 2 * len(side) > n:
+            side = set(range(n)) - side
+        if frozenset(side) not in seen:
+            seen.add(frozenset(side))
+            cuts.append(side)
+    return cuts
+
+
+# separates subtours on the LP relaxation first and only solves the MIP once the LP bound stops
+# moving, integer solutions with subtours go back to the LP loop with their components cut off
+# a tour, e.g. from tsp_heuristics, is the upper bound: the loop stops as soon as the LP bound
+# reaches it and every MIP solve starts from it. on a candidate graph the optimum is the best tour
+# over its edges, and the model is infeasible if there is none
+def solve_with_lp_cuts(G: networkx.Graph, n: int, backend: str = "cbc", threads: int = None,
+                       stall_rounds: int = 3, relative_improvement: float = 1e-4,
+                       tour: List[int] = None) -> List[Edge]:
+    log = logger.get_logger(__name__)
+    problem, x = make_problem(G, n)
+    upper_bound = None
+    if tour is not None:
+        tour_edges = set(tsp_heuristics.tour_edges(tour))
+        if tour_edges <= set(x):
+            upper_bound = sum([G[i][j]['weight'] for i, j in tour_edges])
+        else:
+            # on a candidate graph the tour is no solution of the model, so it can not bound it
+            log.info("the tour uses edges that are not in the graph, it is not used")
+    added = set()
+    n_lp = 0
+    n_mip = 0
+    while True:
+        previous = None
+        stall = 0
+        while stall < stall_rounds:
+            problem.solve(backends.make_solver(backend, threads=threads, mip=False))
+            n_lp += 1
+            bound = pulp.value(problem.objective)
+            cuts = [c for c in violated_subtours(n, {e: v.varValue for e, v in x.items()})
+                    if frozenset(c) not in added]
+            log.debug(f"lp:{bound}, cuts:{len(cuts)}")
+            if upper_bound is not None and bound >= upper_bound - 1e-9 * max(1, abs(upper_bound)):
+                log.info(f"lp bound {bound} reaches the tour, solved with {n_lp} lp and {n_mip} mip solves")
+                return sorted(tour_edges)
+            if not cuts:
+                break
+            if previous is not None and bound - previous <= relative_improvement * abs(bound):
+                stall += 1
+            else:
+                stall = 0
+            previous = bound
+            for component in cuts:
+                added.add(frozenset(component))
+                add_subtour_constraint(problem, x, component)
+
+        if upper_bound is not None:
+            for e, v in x.items():
+                v.setInitialValue(1 if e in tour_edges else 0)
+        problem.solve(backends.make_solver(backend, threads=threads,
+                                           warm_start=upper_bound is not None and backend == "cbc"))
+        n_mip += 1
+        g = networkx.Graph()
+        g.add_nodes_from(range(n))
+        g.add_edges_from([e for e, v in x.items() if v.varValue is not None and v.varValue > 0.5])
+        components = list(networkx.connected_components(g))
+        log.info(f"lp bound:{bound}, mip:{pulp.value(problem.objective)}, upper bound:{upper_bound}, "
+                 f"components:{len(components)}")
+        if len(components) == 1:
+            break
+        for component in components:
+            added.add(frozenset(component))
+            add_subtour_constraint(problem, x, component)
+
+    log.info(f"solved with {n_lp} lp and {n_mip} mip solves")
+    return [e for e, v in x.items() if v.varValue > 0.5]
+
+
 def main():
     logger.set_logger()
     log = logger.get_logger(__name__)
@@ -65,7 +172,8 @@ def main():
     # x, y = make_points(n)
     n, x, y = read_hokkaido()
     graph = make_euclidean_graph(n, x, y)
-    solution = make_problem_and_solve(graph, n)
+    tour, _ = tsp_heuristics.solve(x, y, time_limit=5)
+    solution = solve_with_lp_cuts(graph, n, tour=tour)
     plot_graph(solution, x, y)
 
 
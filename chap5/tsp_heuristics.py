@@ -0,0 +1,226 @@
+import math
+import time
+import random
+import collections
+import numpy as np
+import pulp
+from typing import Callable, List, Optional, Tuple
+
+import graph_utils
+
+Edge = Tuple[int, int]
+
+
+# same weights as make_euclidean_graph with the same squared flag
+def make_distance(x: List[float], y: List[float], squared: bool = False) -> Callable[[int, int], float]:
+    x, y = list(map(float, x)), list(map(float, y))
+    if squared:
+        return lambda i, j: (x[i] - x[j])**2 + (y[i] - y[j])**2
+    return lambda i, j: math.hypot(x[i] - x[j], y[i] - y[j])
+
+
+def nearest_neighbor_tour(x: List[float], y: List[float], start: int = 0) -> List[int]:
+    p = np.stack([np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)], axis=1)
+    n = len(p)
+    visited = np.zeros(n, dtype=bool)
+    tour = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        d = ((p - p[tour[-1]])**2).sum(axis=1)
+        d[visited] = np.inf
+        v = int(np.argmin(d))
+        tour.append(v)
+        visited[v] = True
+    return tour
+
+
+def tour_length(tour: List[int], dist: Callable[[int, int], float]) -> float:
+    return sum([dist(tour[i - 1], tour[i]) for i in range(len(tour))])
+
+
+def tour_edges(tour: List[int]) -> List[Edge]:
+    return [(min(tour[i - 1], tour[i]), max(tour[i - 1], tour[i])) for i in range(len(tour))]
+
+
+class Tour:
+    # cities in visiting order and the position of every city, a path is reversed in place
+    # on whichever side of the cycle is shorter
+    def __init__(self, order: List[int]):
+        self.order = list(order)
+        self.n = len(order)
+        self.pos = [0 for _ in order]
+        for i, v in enumerate(self.order):
+            self.pos[v] = i
+
+    def succ(self, v: int) -> int:
+        return self.order[(self.pos[v] + 1) % self.n]
+
+    def pred(self, v: int) -> int:
+        return self.order[self.pos[v] - 1]
+
+    # reverses the path from b forward to c
+    def reverse_path(self, b: int, c: int):
+        order, pos, n = self.order, self.pos, self.n
+        i, j = pos[b], pos[c]
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            # the rest of the cycle reversed gives the same tour in the other direction
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+        for _ in range(length // 2):
+            u, v = order[i], order[j]
+            order[i], order[j] = v, u
+            pos[u], pos[v] = j, i
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    # removes the edges (u1, v1) and (u2, v2), which must point the same way along the tour,
+    # and adds (u1, u2) and (v1, v2)
+    def exchange(self, u1: int, v1: int, u2: int, v2: int):
+        if self.succ(u1) == v1:
+            self.reverse_path(v1, u2)
+        else:
+            self.reverse_path(u1, v2)
+
+
+def _two_opt(tour: Tour, a: int, dist: Callable, neighbors: List[List[int]]) -> Optional[List[int]]:
+    for forward in (True, False):
+        b = tour.succ(a) if forward else tour.pred(a)
+        d_ab = dist(a, b)
+        for c in neighbors[a]:
+            g1 = d_ab - dist(a, c)
+            if g1 <= 1e-10:
+                break
+            e = tour.succ(c) if forward else tour.pred(c)
+            if c == b or e == a:
+                continue
+            if g1 + dist(c, e) - dist(b, e) > 1e-10:
+                if forward:
+                    tour.exchange(a, b, c, e)
+                else:
+                    tour.exchange(b, a, e, c)
+                return [a, b, c, e]
+    return None
+
+
+# moves the segment of up to 3 cities starting at s1 next to a neighbor of its first or last city,
+# as two or three 2-opt exchanges
+def _or_opt(tour: Tour, s1: int, dist: Callable, neighbors: List[List[int]]) -> Optional[List[int]]:
+    if tour.n < 8:
+        return None
+    a = tour.pred(s1)
+    s2 = s1
+    segment = {s1}
+    for _ in range(3):
+        b = tour.succ(s2)
+        removal = dist(a, s1) + dist(s2, b) - dist(a, b)
+        for c in set(neighbors[s1]) | set(neighbors[s2]):
+            if c in segment:
+                continue
+            for u, w in ((c, tour.succ(c)), (tour.pred(c), c)):
+                if u in segment or w in segment or u == a:
+                    continue
+                forward = dist(u, s1) + dist(s2, w)
+                backward = dist(u, s2) + dist(s1, w)
+                if removal - (min(forward, backward) - dist(u, w)) > 1e-10:
+                    tour.exchange(a, s1, u, w)
+                    tour.exchange(a, u, b, s2)
+                    if forward < backward:
+                        tour.exchange(u, s2, s1, w)
+                    return [a, b, s1, s2, u, w]
+        s2 = tour.succ(s2)
+        segment.add(s2)
+        if tour.succ(s2) == a:
+            break
+    return None
+
+
+# 2-opt and Or-opt over k nearest neighbor candidates. a city leaves the queue once no move
+# improves around it (its don't-look bit is set) and comes back when one of its edges changes
+def local_search(order: List[int], dist: Callable, neighbors: List[List[int]],
+                 time_limit: Optional[float] = None, queue: Optional[List[int]] = None) -> List[int]:
+    tour = Tour(order)
+    queue = collections.deque(order if queue is None else queue)
+    active = [False for _ in order]
+    for v in queue:
+        active[v] = True
+    start = time.perf_counter()
+    while queue:
+        if time_limit is not None and time.perf_counter() - start > time_limit:
+            break
+        a = queue.popleft()
+        active[a] = False
+        changed = _two_opt(tour, a, dist, neighbors) or _or_opt(tour, a, dist, neighbors)
+        if changed:
+            for v in changed + [a]:
+                if not active[v]:
+                    active[v] = True
+                    queue.append(v)
+    return tour.order
+
+
+# double bridge on three short consecutive segments, local search only has to look at the
+# cities next to the eight changed edges
+def double_bridge(order: List[int], rng: random.Random, max_segment: int = 50) -> Tuple[List[int], List[int]]:
+    n = len(order)
+    lengths = [rng.randint(1, max(1, min(max_segment, (n - 2) // 3))) for _ in range(3)]
+    start = rng.randrange(n)
+    order = order[start:] + order[:start]
+    i = 1
+    j = i + lengths[0]
+    k = j + lengths[1]
+    m = k + lengths[2]
+    kicked = order[:i] + order[k:m] + order[j:k] + order[i:j] + order[m:]
+    touched = [order[0], order[i], order[j - 1], order[j], order[k - 1], order[k], order[m - 1], order[m % n]]
+    return kicked, touched
+
+
+# iterated local search: kicks the best tour with a double bridge, repairs it and keeps the
+# result when it is shorter, until the time runs out
+def iterated_local_search(order: List[int], dist: Callable, neighbors: List[List[int]],
+                          time_limit: float, seed: int = 0) -> List[int]:
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    best, best_length = order, tour_length(order, dist)
+    while time.perf_counter() - start < time_limit:
+        kicked, touched = double_bridge(best, rng)
+        candidate = local_search(kicked, dist, neighbors, queue=touched)
+        length = tour_length(candidate, dist)
+        if length < best_length - 1e-10:
+            best, best_length = candidate, length
+    return best
+
+
+# nearest neighbor tour improved by local search, the tour starts at city 0.
+# with a time limit the rest of the time after the first local search goes to iterated local search
+def solve(x: List[float], y: List[float], k: int = 10, squared: bool = False,
+          time_limit: Optional[float] = None) -> Tuple[List[int], float]:
+    dist = make_distance(x, y, squared)
+    n = len(x)
+    if n < 4:
+        return list(range(n)), tour_length(list(range(n)), dist)
+    # neighbor lists sorted by distance, the 2-opt scan stops at the first one too far away
+    neighbors = [sorted(row, key=lambda j, i=i: dist(i, j))
+                 for i, row in enumerate(graph_utils.nearest_neighbors(x, y, k).tolist())]
+    start = time.perf_counter()
+    order = local_search(nearest_neighbor_tour(x, y), dist, neighbors, time_limit)
+    if time_limit is not None and n >= 8:
+        order = iterated_local_search(order, dist, neighbors, time_limit - (time.perf_counter() - start))
+    zero = order.index(0)
+    order = order[zero:] + order[:zero]
+    return order, tour_length(order, dist)
+
+
+# warm start for the models in tsp_miller_tucker_zemlin, u is the position in the tour
+def set_initial_solution(problem: pulp.LpProblem, tour: List[int]):
+    n = len(tour)
+    zero = tour.index(0)
+    tour = tour[zero:] + tour[:zero]
+    arcs = set([(tour[i], tour[(i + 1) % n]) for i in range(n)])
+    position = {v: i for i, v in enumerate(tour)}
+    for name, v in problem.variablesDict().items():
+        if name.startswith("x_"):
+            i, j = name[2:].split("_")
+            v.setInitialValue(1 if (int(i), int(j)) in arcs else 0)
+        elif name.startswith("u_"):
+            v.setInitialValue(position[int(name[2:])])
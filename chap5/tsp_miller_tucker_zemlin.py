@@ -1,9 +1,9 @@
 import sys
 import os
-import itertools
 import pulp
 import networkx
 from graph_utils import *
+import tsp_heuristics
 from typing import List, Dict, Union, Tuple
 
 sys.path.append('../')
@@ -11,6 +11,16 @@ sys.path.append('../')
 from common import logger, solve_with_log
 
 
+# variables of the arcs leaving and entering every vertex, G may be a sparse candidate graph
+def arcs_by_vertex(x: Dict, n: int) -> Tuple[List[List[pulp.LpVariable]], List[List[pulp.LpVariable]]]:
+    out_arcs = [[] for _ in range(n)]
+    in_arcs = [[] for _ in range(n)]
+    for (i, j), v in x.items():
+        out_arcs[i].append(v)
+        in_arcs[j].append(v)
+    return out_arcs, in_arcs
+
+
 def make_problem_by_loose_constraint(G: networkx.DiGraph, n: int) -> pulp.LpProblem:
     log = logger.get_logger(__name__)
     problem = pulp.LpProblem(name="tsp", sense=pulp.LpMinimize)
@@ -31,17 +41,17 @@ def make_problem_by_loose_constraint(G: networkx.DiGraph, n: int) -> pulp.LpProb
         problem.addConstraint(u[i] >= 1)
         problem.addConstraint(u[i] <= n - 1)
 
-    for i, j in itertools.product(range(n), range(1, n)):
-        if i != j:
+    # without the arc the row is u[i] + 2 - n <= u[j], which the bounds on u already imply
+    for i, j in G.edges:
+        if j != 0:
             problem.addConstraint(u[i] + 1 - (n - 1) * (1 - x[i, j]) <= u[j])
 
+    out_arcs, in_arcs = arcs_by_vertex(x, n)
     for i in range(n):
-        except_i = list(range(n))
-        except_i.remove(i)
-        problem.addConstraint(sum([x[i, j] for j in except_i]) >= 1)
-        problem.addConstraint(sum([x[i, j] for j in except_i]) <= 1)
-        problem.addConstraint(sum([x[j, i] for j in except_i]) >= 1)
-        problem.addConstraint(sum([x[j, i] for j in except_i]) <= 1)
+        problem.addConstraint(sum(out_arcs[i]) >= 1)
+        problem.addConstraint(sum(out_arcs[i]) <= 1)
+        problem.addConstraint(sum(in_arcs[i]) >= 1)
+        problem.addConstraint(sum(in_arcs[i]) <= 1)
 
     return problem
 
@@ -62,28 +72,35 @@ def make_problem_by_tight_constraint(G: networkx.DiGraph, n: int) -> pulp.LpProb
     problem.addConstraint(u[0] >= 0)
     problem.addConstraint(u[0] <= 0)
 
+    # arcs missing from G are fixed to 0
+    def arc(i, j):
+        return x.get((i, j), 0)
+
     for i in range(1, n):
-        problem.addConstraint(u[i] - (n - 3) * x[i, 0] + x[0, i] >= 2)
-        problem.addConstraint(u[i] - x[i, 0] + (n - 3) * x[0, i] <= n - 2)
+        problem.addConstraint(u[i] - (n - 3) * arc(i, 0) + arc(0, i) >= 2)
+        problem.addConstraint(u[i] - arc(i, 0) + (n - 3) * arc(0, i) <= n - 2)
 
-    for i, j in itertools.product(range(n), range(1, n)):
-        if i != j:
+    # with neither arc the row is u[i] + 2 - n <= u[j], which the bounds on u already imply
+    pairs = set([(i, j) for i, j in G.edges] + [(j, i) for i, j in G.edges])
+    for i, j in sorted(pairs):
+        if j != 0:
             problem.addConstraint(
-                u[i] + 1 - (n - 1) * (1 - x[i, j]) + (n - 3) * x[j, i] <= u[j])
+                u[i] + 1 - (n - 1) * (1 - arc(i, j)) + (n - 3) * arc(j, i) <= u[j])
 
+    out_arcs, in_arcs = arcs_by_vertex(x, n)
     for i in range(n):
-        except_i = list(range(n))
-        except_i.remove(i)
-        problem.addConstraint(pulp.lpSum([x[i, j] for j in except_i]) >= 1)
-        problem.addConstraint(pulp.lpSum([x[i, j] for j in except_i]) <= 1)
-        problem.addConstraint(pulp.lpSum([x[j, i] for j in except_i]) >= 1)
-        problem.addConstraint(pulp.lpSum([x[j, i] for j in except_i]) <= 1)
+        problem.addConstraint(pulp.lpSum(out_arcs[i]) >= 1)
+        problem.addConstraint(pulp.lpSum(out_arcs[i]) <= 1)
+        problem.addConstraint(pulp.lpSum(in_arcs[i]) >= 1)
+        problem.addConstraint(pulp.lpSum(in_arcs[i]) <= 1)
 
     return problem
 
 
-def solve(problem: pulp.LpProblem, G: networkx.DiGraph) -> List[Edge]:
-    solve_with_log.exec(problem, time_limit=60)
+def solve(problem: pulp.LpProblem, G: networkx.DiGraph, tour: List[int] = None) -> List[Edge]:
+    if tour is not None:
+        tsp_heuristics.set_initial_solution(problem, tour)
+    solve_with_log.exec(problem, tour is not None, time_limit=60)
     variables_dict = problem.variablesDict()
     solution = []
     for (i, j) in G.edges:
@@ -100,9 +117,10 @@ def main():
     graph = to_directed_graph(make_euclidean_graph(n, x, y))
     problem_loose = make_problem_by_loose_constraint(graph, n)
     problem_tight = make_problem_by_tight_constraint(graph, n)
-    solution = solve(problem_loose, graph)
+    tour, _ = tsp_heuristics.solve(x, y, time_limit=5)
+    solution = solve(problem_loose, graph, tour)
     plot_graph(solution, x, y)
-    solution = solve(problem_tight, graph)
+    solution = solve(problem_tight, graph, tour)
     plot_graph(solution, x, y)
 
 
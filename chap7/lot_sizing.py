@@ -2,11 +2,12 @@ import sys
 import os
 import itertools
 import pulp
+import numpy as np
 from typing import List, Dict, Union, Tuple
 
 sys.path.append('../')
 
-from common import logger, solve_with_log
+from common import logger, solve_with_log, matrix_model
 
 
 class Instance:
@@ -85,6 +86,51 @@ def make_problem(instance: Instance, stock: pulp.LpVariable, production: pulp.Lp
     return problem
 
 
+# same model as make_problem, built from coefficient arrays
+def make_matrix_model(instance: Instance):
+    n_products = instance.n_products
+    n_terms = instance.n_terms
+    setup_time = np.asarray(instance.setup_time, dtype=np.float64)
+    demand = np.asarray(instance.demand, dtype=np.float64)
+    time_limit = np.asarray(instance.time_limit, dtype=np.float64)
+
+    model = matrix_model.MatrixModel("lot_sizing")
+    stock_ub = np.full((n_products, n_terms), np.inf)
+    stock_ub[:, 0] = 0
+    stock = model.add_variables((n_products, n_terms), ub=stock_ub, integer=True,
+                                cost=np.asarray(instance.stock_cost, dtype=np.float64))
+    production = model.add_variables((n_products, n_terms), integer=True,
+                                     cost=np.asarray(instance.production_cost, dtype=np.float64))
+    setup = model.add_variables((n_products, n_terms), ub=1, integer=True,
+                                cost=np.asarray(instance.setup_cost, dtype=np.float64))
+
+    # stock[p, t] - stock[p, t - 1] - production[p, t - 1] = -demand[p, t - 1]
+    n_flow = n_products * (n_terms - 1)
+    rows = np.arange(n_flow)
+    model.add_rows(np.concatenate([rows, rows, rows]),
+                   np.concatenate([stock[:, 1:].ravel(), stock[:, :-1].ravel(), production[:, :-1].ravel()]),
+                   np.concatenate([np.ones(n_flow), -np.ones(n_flow), -np.ones(n_flow)]),
+                   "E", -demand[:, :-1].ravel())
+
+    rows = np.arange(n_products)
+    model.add_rows(np.concatenate([rows, rows]),
+                   np.concatenate([stock[:, -1], production[:, -1]]), 1.0,
+                   "G", demand[:, -1])
+
+    rows = np.tile(np.arange(n_terms), n_products)
+    model.add_rows(np.concatenate([rows, rows]),
+                   np.concatenate([setup.ravel(), production.ravel()]),
+                   np.concatenate([setup_time.ravel(), np.ones(n_products * n_terms)]),
+                   "L", time_limit)
+
+    rows = np.arange(n_products * n_terms)
+    model.add_rows(np.concatenate([rows, rows]),
+                   np.concatenate([production.ravel(), setup.ravel()]),
+                   np.concatenate([np.ones(n_products * n_terms), -(time_limit[None, :] - setup_time).ravel()]),
+                   "L", np.zeros(n_products * n_terms))
+    return model, stock, production, setup
+
+
 def make_simple_instance():
     n_terms = 5
     setup_time = [[0 for _ in range(n_terms)]]
@@ -6,7 +6,7 @@ from typing import List, Dict, Union, Tuple
 
 sys.path.append('../')
 
-from common import logger, solve_with_log
+from common import logger, solve_with_log, batch
 
 instance_dir = 'instances'
 
@@ -99,24 +99,33 @@ def make_problem(instance: Instance, stock: pulp.LpVariable, production: pulp.Lp
     return problem
 
 
-def read_instance(filename: str):
-    path = os.path.join(instance_dir, filename)
+# the files have blank lines, trailing spaces and CRLF line ends, so they are read as a stream of numbers
+def read_instance_from_path(path: str) -> Instance:
     with open(path) as f:
-        n_terms = int(f.readline().replace("\n", ""))
-        n_products = int(f.readline().replace("\n", ""))
-        demand = []
-        for _ in range(n_products):
-            l = [int(x) for x in f.readline().replace("\n", "").split(' ')]
-            demand.append(l)
-        stock_cost = int(f.readline().replace("\n", ""))
-        setup_cost = []
-        for _ in range(n_products):
-            l = [int(x) for x in f.readline().replace("\n", "").split(' ')]
-            setup_cost.append(l)
+        tokens = iter(f.read().split())
+    n_terms = int(next(tokens))
+    n_products = int(next(tokens))
+    demand = [[int(next(tokens)) for _ in range(n_terms)] for _ in range(n_products)]
+    stock_cost = int(next(tokens))
+    setup_cost = [[int(next(tokens)) for _ in range(n_products)] for _ in range(n_products)]
 
     return Instance(n_products, n_terms, setup_cost, stock_cost, demand)
 
 
+def read_instance(filename: str) -> Instance:
+    return read_instance_from_path(os.path.join(instance_dir, filename))
+
+
+def make_problem_from_instance(instance: Instance) -> pulp.LpProblem:
+    stock, production, last_production, setup = make_variables(instance)
+    return make_problem(instance, stock, production, last_production, setup)
+
+
+def batch_main():
+    batch.run(instance_dir, read_instance_from_path, make_problem_from_instance,
+              "lot_sizing_multi_results.csv", pattern="*.psp", time_limit=300)
+
+
 def main():
     logger.set_logger()
     log = logger.get_logger(__name__)
@@ -140,4 +149,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        logger.set_logger()
+        batch_main()
+    else:
+        main()
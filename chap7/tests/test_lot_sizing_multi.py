@@ -0,0 +1,20 @@
+import lot_sizing_multi
+
+# 3 terms, 2 products, demand rows, stock cost and the setup cost matrix, with CRLF line ends and blank lines
+text = "3\r\n2\r\n\r\n0 1 0 \r\n1 0 1\r\n5\r\n\r\n0 7\r\n9 0"
+
+
+def test_read_instance_from_path(tmp_path):
+    path = tmp_path / "small.psp"
+    path.write_bytes(text.encode())
+    instance = lot_sizing_multi.read_instance_from_path(str(path))
+    assert (instance.n_terms, instance.n_products) == (3, 2)
+    assert instance.demand == [[0, 1, 0], [1, 0, 1]]
+    assert instance.stock_cost == 5
+    assert instance.setup_cost == [[0, 7], [9, 0]]
+
+
+def test_read_instance_is_relative_to_instance_dir(tmp_path, monkeypatch):
+    (tmp_path / "small.psp").write_bytes(text.encode())
+    monkeypatch.setattr(lot_sizing_multi, "instance_dir", str(tmp_path))
+    assert lot_sizing_multi.read_instance("small.psp").demand == [[0, 1, 0], [1, 0, 1]]
@@ -0,0 +1,172 @@
+import os
+import signal
+import time
+import multiprocessing
+import multiprocessing.connection
+import pulp
+from typing import Dict, List, Optional, Tuple, Union
+from . import logger
+
+# backend name -> pulp solver classes to try, the first one pulp knows and can run is used
+solver_classes = {
+    "cbc": ["PULP_CBC_CMD"],
+    "highs": ["HiGHS", "HiGHS_CMD"],
+    "glpk": ["GLPK_CMD"],
+}
+
+# backends that accept a thread count
+threaded = {"cbc", "highs"}
+
+
+def _solver_class(name: str):
+    for class_name in solver_classes[name]:
+        cls = getattr(pulp, class_name, None)
+        if cls is not None and cls(msg=False).available():
+            return cls
+    return None
+
+
+def available() -> List[str]:
+    return [name for name in solver_classes if _solver_class(name) is not None]
+
+
+# options are given the way the command line solvers take them, e.g. "preprocess off", the HiGHS
+# API class takes them as keyword arguments instead
+def _option_kwargs(options: List[str]) -> Dict[str, Union[int, float, str]]:
+    kwargs = {}
+    for option in options:
+        key, _, value = option.replace("=", " ").partition(" ")
+        value = value.strip()
+        if not value:
+            raise ValueError(f"option {option} has no value")
+        for convert in (int, float):
+            try:
+                value = convert(value)
+                break
+            except ValueError:
+                pass
+        kwargs[key] = value
+    return kwargs
+
+
+def make_solver(name: str = "cbc", time_limit: Optional[int] = None, threads: Optional[int] = None,
+                msg: bool = False, warm_start: bool = False, options: Optional[List[str]] = None,
+                mip: bool = True) -> pulp.LpSolver:
+    cls = _solver_class(name)
+    if cls is None:
+        raise ValueError(f"solver backend {name} is not available, available: {available()}")
+    # mip=False solves the LP relaxation
+    kwargs = {"msg": msg, "timeLimit": time_limit, "mip": mip}
+    if options and cls.__name__ == "HiGHS":
+        kwargs.update(_option_kwargs(options))
+    elif options:
+        kwargs["options"] = options
+    if name in threaded and threads is not None:
+        kwargs["threads"] = threads
+    if name == "cbc":
+        kwargs["warmStart"] = warm_start
+    return cls(**kwargs)
+
+
+def _portfolio_worker(problem: pulp.LpProblem, config: Dict, conn):
+    # own process group so that the solver subprocess is killed together with this worker
+    os.setpgrp()
+    start = time.perf_counter()
+    try:
+        status = problem.solve(make_solver(**config))
+    except Exception as e:
+        logger.get_logger(__name__).error(f"{config}: {e}")
+        conn.send((pulp.LpStatusNotSolved, pulp.LpSolutionNoSolutionFound, time.perf_counter() - start, None, {}))
+        return
+    elapsed = time.perf_counter() - start
+    values = {v.name: v.varValue for v in problem.variables()}
+    # pulp gives an objective value even when the solver stopped without a solution
+    has_solution = problem.sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible)
+    objective = pulp.value(problem.objective) if has_solution else None
+    conn.send((status, problem.sol_status, elapsed, objective, values))
+
+
+# kills a worker that called os.setpgrp together with the solver subprocess it started
+def terminate(p: multiprocessing.Process):
+    if p.is_alive():
+        try:
+            os.killpg(p.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            p.kill()
+    p.join()
+
+
+def _is_proven_optimal(config: Dict, status: int, sol_status: int, elapsed: float) -> bool:
+    time_limit = config.get("time_limit")
+    return status == pulp.LpStatusOptimal and sol_status == pulp.LpSolutionOptimal \
+        and (time_limit is None or elapsed < time_limit)
+
+
+def _is_better(problem: pulp.LpProblem, objective: float, best: Optional[float]) -> bool:
+    if best is None:
+        return True
+    if problem.sense == pulp.LpMinimize:
+        return objective < best
+    return objective > best
+
+
+# runs every config (keyword arguments of make_solver) on the same model at once, the first
+# proven optimal result wins and the other runs are killed, otherwise the best solution is kept.
+# every run has its own pipe, so a run that dies without a result is noticed instead of waited for
+def solve_portfolio(problem: pulp.LpProblem, configs: List[Dict]) -> Tuple[int, Optional[Dict]]:
+    log = logger.get_logger(__name__)
+    context = multiprocessing.get_context("fork")
+    # receiving end of the pipe -> (process, config)
+    running = {}
+    for config in configs:
+        receiver, sender = context.Pipe(duplex=False)
+        p = context.Process(target=_portfolio_worker, args=(problem, config, sender), daemon=True)
+        p.start()
+        sender.close()
+        running[receiver] = (p, config)
+
+    best = None
+    winner = None
+    try:
+        while running and winner is None:
+            for receiver in multiprocessing.connection.wait(list(running)):
+                p, config = running.pop(receiver)
+                try:
+                    status, sol_status, elapsed, objective, values = receiver.recv()
+                except EOFError:
+                    log.error(f"{config}: exited with code {p.exitcode} without a result")
+                    continue
+                finally:
+                    receiver.close()
+                    p.join()
+                log.info(f"{config}: {pulp.LpStatus[status]}, objective:{objective}, time:{elapsed:.3f}")
+                if objective is not None and _is_better(problem, objective, None if best is None else best[3]):
+                    best = (status, sol_status, values, objective, config)
+                if _is_proven_optimal(config, status, sol_status, elapsed):
+                    winner = (status, sol_status, values, objective, config)
+                    break
+    finally:
+        for receiver, (p, _) in running.items():
+            terminate(p)
+            receiver.close()
+
+    result = winner or best
+    if result is None:
+        problem.status = pulp.LpStatusNotSolved
+        problem.sol_status = pulp.LpSolutionNoSolutionFound
+        return pulp.LpStatusNotSolved, None
+    status, sol_status, values, _, config = result
+    for v in problem.variables():
+        v.varValue = values.get(v.name)
+    problem.status = status
+    problem.sol_status = sol_status
+    return status, config
+
+
+def default_portfolio(time_limit: Optional[int] = None) -> List[Dict]:
+    configs = [{"name": "cbc", "time_limit": time_limit, "threads": 1},
+               {"name": "cbc", "time_limit": time_limit, "threads": 1, "options": ["preprocess off"]}]
+    for name in available():
+        if name != "cbc":
+            configs.append({"name": name, "time_limit": time_limit, "threads": 1})
+    return configs
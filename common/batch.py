@@ -0,0 +1,80 @@
+import os
+import csv
+import glob
+import time
+import pulp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Optional
+from . import logger, solve_with_log
+
+# CBC reports Optimal when it stops at the time limit with an incumbent, proven tells the two apart
+fields = ["instance", "status", "proven", "objective", "lp_bound", "gap",
+          "load_time", "build_time", "solve_time"]
+
+
+def run_one(path: str, load: Callable, build: Callable, time_limit: int, threads: int, with_gap: bool) -> Dict:
+    start = time.perf_counter()
+    instance = load(path)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    problem = build(instance)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    status = problem.solve(pulp.PULP_CBC_CMD(
+        msg=False, timeLimit=time_limit, threads=threads))
+    solve_time = time.perf_counter() - start
+    objective = solve_with_log.objective_value(problem)
+
+    # CBC finishing before the time limit means the incumbent is proven optimal;
+    # otherwise the gap is measured against the LP relaxation and overestimates the true gap
+    proven = status == pulp.LpStatusOptimal and problem.sol_status == pulp.LpSolutionOptimal \
+        and solve_time < time_limit
+    lp_bound = None
+    gap = None
+    if proven:
+        gap = 0.0
+    elif with_gap and objective is not None:
+        problem.solve(pulp.PULP_CBC_CMD(
+            msg=False, mip=False, timeLimit=time_limit, threads=threads))
+        lp_bound = pulp.value(problem.objective)
+        if lp_bound is not None:
+            gap = abs(objective - lp_bound) / max(abs(objective), 1e-9)
+
+    return {
+        "instance": os.path.basename(path),
+        "status": pulp.LpStatus[status],
+        "proven": proven,
+        "objective": objective,
+        "lp_bound": lp_bound,
+        "gap": gap,
+        "load_time": load_time,
+        "build_time": build_time,
+        "solve_time": solve_time,
+    }
+
+
+# load and build must be module level functions so that they can be sent to worker processes
+def run(instance_dir: str, load: Callable, build: Callable, output_path: str, pattern: str = "*",
+        time_limit: int = 300, threads: int = 1, max_workers: Optional[int] = None, with_gap: bool = True):
+    log = logger.get_logger(__name__)
+    paths = sorted(glob.glob(os.path.join(instance_dir, pattern)))
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 1) // threads)
+    log.info(f"{len(paths)} instances, {max_workers} workers")
+    with open(output_path, "w", newline="") as f, ProcessPoolExecutor(max_workers=max_workers) as executor:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        futures = {executor.submit(run_one, path, load, build, time_limit, threads, with_gap): path
+                   for path in paths}
+        for future in as_completed(futures):
+            try:
+                row = future.result()
+            except Exception as e:
+                log.error(f"{futures[future]}: {e}")
+                row = {"instance": os.path.basename(
+                    futures[future]), "status": "Error"}
+            log.info(row)
+            writer.writerow(row)
+            f.flush()
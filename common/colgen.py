@@ -0,0 +1,51 @@
+import math
+import pulp
+from typing import Callable, Hashable, List, Set, Tuple
+from . import logger
+
+# column generation for set covering masters that minimize the number of columns, shared by
+# bin packing (chap3) and graph coloring (chap4)
+
+
+class Result:
+    # value of the best integer solution, lp_bound is the LP optimum, or a bound on it if column
+    # generation stopped early, solution is the integer solution in the form of the problem
+    def __init__(self, value: int, lp_bound: float, solution: List[int]):
+        self.value = value
+        self.lp_bound = lp_bound
+        self.lower_bound = math.ceil(lp_bound - 1e-6)
+        self.solution = solution
+
+    @property
+    def is_optimal(self) -> bool:
+        return self.value == self.lower_bound
+
+
+# make_master builds the LP master over the columns, price gets the duals of the rows and the
+# known columns and returns the best pricing value, whether that value is proven to be the best
+# and the new columns to add. lp / proven pricing value is a valid bound at every iteration
+# (Farley), so the loop stops early once that bound already matches an incumbent with target columns.
+# returns a lower bound on the LP optimum, the columns and the last master LP solution
+def solve(make_master: Callable[[List[Hashable]], Tuple[pulp.LpProblem, List[pulp.LpVariable]]],
+          row_names: List[str], price: Callable[[List[float], Set[Hashable]], Tuple[float, bool, List[Hashable]]],
+          columns: List[Hashable], target: int = 0) -> Tuple[float, List[Hashable], List[float]]:
+    log = logger.get_logger(__name__)
+    columns = list(columns)
+    known = set(columns)
+    lower_bound = 0.0
+    while True:
+        problem, x = make_master(columns)
+        problem.solve(pulp.PULP_CBC_CMD(msg=False))
+        duals = [problem.constraints[name].pi or 0 for name in row_names]
+        lp_value = pulp.value(problem.objective)
+        value, proven, found = price(duals, known)
+        if proven:
+            lower_bound = max(lower_bound, lp_value / max(value, 1))
+        log.debug(f"columns:{len(columns)}, lp:{lp_value}, pricing:{value}, proven:{proven}, bound:{lower_bound}")
+        if not found:
+            # no improving column, the master LP is optimal unless the pricing was not proven
+            return (lp_value if proven else lower_bound), columns, [v.varValue for v in x]
+        if math.ceil(lower_bound - 1e-6) >= target:
+            return lower_bound, columns, [v.varValue for v in x]
+        known.update(found)
+        columns.extend(found)
@@ -0,0 +1,17 @@
+import os
+from typing import List
+
+# numpy files kept next to an instance file so that it is parsed only once. reading a cache is
+# always fine, writing one is left to the caller since it puts files into the instance directory
+
+
+def cache_paths(path: str, *suffixes: str) -> List[str]:
+    return [f"{path}.{suffix}" for suffix in suffixes]
+
+
+# all cache files exist and are newer than the instance file
+def is_fresh(path: str, paths: List[str]) -> bool:
+    if not all([os.path.exists(p) for p in paths]):
+        return False
+    mtime = os.path.getmtime(path)
+    return all([os.path.getmtime(p) >= mtime for p in paths])
@@ -0,0 +1,176 @@
+import os
+import subprocess
+import tempfile
+import numpy as np
+import pulp
+from typing import Optional, Tuple
+from . import logger
+
+
+# builds a model from coefficient arrays in COO form without creating pulp expressions
+class MatrixModel:
+    def __init__(self, name: str, sense: int = pulp.LpMinimize):
+        self.name = name
+        self.sense = sense
+        self.n_vars = 0
+        self.n_rows = 0
+        self._cost = []
+        self._lb = []
+        self._ub = []
+        self._integer = []
+        self._rows = []
+        self._cols = []
+        self._vals = []
+        self._row_sense = []
+        self._rhs = []
+        self.objective_constant = 0.0
+
+    # returns an index array with the given shape, used both to build rows and to read results
+    def add_variables(self, shape, lb=0.0, ub=np.inf, integer=False, cost=0.0) -> np.ndarray:
+        size = int(np.prod(shape))
+        index = np.arange(self.n_vars, self.n_vars + size).reshape(shape)
+        self.n_vars += size
+        self._cost.append(np.broadcast_to(np.asarray(cost, dtype=np.float64), shape).ravel())
+        self._lb.append(np.broadcast_to(np.asarray(lb, dtype=np.float64), shape).ravel())
+        self._ub.append(np.broadcast_to(np.asarray(ub, dtype=np.float64), shape).ravel())
+        self._integer.append(np.broadcast_to(np.asarray(integer, dtype=bool), shape).ravel())
+        return index
+
+    # rows are local indices starting from 0, sense is one of "L", "G", "E"
+    def add_rows(self, rows, cols, vals, sense: str, rhs) -> np.ndarray:
+        rows = np.asarray(rows, dtype=np.int64).ravel()
+        rhs = np.asarray(rhs, dtype=np.float64).ravel()
+        n_new = len(rhs)
+        self._rows.append(rows + self.n_rows)
+        self._cols.append(np.asarray(cols, dtype=np.int64).ravel())
+        self._vals.append(np.broadcast_to(np.asarray(vals, dtype=np.float64), rows.shape).ravel())
+        self._row_sense.append(np.full(n_new, sense))
+        self._rhs.append(rhs)
+        index = np.arange(self.n_rows, self.n_rows + n_new)
+        self.n_rows += n_new
+        return index
+
+    def arrays(self):
+        def cat(blocks, dtype):
+            return np.concatenate(blocks) if blocks else np.zeros(0, dtype=dtype)
+        return (cat(self._cost, np.float64), cat(self._lb, np.float64), cat(self._ub, np.float64),
+                cat(self._integer, bool), cat(self._rows, np.int64), cat(self._cols, np.int64),
+                cat(self._vals, np.float64), cat(self._row_sense, str), cat(self._rhs, np.float64))
+
+    def write_mps(self, path: str):
+        cost, lb, ub, integer, rows, cols, vals, row_sense, rhs = self.arrays()
+        order = np.lexsort((rows, cols))
+        rows, cols, vals = rows[order], cols[order], vals[order]
+        starts = np.searchsorted(cols, np.arange(self.n_vars + 1))
+        lines = [f"NAME          {self.name}", "ROWS", " N  OBJ"]
+        lines.extend([f" {s}  R{r}" for r, s in enumerate(row_sense)])
+        lines.append("COLUMNS")
+        in_integer = False
+        for j in range(self.n_vars):
+            if integer[j] != in_integer:
+                marker = "INTORG" if integer[j] else "INTEND"
+                lines.append(f"    MARK      'MARKER'                 '{marker}'")
+                in_integer = integer[j]
+            if cost[j] != 0:
+                lines.append(f"    {f'C{j}':<8}  OBJ       {cost[j]:.17g}")
+            for k in range(starts[j], starts[j + 1]):
+                lines.append(f"    {f'C{j}':<8}  {f'R{rows[k]}':<8}  {vals[k]:.17g}")
+            if cost[j] == 0 and starts[j] == starts[j + 1]:
+                lines.append(f"    {f'C{j}':<8}  OBJ       0")
+        if in_integer:
+            lines.append("    MARK      'MARKER'                 'INTEND'")
+        lines.append("RHS")
+        lines.extend([f"    RHS       {f'R{r}':<8}  {v:.17g}" for r, v in enumerate(rhs) if v != 0])
+        lines.append("BOUNDS")
+        for j in range(self.n_vars):
+            if lb[j] == ub[j]:
+                lines.append(f" FX BND       {f'C{j}':<8}  {lb[j]:.17g}")
+                continue
+            if lb[j] == -np.inf:
+                lines.append(f" MI BND       {f'C{j}':<8}")
+            elif lb[j] != 0 or integer[j]:
+                lines.append(f" LO BND       {f'C{j}':<8}  {lb[j]:.17g}")
+            if ub[j] != np.inf:
+                lines.append(f" UP BND       {f'C{j}':<8}  {ub[j]:.17g}")
+            elif integer[j]:
+                lines.append(f" PL BND       {f'C{j}':<8}")
+        lines.append("ENDATA")
+        with open(path, "w") as f:
+            f.write("\n".join(lines))
+            f.write("\n")
+
+
+cbc_status = {
+    "Optimal": pulp.LpStatusOptimal,
+    "Infeasible": pulp.LpStatusInfeasible,
+    "Integer": pulp.LpStatusInfeasible,
+    "Unbounded": pulp.LpStatusUnbounded,
+    "Stopped": pulp.LpStatusNotSolved,
+}
+
+cbc_sol_status = {
+    "Optimal": pulp.LpSolutionOptimal,
+    "Infeasible": pulp.LpSolutionInfeasible,
+    "Integer": pulp.LpSolutionInfeasible,
+    "Unbounded": pulp.LpSolutionUnbounded,
+    "Stopped": pulp.LpSolutionNoSolutionFound,
+}
+
+
+# the first line is like "Stopped on time - objective value 12.0" when cbc stopped with an incumbent,
+# which is reported as pulp does, Optimal with an integer feasible solution
+def read_status(line: str) -> Tuple[int, int]:
+    words = line.split()
+    if not words:
+        return pulp.LpStatusUndefined, pulp.LpSolutionNoSolutionFound
+    status = cbc_status.get(words[0], pulp.LpStatusUndefined)
+    sol_status = cbc_sol_status.get(words[0], pulp.LpSolutionNoSolutionFound)
+    if status == pulp.LpStatusNotSolved and len(words) >= 5 and words[4] == "objective":
+        return pulp.LpStatusOptimal, pulp.LpSolutionIntegerFeasible
+    return status, sol_status
+
+
+def read_solution(path: str, n_vars: int) -> Tuple[int, int, np.ndarray]:
+    x = np.zeros(n_vars)
+    with open(path) as f:
+        status, sol_status = read_status(f.readline())
+        for line in f:
+            values = line.split()
+            if not values:
+                continue
+            if values[0] == "**":
+                values = values[1:]
+            if values[1].startswith("C"):
+                x[int(values[1][1:])] = float(values[2])
+    return status, sol_status, x
+
+
+# returns the pulp status and solution status, the objective value and the value of every variable
+# index. the objective is None when cbc stopped without a solution
+def solve(model: MatrixModel, time_limit: Optional[int] = None, threads: Optional[int] = None,
+          msg: bool = False) -> Tuple[int, int, Optional[float], np.ndarray]:
+    log = logger.get_logger(__name__)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        mps_path = os.path.join(tmp_dir, "model.mps")
+        sol_path = os.path.join(tmp_dir, "model.sol")
+        model.write_mps(mps_path)
+        command = [pulp.PULP_CBC_CMD().path, mps_path,
+                   "max" if model.sense == pulp.LpMaximize else "min"]
+        if time_limit is not None:
+            command += ["sec", str(time_limit), "timeMode", "elapsed"]
+        if threads is not None:
+            command += ["threads", str(threads)]
+        command += ["branch", "printingOptions", "all", "solution", sol_path]
+        subprocess.run(command, stdout=None if msg else subprocess.DEVNULL,
+                       stderr=None if msg else subprocess.DEVNULL, check=False)
+        if not os.path.exists(sol_path):
+            log.error("cbc did not write a solution file")
+            return pulp.LpStatusNotSolved, pulp.LpSolutionNoSolutionFound, None, np.zeros(model.n_vars)
+        status, sol_status, x = read_solution(sol_path, model.n_vars)
+    objective = None
+    if sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+        cost = model.arrays()[0]
+        objective = float(cost @ x) + model.objective_constant
+    log.info(f"status = {pulp.LpStatus[status]}, solution = {pulp.LpSolution[sol_status]}, "
+             f"objective value = {objective}")
+    return status, sol_status, objective, x
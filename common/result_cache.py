@@ -0,0 +1,114 @@
+import os
+import json
+import time
+import hashlib
+import pulp
+from typing import Dict, Optional
+from . import logger
+
+default_cache_dir = os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), "..", ".result_cache")
+
+
+def _expression_terms(expression) -> str:
+    return ",".join(sorted([f"{v.name}:{repr(c)}" for v, c in expression.items()]))
+
+
+def model_hash(problem: pulp.LpProblem, solver_options: Dict) -> str:
+    h = hashlib.sha256()
+    h.update(f"sense:{problem.sense}\n".encode())
+    for v in sorted(problem.variables(), key=lambda v: v.name):
+        h.update(f"var:{v.name}:{v.lowBound}:{v.upBound}:{v.cat}\n".encode())
+    h.update(
+        f"obj:{_expression_terms(problem.objective)}:{repr(problem.objective.constant)}\n".encode())
+    for name in sorted(problem.constraints.keys()):
+        c = problem.constraints[name]
+        h.update(
+            f"con:{name}:{c.sense}:{_expression_terms(c)}:{repr(c.constant)}\n".encode())
+    h.update(json.dumps(solver_options, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def solver_options(solver: pulp.LpSolver) -> Dict:
+    return {
+        "solver": solver.__class__.__name__,
+        "mip": getattr(solver, "mip", True),
+        "time_limit": getattr(solver, "timeLimit", None),
+        "options": list(getattr(solver, "options", [])),
+        "warm_start": getattr(solver, "optionsDict", {}).get("warmStart", False),
+    }
+
+
+class ResultCache:
+    def __init__(self, cache_dir: str = default_cache_dir, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self, problem: pulp.LpProblem, key: str) -> Optional[int]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            entry = json.load(f)
+        # entries written before sol_status was kept cannot tell a solution from a stopped solve
+        if "sol_status" not in entry:
+            return None
+        # touch for LRU ordering
+        os.utime(path)
+        values = entry["values"]
+        for v in problem.variables():
+            v.varValue = values.get(v.name)
+        problem.status = entry["status"]
+        problem.sol_status = entry["sol_status"]
+        return entry["status"]
+
+    def store(self, problem: pulp.LpProblem, key: str, status: int):
+        entry = {
+            "status": status,
+            "sol_status": problem.sol_status,
+            "objective": pulp.value(problem.objective),
+            "values": {v.name: v.varValue for v in problem.variables()},
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            st = os.stat(os.path.join(self.cache_dir, name))
+            entries.append((st.st_mtime, st.st_size, name))
+        total = sum([size for _, size, _ in entries])
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+
+def solve(problem: pulp.LpProblem, solver: pulp.LpSolver, cache: ResultCache) -> int:
+    log = logger.get_logger(__name__)
+    key = model_hash(problem, solver_options(solver))
+    status = cache.load(problem, key)
+    if status is not None:
+        log.info(f"cache hit: {key}")
+        return status
+    start = time.perf_counter()
+    status = problem.solve(solver)
+    elapsed = time.perf_counter() - start
+    # only results with a solution that the solver finished within its time limit are kept,
+    # a stopped solve could do better on a faster machine or a less loaded one
+    time_limit = getattr(solver, "timeLimit", None)
+    has_solution = problem.sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible)
+    if has_solution and (time_limit is None or elapsed < time_limit):
+        cache.store(problem, key, status)
+    return status
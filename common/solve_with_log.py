@@ -1,14 +1,73 @@
+import json
+import time
 import pulp
-from . import logger
+from typing import Any, Callable, Dict, Optional, Tuple
+from . import logger, result_cache, backends
 
 
-def exec(problem: pulp.LpProblem, is_given_initial_solution=False, time_limit=200):
+# formatted only when the log record is actually emitted
+class ModelDump:
+    def __init__(self, problem: pulp.LpProblem):
+        self.problem = problem
+
+    def __str__(self):
+        constraints = "\n".join(
+            [f"{k}:{v}" for k, v in self.problem.constraints.items()])
+        return f"==========objective=========\n{self.problem.objective}\n" \
+            f"=========constraints========\n{constraints}"
+
+
+def timed(func: Callable, *args, **kwargs) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def write_model(problem: pulp.LpProblem, path: str) -> float:
+    start = time.perf_counter()
+    if path.endswith(".mps"):
+        problem.writeMPS(path)
+    else:
+        problem.writeLP(path)
+    return time.perf_counter() - start
+
+
+# pulp gives an objective value even when the solver stopped without a solution
+def objective_value(problem: pulp.LpProblem) -> Optional[float]:
+    if problem.sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+        return pulp.value(problem.objective)
+    return None
+
+
+def make_record(problem: pulp.LpProblem, status: int, build_time: Optional[float],
+                write_time: Optional[float], solve_time: float) -> Dict:
+    return {
+        "name": problem.name,
+        "n_variables": len(problem.variables()),
+        "n_constraints": len(problem.constraints),
+        "build_time": build_time,
+        "write_time": write_time,
+        "solve_time": solve_time,
+        "status": pulp.LpStatus[status],
+        "objective": objective_value(problem),
+    }
+
+
+def exec(problem: pulp.LpProblem, is_given_initial_solution=False, time_limit=200,
+         build_time: Optional[float] = None, write_path: Optional[str] = None, dump_model=False,
+         cache: Optional[result_cache.ResultCache] = None, backend: str = "cbc", threads: Optional[int] = None) -> Dict:
     log = logger.get_logger(__name__)
-    log.info(f"==========objective=========\n{problem.objective}")
-    constraints = "\n".join(
-        [f"{k}:{v}" for k, v in problem.constraints.items()])
-    log.info(f"=========constraints========\n{constraints}")
-    status = problem.solve(pulp.PULP_CBC_CMD(
-        msg=True, warmStart=is_given_initial_solution, timeLimit=time_limit))
-    log.info(f"status = {pulp.LpStatus[status]}")
-    log.info("objective value = {}".format(pulp.value(problem.objective)))
+    if dump_model:
+        log.debug("%s", ModelDump(problem))
+    write_time = write_model(problem, write_path) if write_path else None
+    start = time.perf_counter()
+    solver = backends.make_solver(backend, time_limit=time_limit, threads=threads,
+                                  msg=True, warm_start=is_given_initial_solution)
+    if cache is None:
+        status = problem.solve(solver)
+    else:
+        status = result_cache.solve(problem, solver, cache)
+    solve_time = time.perf_counter() - start
+    record = make_record(problem, status, build_time, write_time, solve_time)
+    log.info("%s", json.dumps(record))
+    return record
@@ -0,0 +1,52 @@
+import os
+import pulp
+import pytest
+
+from common import backends
+
+
+def make_knapsack() -> pulp.LpProblem:
+    problem = pulp.LpProblem(name="knapsack", sense=pulp.LpMaximize)
+    x = [pulp.LpVariable(f"x_{i}", cat=pulp.LpBinary) for i in range(4)]
+    problem += pulp.lpSum([v * x[i] for i, v in enumerate([10, 13, 7, 8])])
+    problem += pulp.lpSum([w * x[i] for i, w in enumerate([5, 7, 4, 3])]) <= 10
+    return problem
+
+
+def test_make_solver():
+    solver = backends.make_solver("cbc", time_limit=5, threads=2, warm_start=True, options=["cuts off"])
+    assert isinstance(solver, pulp.PULP_CBC_CMD)
+    assert solver.timeLimit == 5
+    assert "cuts off" in solver.options
+    assert "cbc" in backends.available()
+    for name in backends.solver_classes:
+        if name not in backends.available():
+            with pytest.raises(ValueError):
+                backends.make_solver(name)
+
+
+def test_option_kwargs():
+    assert backends._option_kwargs(["presolve off", "mip_rel_gap=0.01", "threads 2"]) == \
+        {"presolve": "off", "mip_rel_gap": 0.01, "threads": 2}
+    with pytest.raises(ValueError):
+        backends._option_kwargs(["presolve"])
+
+
+def test_portfolio():
+    problem = make_knapsack()
+    configs = [{"name": "cbc", "time_limit": 10, "threads": 1}, {"name": "cbc", "options": ["cuts off"]}]
+    status, config = backends.solve_portfolio(problem, configs)
+    assert status == pulp.LpStatusOptimal
+    assert config in configs
+    assert problem.sol_status == pulp.LpSolutionOptimal
+    assert pulp.value(problem.objective) == 21
+
+
+def test_portfolio_survives_a_crashed_run(monkeypatch):
+    def crash(problem, config, conn):
+        os._exit(1)
+
+    monkeypatch.setattr(backends, "_portfolio_worker", crash)
+    problem = make_knapsack()
+    assert backends.solve_portfolio(problem, [{"name": "cbc"}]) == (pulp.LpStatusNotSolved, None)
+    assert problem.sol_status == pulp.LpSolutionNoSolutionFound
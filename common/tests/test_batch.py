@@ -0,0 +1,45 @@
+import csv
+import pulp
+
+from common import batch
+
+
+# an instance file holds the item values of a knapsack with weights 1 and capacity 2
+def load(path: str):
+    with open(path) as f:
+        return [int(t) for t in f.read().split()]
+
+
+def build(values) -> pulp.LpProblem:
+    problem = pulp.LpProblem(name="knapsack", sense=pulp.LpMaximize)
+    x = [pulp.LpVariable(f"x_{i}", cat=pulp.LpBinary) for i in range(len(values))]
+    problem += pulp.lpSum([v * x[i] for i, v in enumerate(values)])
+    problem += pulp.lpSum(x) <= 2
+    return problem
+
+
+def write_instances(directory):
+    (directory / "a.txt").write_text("3 5 4\n")
+    (directory / "b.txt").write_text("1 1 9 2\n")
+
+
+def test_run_one(tmp_path):
+    write_instances(tmp_path)
+    row = batch.run_one(str(tmp_path / "a.txt"), load, build, 10, 1, True)
+    assert row["instance"] == "a.txt"
+    assert row["status"] == "Optimal"
+    assert row["proven"]
+    assert row["objective"] == 9
+    assert row["gap"] == 0.0
+    assert set(row) == set(batch.fields)
+
+
+def test_run_writes_a_row_per_instance(tmp_path):
+    write_instances(tmp_path)
+    output_path = str(tmp_path / "results.csv")
+    batch.run(str(tmp_path), load, build, output_path, pattern="*.txt", time_limit=10, max_workers=1)
+    with open(output_path) as f:
+        rows = {row["instance"]: row for row in csv.DictReader(f)}
+    assert sorted(rows) == ["a.txt", "b.txt"]
+    assert float(rows["b.txt"]["objective"]) == 11
+    assert rows["b.txt"]["proven"] == "True"
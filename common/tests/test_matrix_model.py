@@ -0,0 +1,59 @@
+import numpy as np
+import pulp
+
+from common import matrix_model
+
+
+# max 10 x0 + 13 x1 + 7 x2 + 8 x3 + 2 z, 5 x0 + 7 x1 + 4 x2 + 3 x3 <= 10, z = x0 + 1, z <= 3
+def make_model() -> matrix_model.MatrixModel:
+    model = matrix_model.MatrixModel("knapsack", sense=pulp.LpMaximize)
+    x = model.add_variables(4, ub=1, integer=True, cost=[10, 13, 7, 8])
+    z = model.add_variables(1, lb=-np.inf, ub=3, cost=2)
+    model.add_rows([0, 0, 0, 0], x, [5, 7, 4, 3], "L", [10])
+    model.add_rows([0, 0], [z[0], x[0]], [1, -1], "E", [1])
+    model.objective_constant = 0.5
+    return model
+
+
+def test_arrays():
+    model = make_model()
+    cost, lb, ub, integer, rows, cols, vals, row_sense, rhs = model.arrays()
+    assert model.n_vars == 5 and model.n_rows == 2
+    assert np.array_equal(cost, [10, 13, 7, 8, 2])
+    assert np.array_equal(integer, [True, True, True, True, False])
+    assert lb[4] == -np.inf
+    assert np.array_equal(rows, [0, 0, 0, 0, 1, 1])
+    assert list(row_sense) == ["L", "E"]
+
+
+def test_solve():
+    status, sol_status, objective, x = matrix_model.solve(make_model(), time_limit=10)
+    assert status == pulp.LpStatusOptimal
+    assert sol_status == pulp.LpSolutionOptimal
+    # x1 + x3 with z = 1 beats x0 + x3 with z = 2
+    assert objective == 23.5
+    assert np.allclose(x, [0, 1, 0, 1, 1])
+
+
+def test_read_status():
+    assert matrix_model.read_status("Optimal - objective value 3") == \
+        (pulp.LpStatusOptimal, pulp.LpSolutionOptimal)
+    assert matrix_model.read_status("Stopped on time - objective value 12.0") == \
+        (pulp.LpStatusOptimal, pulp.LpSolutionIntegerFeasible)
+    assert matrix_model.read_status("Stopped on time (no integer solution - continuous used)") == \
+        (pulp.LpStatusNotSolved, pulp.LpSolutionNoSolutionFound)
+    assert matrix_model.read_status("Infeasible - objective value 0")[0] == pulp.LpStatusInfeasible
+    assert matrix_model.read_status("")[0] == pulp.LpStatusUndefined
+
+
+def test_read_solution(tmp_path):
+    path = str(tmp_path / "model.sol")
+    with open(path, "w") as f:
+        f.write("Infeasible - objective value 4\n"
+                "      0 C0   1   0\n"
+                "** 1 C2   2.5   0\n"
+                "      0 R0   3   0\n")
+    status, sol_status, x = matrix_model.read_solution(path, 3)
+    assert status == pulp.LpStatusInfeasible
+    assert sol_status == pulp.LpSolutionInfeasible
+    assert np.array_equal(x, [1, 0, 2.5])
@@ -0,0 +1,53 @@
+import os
+import pulp
+
+from common import result_cache
+
+
+def make_knapsack(capacity: int = 10) -> pulp.LpProblem:
+    problem = pulp.LpProblem(name="knapsack", sense=pulp.LpMaximize)
+    x = [pulp.LpVariable(f"x_{i}", cat=pulp.LpBinary) for i in range(4)]
+    problem += pulp.lpSum([v * x[i] for i, v in enumerate([10, 13, 7, 8])])
+    problem += pulp.lpSum([w * x[i] for i, w in enumerate([5, 7, 4, 3])]) <= capacity
+    return problem
+
+
+def solver(time_limit: int = 10) -> pulp.LpSolver:
+    return pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit)
+
+
+def test_hash_depends_on_model_and_options():
+    options = result_cache.solver_options(solver())
+    key = result_cache.model_hash(make_knapsack(), options)
+    assert key == result_cache.model_hash(make_knapsack(), options)
+    assert key != result_cache.model_hash(make_knapsack(11), options)
+    assert key != result_cache.model_hash(make_knapsack(), result_cache.solver_options(solver(20)))
+
+
+def test_hit_restores_solution(tmp_path):
+    cache = result_cache.ResultCache(str(tmp_path))
+    first = make_knapsack()
+    assert result_cache.solve(first, solver(), cache) == pulp.LpStatusOptimal
+    assert len(os.listdir(str(tmp_path))) == 1
+
+    second = make_knapsack()
+    assert result_cache.solve(second, solver(), cache) == pulp.LpStatusOptimal
+    assert second.sol_status == pulp.LpSolutionOptimal
+    assert pulp.value(second.objective) == pulp.value(first.objective)
+    assert {v.name: v.varValue for v in second.variables()} == {v.name: v.varValue for v in first.variables()}
+
+
+def test_result_without_solution_is_not_stored(tmp_path):
+    cache = result_cache.ResultCache(str(tmp_path))
+    problem = pulp.LpProblem(name="infeasible", sense=pulp.LpMinimize)
+    x = pulp.LpVariable("x", lowBound=0, upBound=1, cat=pulp.LpInteger)
+    problem += x
+    problem += x >= 2
+    assert result_cache.solve(problem, solver(), cache) == pulp.LpStatusInfeasible
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_evict_keeps_size_below_limit(tmp_path):
+    cache = result_cache.ResultCache(str(tmp_path), max_bytes=1)
+    result_cache.solve(make_knapsack(), solver(), cache)
+    assert os.listdir(str(tmp_path)) == []
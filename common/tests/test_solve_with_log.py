@@ -0,0 +1,50 @@
+import json
+import pulp
+
+from common import solve_with_log
+
+
+def make_knapsack() -> pulp.LpProblem:
+    problem = pulp.LpProblem(name="knapsack", sense=pulp.LpMaximize)
+    x = [pulp.LpVariable(f"x_{i}", cat=pulp.LpBinary) for i in range(4)]
+    problem += pulp.lpSum([v * x[i] for i, v in enumerate([10, 13, 7, 8])])
+    problem += pulp.lpSum([w * x[i] for i, w in enumerate([5, 7, 4, 3])]) <= 10
+    return problem
+
+
+def make_infeasible() -> pulp.LpProblem:
+    problem = pulp.LpProblem(name="infeasible", sense=pulp.LpMinimize)
+    x = pulp.LpVariable("x", lowBound=0, upBound=1, cat=pulp.LpInteger)
+    problem += x
+    problem += x >= 2
+    return problem
+
+
+def test_record_of_optimal_solve():
+    record = solve_with_log.exec(make_knapsack(), time_limit=10, build_time=0.5)
+    assert record["name"] == "knapsack"
+    assert record["n_variables"] == 4
+    assert record["n_constraints"] == 1
+    assert record["build_time"] == 0.5
+    assert record["write_time"] is None
+    assert record["status"] == "Optimal"
+    assert record["objective"] == 21
+    json.dumps(record)
+
+
+def test_no_objective_without_solution():
+    record = solve_with_log.exec(make_infeasible(), time_limit=10)
+    assert record["status"] == "Infeasible"
+    assert record["objective"] is None
+
+
+def test_write_model(tmp_path):
+    path = str(tmp_path / "knapsack.lp")
+    record = solve_with_log.exec(make_knapsack(), time_limit=10, write_path=path)
+    assert record["write_time"] is not None
+    assert "x_0" in open(path).read()
+
+
+def test_model_dump_is_lazy():
+    dump = solve_with_log.ModelDump(make_knapsack())
+    assert "_C1" in str(dump)